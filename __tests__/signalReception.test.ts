@@ -1,6 +1,9 @@
+import { gzipSync } from 'zlib';
 import { signalStorage } from '@/lib/signalStorage';
 import { Signal } from '@/types/signal';
 
+const SIGNALS_URL = 'http://localhost:3000/api/signals';
+
 describe('Signal Reception and Storage', () => {
   const testSignal: Signal = {
     id: 'test-reception-1',
@@ -57,6 +60,116 @@ describe('Signal Reception and Storage', () => {
     });
   });
 
+  describe('Batch Upload', () => {
+    const makePayload = (symbol: string) => ({
+      symbol,
+      signalType: 'LONG',
+      price: 50000,
+      timestamp: Date.now()
+    });
+
+    it('should accept a JSON array and report results per index', async () => {
+      const batch = [makePayload('BTCUSDT'), { symbol: 'ETHUSDT' }, makePayload('SOLUSDT')];
+
+      const response = await fetch(SIGNALS_URL, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify(batch)
+      });
+
+      expect(response.status).toBe(201);
+      const data = await response.json();
+      expect(data.success).toBe(true);
+      expect(data.results).toHaveLength(3);
+      expect(data.results[0]).toMatchObject({ index: 0 });
+      expect(data.results[0].signalId).toBeDefined();
+      expect(data.results[1]).toEqual({ index: 1, error: 'Invalid signal payload' });
+      expect(data.results[2].signalId).toBeDefined();
+    });
+
+    it('should accept a gzip-compressed body', async () => {
+      const body = gzipSync(Buffer.from(JSON.stringify([makePayload('BTCUSDT'), makePayload('ETHUSDT')])));
+
+      const response = await fetch(SIGNALS_URL, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json', 'Content-Encoding': 'gzip' },
+        body
+      });
+
+      expect(response.status).toBe(201);
+      const data = await response.json();
+      expect(data.results).toHaveLength(2);
+      expect(data.results.every((result: any) => result.signalId)).toBe(true);
+    });
+
+    it('should reject an empty batch', async () => {
+      const response = await fetch(SIGNALS_URL, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify([])
+      });
+
+      expect(response.status).toBe(400);
+    });
+
+    it('should reject a batch with more than 100 signals', async () => {
+      const batch = Array.from({ length: 101 }, () => makePayload('BTCUSDT'));
+
+      const response = await fetch(SIGNALS_URL, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify(batch)
+      });
+
+      expect(response.status).toBe(400);
+    });
+
+    it('should reject malformed gzip with 400', async () => {
+      const response = await fetch(SIGNALS_URL, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json', 'Content-Encoding': 'gzip' },
+        body: Buffer.from('not gzip')
+      });
+
+      expect(response.status).toBe(400);
+    });
+
+    it('should reject an unsupported content encoding with 415', async () => {
+      const response = await fetch(SIGNALS_URL, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json', 'Content-Encoding': 'br' },
+        body: JSON.stringify(makePayload('BTCUSDT'))
+      });
+
+      expect(response.status).toBe(415);
+    });
+
+    it('should reject an oversized body with 413', async () => {
+      const body = JSON.stringify({ ...makePayload('BTCUSDT'), metadata: { padding: 'x'.repeat(1024 * 1024) } });
+
+      const response = await fetch(SIGNALS_URL, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body
+      });
+
+      expect(response.status).toBe(413);
+    });
+
+    it('should reject a gzip bomb with 413', async () => {
+      // ~4 KB compressed, 4 MB once decompressed
+      const body = gzipSync(Buffer.alloc(4 * 1024 * 1024, ' '));
+
+      const response = await fetch(SIGNALS_URL, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json', 'Content-Encoding': 'gzip' },
+        body
+      });
+
+      expect(response.status).toBe(413);
+    });
+  });
+
   describe('Folder Structure', () => {
     it('should create correct folder hierarchy', async () => {
       await signalStorage.saveSignal(testSignal);
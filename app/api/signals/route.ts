@@ -1,4 +1,5 @@
 import { NextRequest, NextResponse } from 'next/server';
+import { gunzipSync } from 'zlib';
 import { Signal } from '@/types/signal';
 import { signalStorage } from '@/lib/signalStorage';
 import { signalBroadcaster } from '@/lib/signalBroadcaster';
@@ -14,13 +15,28 @@ export interface SignalWebhookPayload {
 const rateLimitMap = new Map<string, { count: number; resetTime: number }>();
 const RATE_LIMIT_WINDOW = 60000; // 1 minute
 const MAX_REQUESTS = 100;
+const MAX_BATCH_SIZE = 100;
+const MAX_BODY_BYTES = 1024 * 1024; // decompressed body limit (1 MB)
+
+class InvalidBodyError extends Error {
+  constructor(message: string, public status: number = 400) {
+    super(message);
+  }
+}
 
 function validatePayload(data: any): data is SignalWebhookPayload {
   return (
+    data !== null &&
+    typeof data === 'object' &&
+    !Array.isArray(data) &&
     typeof data.symbol === 'string' &&
+    data.symbol.length > 0 &&
     ['BUY', 'SELL', 'LONG', 'SHORT', 'ALERT'].includes(data.signalType) &&
     typeof data.price === 'number' &&
-    typeof data.timestamp === 'number'
+    Number.isFinite(data.price) &&
+    typeof data.timestamp === 'number' &&
+    Number.isFinite(data.timestamp) &&
+    (data.metadata === undefined || (data.metadata !== null && typeof data.metadata === 'object'))
   );
 }
 
@@ -82,9 +98,49 @@ export async function POST(request: NextRequest) {
       { status: 429 }
     );
   }
+  let body: any;
   try {
-    const body = await request.json();
-    
+    body = await readBody(request);
+  } catch (error) {
+    const status = error instanceof InvalidBodyError ? error.status : 400;
+    const message = error instanceof InvalidBodyError ? error.message : 'Invalid request body';
+    console.warn(`Rejected signal body from ${clientId}: ${message}`);
+    return NextResponse.json({ error: message }, { status });
+  }
+
+  try {
+
+    // Batch upload: an array of payloads, each saved independently
+    if (Array.isArray(body)) {
+      if (body.length === 0 || body.length > MAX_BATCH_SIZE) {
+        return NextResponse.json(
+          { error: `Batch must contain 1-${MAX_BATCH_SIZE} signals` },
+          { status: 400 }
+        );
+      }
+
+      const results = [];
+      for (let index = 0; index < body.length; index++) {
+        if (!validatePayload(body[index])) {
+          results.push({ index, error: 'Invalid signal payload' });
+          continue;
+        }
+        // One failing signal must not fail (and resend) the whole batch
+        try {
+          const signal = await processSignal(body[index]);
+          results.push({ index, signalId: signal.id });
+        } catch (error) {
+          console.error(`Error processing signal ${index} of batch:`, error);
+          results.push({ index, error: 'Failed to process signal' });
+        }
+      }
+
+      return NextResponse.json(
+        { success: true, results, message: `${results.length} signals processed` },
+        { status: 201 }
+      );
+    }
+
     if (!validatePayload(body)) {
       return NextResponse.json(
         { error: 'Invalid signal payload' },
@@ -92,32 +148,7 @@ export async function POST(request: NextRequest) {
       );
     }
 
-    const signal: Signal = {
-      id: `signal-${body.timestamp}-${Math.random().toString(36).substr(2, 9)}`,
-      timestamp: body.timestamp,
-      symbol: body.symbol,
-      signalType: convertSignalType(body.signalType),
-      price: body.price,
-      metadata: body.metadata,
-      folderPath: ''
-    };
-
-    await signalStorage.saveSignal(signal);
-
-    // Broadcast signal to all connected clients
-    signalBroadcaster.broadcast(signal);
-
-    console.log(`Signal received: ${signal.id} - ${signal.symbol} ${signal.signalType} at ${signal.price}`);
-    console.log(`Broadcasting to ${signalBroadcaster.getListenerCount()} listeners`);
-
-    // Trigger server-side screenshot capture (non-blocking)
-    fetch(`${process.env.VERCEL_URL ? `https://${process.env.VERCEL_URL}` : 'http://localhost:3000'}/api/capture-screenshot`, {
-      method: 'POST',
-      headers: { 'Content-Type': 'application/json' },
-      body: JSON.stringify({ signalId: signal.id })
-    }).catch(error => {
-      console.error('Failed to trigger screenshot:', error);
-    });
+    const signal = await processSignal(body);
 
     return NextResponse.json(
       { 
@@ -137,6 +168,76 @@ export async function POST(request: NextRequest) {
   }
 }
 
+// Desktop client sends batches gzip-compressed
+async function readBody(request: NextRequest): Promise<any> {
+  const encoding = (request.headers.get('content-encoding') || 'identity').toLowerCase();
+  if (encoding !== 'gzip' && encoding !== 'identity') {
+    throw new InvalidBodyError(`Unsupported content encoding: ${encoding}`, 415);
+  }
+
+  const raw = Buffer.from(await request.arrayBuffer());
+  if (raw.length === 0) {
+    throw new InvalidBodyError('Empty request body');
+  }
+
+  let text: string;
+  if (encoding === 'gzip') {
+    let decompressed: Buffer;
+    try {
+      // maxOutputLength guards against gzip bombs
+      decompressed = gunzipSync(raw, { maxOutputLength: MAX_BODY_BYTES });
+    } catch (error: any) {
+      if (error?.code === 'ERR_BUFFER_TOO_LARGE') {
+        throw new InvalidBodyError('Request body too large', 413);
+      }
+      throw new InvalidBodyError('Invalid gzip body');
+    }
+    text = decompressed.toString('utf-8');
+  } else {
+    if (raw.length > MAX_BODY_BYTES) {
+      throw new InvalidBodyError('Request body too large', 413);
+    }
+    text = raw.toString('utf-8');
+  }
+
+  try {
+    return JSON.parse(text);
+  } catch {
+    throw new InvalidBodyError('Invalid JSON body');
+  }
+}
+
+async function processSignal(body: SignalWebhookPayload): Promise<Signal> {
+  const signal: Signal = {
+    id: `signal-${body.timestamp}-${Math.random().toString(36).substr(2, 9)}`,
+    timestamp: body.timestamp,
+    symbol: body.symbol,
+    signalType: convertSignalType(body.signalType),
+    price: body.price,
+    metadata: body.metadata,
+    folderPath: ''
+  };
+
+  await signalStorage.saveSignal(signal);
+
+  // Broadcast signal to all connected clients
+  signalBroadcaster.broadcast(signal);
+
+  console.log(`Signal received: ${signal.id} - ${signal.symbol} ${signal.signalType} at ${signal.price}`);
+  console.log(`Broadcasting to ${signalBroadcaster.getListenerCount()} listeners`);
+
+  // Trigger server-side screenshot capture (non-blocking)
+  fetch(`${process.env.VERCEL_URL ? `https://${process.env.VERCEL_URL}` : 'http://localhost:3000'}/api/capture-screenshot`, {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json' },
+    body: JSON.stringify({ signalId: signal.id })
+  }).catch(error => {
+    console.error('Failed to trigger screenshot:', error);
+  });
+
+  return signal;
+}
+
 export async function GET(request: NextRequest) {
   try {
     const searchParams = request.nextUrl.searchParams;
@@ -0,0 +1,208 @@
+"""
+Alarm Deposu Modülü
+
+Alarmları alarms.json yerine gömülü bir SQLite veritabanında (WAL modu) saklar.
+Her değişiklik tek satırlık bir INSERT/UPDATE/DELETE'tir; alarm eklemek veya
+tetiklendi olarak işaretlemek için tüm dosya yeniden yazılmaz ve uygulama yazma
+sırasında kapansa bile veri bozulmaz.
+
+Sorgularda kullanılan alanlar (coin, timeframe, triggered, expiry, id) ayrı ve
+indeksli sütunlardır; alarmın kendisi JSON olarak saklanır, böylece alarm
+sözlükleri eskisiyle birebir aynı yapıda döner. Dönen sözlüklere satır numarası
+'row_id' anahtarıyla eklenir.
+
+İlk açılışta alarms.json varsa bir kez içe aktarılır (dosya silinmez).
+"""
+
+import json
+import os
+import sqlite3
+import threading
+
+DEFAULT_DB_PATH = "alarms.db"
+DEFAULT_JSON_PATH = "alarms.json"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS alarms (
+    row_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    id TEXT,
+    coin TEXT NOT NULL,
+    timeframe TEXT NOT NULL,
+    triggered INTEGER NOT NULL DEFAULT 0,
+    is_once INTEGER NOT NULL DEFAULT 1,
+    expiry TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_alarms_pair ON alarms (coin, timeframe);
+CREATE INDEX IF NOT EXISTS idx_alarms_triggered ON alarms (triggered);
+CREATE INDEX IF NOT EXISTS idx_alarms_expiry ON alarms (expiry);
+CREATE INDEX IF NOT EXISTS idx_alarms_id ON alarms (id);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+# Ayrı sütunlarda tutulan, JSON'a yazılmayan alanlar
+STORED_SEPARATELY = ('row_id', 'triggered')
+
+
+class AlarmStore:
+    def __init__(self, db_path=DEFAULT_DB_PATH, json_path=DEFAULT_JSON_PATH):
+        """
+        db_path: SQLite veritabanı dosyası
+        json_path: İlk açılışta içe aktarılacak eski alarms.json dosyası
+        """
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+
+        # Her yazma işleminde artar; alarm listesini önbelleğe alan kod için
+        self.version = 0
+
+        if json_path:
+            self.import_json(json_path)
+
+    # ------------------------------------------------------------------
+    # Yardımcılar
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _columns(alarm):
+        data = {k: v for k, v in alarm.items() if k not in STORED_SEPARATELY}
+        return (
+            alarm.get('id'),
+            alarm['coin'],
+            alarm['timeframe'],
+            1 if alarm.get('triggered', False) else 0,
+            1 if alarm.get('is_once', True) else 0,
+            alarm.get('expiry'),
+            json.dumps(data, ensure_ascii=False)
+        )
+
+    @staticmethod
+    def _to_alarm(row):
+        alarm = json.loads(row['data'])
+        if row['triggered']:
+            alarm['triggered'] = True
+        alarm['row_id'] = row['row_id']
+        return alarm
+
+    def _query(self, sql, params=()):
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [self._to_alarm(row) for row in rows]
+
+    def _write(self, sql, params=()):
+        with self._lock, self._conn:
+            cursor = self._conn.execute(sql, params)
+            self.version += 1
+            return cursor
+
+    # ------------------------------------------------------------------
+    # İçe aktarma
+    # ------------------------------------------------------------------
+    def import_json(self, json_path):
+        """alarms.json'daki alarmları bir kez içe aktar. Aktarılan alarm sayısını döndürür"""
+        with self._lock:
+            done = self._conn.execute("SELECT value FROM meta WHERE key = 'json_imported'").fetchone()
+        if done or not os.path.exists(json_path):
+            return 0
+
+        try:
+            with open(json_path, "r") as f:
+                alarms = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"{json_path} içe aktarılamadı: {e}")
+            return 0
+
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO alarms (id, coin, timeframe, triggered, is_once, expiry, data) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [self._columns(alarm) for alarm in alarms]
+            )
+            self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('json_imported', ?)", (json_path,))
+            self.version += 1
+        print(f"{len(alarms)} alarm {json_path} dosyasından içe aktarıldı")
+        return len(alarms)
+
+    # ------------------------------------------------------------------
+    # Okuma
+    # ------------------------------------------------------------------
+    def all(self):
+        """Tüm alarmlar (eklenme sırasıyla)"""
+        return self._query("SELECT * FROM alarms ORDER BY row_id")
+
+    def active(self):
+        """Kontrol edilmesi gereken alarmlar (tetiklenmiş tek seferlik alarmlar hariç)"""
+        return self._query("SELECT * FROM alarms WHERE triggered = 0 OR is_once = 0 ORDER BY row_id")
+
+    def for_pair(self, coin, timeframe):
+        return self._query("SELECT * FROM alarms WHERE coin = ? AND timeframe = ? ORDER BY row_id", (coin, timeframe))
+
+    def count(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM alarms").fetchone()[0]
+
+    # ------------------------------------------------------------------
+    # Yazma (her biri tek satır)
+    # ------------------------------------------------------------------
+    def add(self, alarm):
+        """Alarm ekle, satır numarasını döndür"""
+        cursor = self._write(
+            "INSERT INTO alarms (id, coin, timeframe, triggered, is_once, expiry, data) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            self._columns(alarm)
+        )
+        return cursor.lastrowid
+
+    def mark_triggered(self, alarm):
+        """Alarmı tetiklendi olarak işaretle"""
+        if 'row_id' in alarm:
+            self._write("UPDATE alarms SET triggered = 1 WHERE row_id = ?", (alarm['row_id'],))
+        else:
+            self._write("UPDATE alarms SET triggered = 1 WHERE id = ?", (alarm.get('id'),))
+
+    def delete(self, alarm):
+        """Alarmı sil (satır numarası yoksa aynı id'ye sahip alarmlar silinir)"""
+        if 'row_id' in alarm:
+            self._write("DELETE FROM alarms WHERE row_id = ?", (alarm['row_id'],))
+        else:
+            self._write("DELETE FROM alarms WHERE id = ?", (alarm.get('id', ''),))
+
+    def delete_all(self):
+        self._write("DELETE FROM alarms")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+# Örnek kullanım:
+if __name__ == "__main__":
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = os.path.join(tmp, "alarms.json")
+        with open(json_path, "w") as f:
+            json.dump([{
+                "id": "IndicSigs-ID:1-BTCUSDT", "coin": "BTCUSDT", "timeframe": "15m",
+                "indicator": "İndicPro", "detail": "Ana Çizgi", "condition": "Üstüne Çıktığında",
+                "value": "-60", "is_once": True, "expiry": "2030-01-01 00:00:00",
+                "name": "test", "message": ""
+            }], f)
+
+        store = AlarmStore(os.path.join(tmp, "alarms.db"), json_path)
+        alarm = store.active()[0]
+        print("İçe aktarılan:", alarm['name'], alarm['coin'], alarm['timeframe'])
+
+        store.mark_triggered(alarm)
+        print("Aktif alarm sayısı:", len(store.active()), "/ toplam:", store.count())
+
+        # İkinci açılışta tekrar içe aktarılmaz
+        store.close()
+        store = AlarmStore(os.path.join(tmp, "alarms.db"), json_path)
+        print("Yeniden açılışta toplam:", store.count())
+        store.close()
@@ -0,0 +1,105 @@
+"""
+Alarm Sesi Modülü
+
+alarm.wav dosyasını arka planda bir kuyruktan çalar; play() çağrısı hiç
+beklemeden döner, sinyal değerlendirmesi ve bildirim gönderimi sesi beklemez.
+Art arda gelen istekler birleştirilir: ses çalarken gelen 10 tetiklenme
+10 kez değil, ses bittikten sonra bir kez daha çalınır.
+
+Platformlar:
+    Windows: winsound.PlaySound
+    macOS:   afplay
+    Linux:   paplay veya aplay (hangisi kuruluysa)
+Ses çalınamazsa terminal zili kullanılır.
+"""
+
+import os
+import queue
+import shutil
+import subprocess
+import sys
+import threading
+
+DEFAULT_SOUND_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "alarm.wav")
+
+
+class AlertSound:
+    def __init__(self, sound_file=DEFAULT_SOUND_FILE):
+        self.sound_file = sound_file
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+        # İzleme için
+        self.requested = 0
+        self.played = 0
+
+    def play(self):
+        """Alarm sesini çal (beklemez)"""
+        self.requested += 1
+        self._ensure_worker()
+        self._queue.put(True)
+
+    def _ensure_worker(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._worker, name="AlertSound", daemon=True)
+                self._thread.start()
+
+    def _worker(self):
+        while True:
+            self._queue.get()
+            # Bekleyen diğer istekleri tek çalmada birleştir
+            while True:
+                try:
+                    self._queue.get_nowait()
+                except queue.Empty:
+                    break
+
+            try:
+                self._play_file()
+            except Exception as e:
+                print(f"Ses çalınamadı: {e}")
+            self.played += 1
+
+    def _play_file(self):
+        if not os.path.exists(self.sound_file):
+            print(f"Ses dosyası bulunamadı: {self.sound_file}")
+            self._bell()
+            return
+
+        if sys.platform.startswith("win"):
+            import winsound
+            winsound.PlaySound(self.sound_file, winsound.SND_FILENAME)
+            return
+
+        if sys.platform == "darwin":
+            players = [["afplay"]]
+        else:
+            players = [["paplay"], ["aplay", "-q"]]
+
+        for player in players:
+            if shutil.which(player[0]):
+                subprocess.run(player + [self.sound_file], stdout=subprocess.DEVNULL,
+                               stderr=subprocess.DEVNULL, timeout=30)
+                return
+
+        self._bell()
+
+    @staticmethod
+    def _bell():
+        print("\a", end="", flush=True)
+
+
+# Örnek kullanım:
+if __name__ == "__main__":
+    import time
+
+    sound = AlertSound()
+    start = time.perf_counter()
+    for _ in range(10):
+        sound.play()
+    print(f"10 play() çağrısı {(time.perf_counter() - start) * 1000:.2f} ms sürdü")
+
+    time.sleep(3)
+    print(f"İstenen: {sound.requested}, çalınan: {sound.played}")
@@ -0,0 +1,218 @@
+"""
+Eşzamanlı Mum Çekme Modülü
+
+Bir kontrol döngüsünde gereken tüm (coin, timeframe) serilerini ccxt'nin
+asyncio istemcisiyle (ccxt.async_support) aynı anda çeker. Senkron istemcide
+her fetch_ohlcv bir öncekini beklediğinden döngü süresi tüm isteklerin
+toplamıdır; burada istekler birlikte gönderilir ve döngü yaklaşık en yavaş
+istek kadar sürer.
+
+Aynı anda açık istek sayısı bir semafor ile sınırlanır; ccxt'nin kendi hız
+sınırlayıcısı (enableRateLimit) da açıktır, istekler borsanın limitini aşacak
+hızda gönderilmez.
+
+asyncio döngüsü ayrı bir thread'de çalışır (bkz. kline_stream); fetch_many()
+senkron koddan çağrılır ve tüm istekler bitene kadar bekler.
+
+Zamanlayıcı (request_scheduler) verilirse her istek önce onun ağırlık
+bütçesinden geçer. Bütçe beklemesi döngüyü bloklamasın diye fetcher'a ait,
+boyutu sınırlı bir thread havuzunda yapılır; bekleme en fazla timeout kadar
+sürer, süresi dolan fetch_many istekleri iptal edilir.
+"""
+
+import asyncio
+import concurrent.futures
+import functools
+import threading
+
+import ccxt.async_support as ccxt_async
+
+from request_scheduler import KLINES_WEIGHT, reset_response_headers, response_headers, track_response_headers
+
+# Binance tek istekte en fazla 1000 mum döndürür
+MAX_LIMIT = 1000
+
+
+class AsyncCandleFetcher:
+    def __init__(self, exchange=None, max_concurrency=20, timeout=60, scheduler=None):
+        """
+        exchange: ccxt.async_support borsa nesnesi (None ise Binance oluşturulur)
+        max_concurrency: Aynı anda açık en fazla istek sayısı
+        timeout: fetch_many için toplam bekleme süresi (sn)
+        scheduler: İstek ağırlıklarını izleyen RequestScheduler (isteğe bağlı)
+        """
+        self._exchange = exchange
+        self.scheduler = scheduler
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+
+        self._loop = None
+        self._thread = None
+        self._semaphore = None
+        self._executor = None
+        self._lock = threading.Lock()
+
+        # İzleme için
+        self.requests = 0
+        self.errors = 0
+
+    def _ensure_loop(self):
+        """asyncio döngüsünü ilk kullanımda ayrı thread'de başlat"""
+        with self._lock:
+            if self._loop is not None:
+                return
+            self._loop = asyncio.new_event_loop()
+            # Semafor aynı anda en fazla max_concurrency isteğe izin verir, havuz da o kadar
+            self._executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=self.max_concurrency, thread_name_prefix="AsyncFetcherBudget")
+            self._thread = threading.Thread(target=self._loop.run_forever, name="AsyncFetcher", daemon=True)
+            self._thread.start()
+
+    async def _setup(self):
+        # Semafor ve borsa oturumu döngünün kendi thread'inde oluşturulmalı
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        if self._exchange is None:
+            self._exchange = ccxt_async.binance({'enableRateLimit': True})
+        # Ağırlık her isteğin kendi yanıtından okunur (görevler aynı borsa nesnesini paylaşır)
+        track_response_headers(self._exchange)
+
+    async def _fetch_ohlcv(self, coin, timeframe, since=None, limit=None, priority=None):
+        async with self._semaphore:
+            if self.scheduler is not None:
+                # Bütçe beklemesi döngüyü bloklamasın; fetch_many'nin süresinden uzun sürmez
+                acquire = functools.partial(self.scheduler.acquire, KLINES_WEIGHT, priority,
+                                            self._acquire_timeout(priority))
+                await asyncio.get_running_loop().run_in_executor(self._executor, acquire)
+            self.requests += 1
+            reset_response_headers()
+            try:
+                result = await self._exchange.fetch_ohlcv(coin, timeframe, since=since, limit=limit)
+            except Exception as e:
+                if self.scheduler is not None:
+                    self.scheduler.check_error(e, self._response_headers())
+                raise
+            if self.scheduler is not None:
+                self.scheduler.update_from_headers(self._response_headers())
+            return result
+
+    def _acquire_timeout(self, priority):
+        """Önceliğin bütçe bekleme süresi, en fazla self.timeout"""
+        if priority is None:
+            priority = self.scheduler.current_priority()
+        timeout = self.scheduler.timeouts.get(priority)
+        return self.timeout if timeout is None else min(timeout, self.timeout)
+
+    def _response_headers(self):
+        """Bu görevin yaptığı isteğin yanıt başlıkları; kanca yoksa ortak last_response_headers (en iyi çaba)"""
+        headers = response_headers()
+        if headers is not None:
+            return headers
+        return getattr(self._exchange, 'last_response_headers', None)
+
+    async def _fetch_history(self, coin, timeframe, bars, priority=None):
+        """Son 'bars' kadar mumu çeker, limit aşılırsa sayfa sayfa ister"""
+        if bars <= MAX_LIMIT:
+            return await self._fetch_ohlcv(coin, timeframe, limit=bars, priority=priority)
+
+        interval = self._exchange.parse_timeframe(timeframe) * 1000
+        since = self._exchange.milliseconds() - bars * interval
+        ohlcv = []
+        while True:
+            batch = await self._fetch_ohlcv(coin, timeframe, since=since, limit=MAX_LIMIT, priority=priority)
+            ohlcv.extend(batch)
+            if len(batch) < MAX_LIMIT:
+                break
+            since = batch[-1][0] + interval
+        return ohlcv[-bars:]
+
+    async def _fetch_since(self, coin, timeframe, since, limit, priority=None):
+        """since'tan oluşan muma kadar; sayfa dolu geldiyse (uzun boşluk) sonraki sayfalar da istenir"""
+        interval = self._exchange.parse_timeframe(timeframe) * 1000
+        ohlcv = []
+        while True:
+            batch = await self._fetch_ohlcv(coin, timeframe, since=since, limit=limit, priority=priority)
+            ohlcv.extend(batch)
+            if len(batch) < limit:
+                break
+            since = batch[-1][0] + interval
+            limit = MAX_LIMIT
+        return ohlcv
+
+    async def _fetch_one(self, request, priority):
+        coin, timeframe, since, bars = request
+        try:
+            if since is not None:
+                return await self._fetch_since(coin, timeframe, since, bars, priority)
+            return await self._fetch_history(coin, timeframe, bars, priority)
+        except Exception as e:
+            self.errors += 1
+            return e
+
+    async def _fetch_all(self, requests, priority):
+        await self._setup()
+        results = await asyncio.gather(*(self._fetch_one(request, priority) for request in requests))
+        return {(request[0], request[1]): result for request, result in zip(requests, results)}
+
+    def fetch_many(self, requests, priority=None):
+        """
+        Tüm istekleri eşzamanlı çek.
+        requests: [(coin, timeframe, since, bars), ...]
+            since verilirse o zamandan oluşan muma kadar tüm mumlar ('bars'lık sayfalarla),
+            since None ise son 'bars' mum (tam yükleme) istenir.
+        priority: Zamanlayıcıdaki öncelik (request_scheduler.PRIORITY_*)
+        Dönüş: {(coin, timeframe): ohlcv listesi veya hata (Exception)}
+        """
+        requests = list(requests)
+        if not requests:
+            return {}
+        self._ensure_loop()
+        future = asyncio.run_coroutine_threadsafe(self._fetch_all(requests, priority), self._loop)
+        try:
+            return future.result(self.timeout)
+        except concurrent.futures.TimeoutError:
+            # Döngüde kalan istekler iptal edilir, sonraki çağrılarla üst üste binmez
+            future.cancel()
+            raise
+
+    def close(self):
+        """Borsa oturumunu kapat ve döngüyü durdur"""
+        with self._lock:
+            loop, self._loop = self._loop, None
+            executor, self._executor = self._executor, None
+        if loop is None:
+            return
+        if self._exchange is not None and hasattr(self._exchange, 'close'):
+            try:
+                asyncio.run_coroutine_threadsafe(self._exchange.close(), loop).result(10)
+            except Exception as e:
+                print(f"Borsa oturumu kapatılırken hata: {e}")
+        loop.call_soon_threadsafe(loop.stop)
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+# Örnek kullanım:
+if __name__ == "__main__":
+    import time
+
+    class FakeExchange:
+        """Her isteği 200 ms'de yanıtlayan sahte borsa"""
+
+        def parse_timeframe(self, timeframe):
+            return 60
+
+        def milliseconds(self):
+            return int(time.time() * 1000)
+
+        async def fetch_ohlcv(self, coin, timeframe, since=None, limit=None):
+            await asyncio.sleep(0.2)
+            now = self.milliseconds()
+            return [[now - i * 60_000, 1.0, 1.0, 1.0, 1.0, 1.0] for i in range(limit or 100)][::-1]
+
+    fetcher = AsyncCandleFetcher(FakeExchange(), max_concurrency=50)
+    requests = [(f"C{i}USDT", "15m", None, 100) for i in range(200)]
+    start = time.perf_counter()
+    results = fetcher.fetch_many(requests)
+    print(f"{len(results)} seri {time.perf_counter() - start:.2f} sn'de çekildi "
+          f"(sıralı çekim ~{len(requests) * 0.2:.0f} sn)")
+    fetcher.close()
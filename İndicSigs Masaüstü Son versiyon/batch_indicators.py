@@ -0,0 +1,191 @@
+"""
+Toplu (Batch) İndikatör Hesaplama Modülü
+
+WaveTrend (İndicPro), MACD DEMA, Bollinger Bands ve Volume Weighted MACD
+göstergelerini birden fazla sembol için tek seferde hesaplar. Veriler
+(sembol x mum) boyutunda 2 boyutlu NumPy dizilerine dizilir; her EMA adımı tüm
+semboller için tek bir vektör işlemidir. Sonuçlar main.py'deki calculate_*
+fonksiyonlarıyla aynıdır (pandas ewm(adjust=False) ve rolling davranışı birebir
+taklit edilir).
+
+Farklı uzunluktaki seriler sola NaN eklenerek hizalanır; pandas'ta olduğu gibi
+EMA ilk geçerli değerden başlar, eksik veri içeren pencereler NaN döner.
+"""
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+def ewm_mean(x, span=None, alpha=None):
+    """
+    pandas .ewm(span=..., adjust=False).mean() karşılığı, her satır ayrı seri.
+    NaN değerler pandas'taki gibi (ignore_na=False) ele alınır.
+    """
+    if alpha is None:
+        alpha = 2.0 / (span + 1.0)
+    decay = 1.0 - alpha
+
+    rows, cols = x.shape
+    out = np.empty_like(x, dtype=np.float64)
+    weighted = np.full(rows, np.nan)
+    old_wt = np.ones(rows)
+
+    for t in range(cols):
+        cur = x[:, t]
+        is_obs = ~np.isnan(cur)
+        started = ~np.isnan(weighted)
+
+        # Seri başlamışsa eski ağırlık her adımda (NaN olsa bile) azalır
+        old_wt = np.where(started, old_wt * decay, old_wt)
+        # pandas sabit seride (değer == ortalama) yuvarlama hatası oluşmasın diye güncellemeyi atlar
+        update = is_obs & started & (weighted != cur)
+        weighted = np.where(
+            update,
+            (old_wt * weighted + alpha * cur) / (old_wt + alpha),
+            np.where(is_obs & ~started, cur, weighted)
+        )
+        old_wt = np.where(is_obs, 1.0, old_wt)
+        out[:, t] = weighted
+
+    return out
+
+
+def rolling_window(x, window):
+    """(satır, mum, pencere) görünümü; ilk window-1 mum için NaN pencereler eklenir"""
+    pad = np.full((x.shape[0], window - 1), np.nan)
+    return sliding_window_view(np.concatenate((pad, x), axis=1), window, axis=1)
+
+
+def rolling_mean(x, window):
+    """pandas .rolling(window).mean() karşılığı"""
+    return rolling_window(x, window).mean(axis=-1)
+
+
+def rolling_std(x, window):
+    """pandas .rolling(window).std() karşılığı (ddof=1)"""
+    return rolling_window(x, window).std(axis=-1, ddof=1)
+
+
+def moving_average(source, volume, length, ma_type="SMA"):
+    """calculate_bollinger_bands içindeki calculate_ma karşılığı"""
+    if ma_type == "SMA":
+        return rolling_mean(source, length)
+    elif ma_type == "EMA":
+        return ewm_mean(source, span=length)
+    elif ma_type == "SMMA":  # RMA
+        return ewm_mean(source, alpha=1 / length)
+    elif ma_type == "WMA":
+        weights = np.arange(1, length + 1)
+        return rolling_window(source, length) @ weights / weights.sum()
+    elif ma_type == "VWMA":
+        return rolling_window(source * volume, length).sum(axis=-1) / rolling_window(volume, length).sum(axis=-1)
+    raise ValueError(f"Bilinmeyen MA tipi: {ma_type}")
+
+
+def wavetrend(high, low, close, n1=10, n2=21):
+    ap = (high + low + close) / 3
+    esa = ewm_mean(ap, span=n1)
+    d = ewm_mean(np.abs(ap - esa), span=n1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ci = (ap - esa) / (0.015 * d)
+    wt1 = ewm_mean(ci, span=n2)
+    wt2 = rolling_mean(wt1, 4)
+    return wt1, wt2
+
+
+def macd_dema(close, sma=12, lma=26, tsp=9):
+    mme_slow_a = ewm_mean(close, span=lma)
+    mme_slow_b = ewm_mean(mme_slow_a, span=lma)
+    dema_slow = 2 * mme_slow_a - mme_slow_b
+
+    mme_fast_a = ewm_mean(close, span=sma)
+    mme_fast_b = ewm_mean(mme_fast_a, span=sma)
+    dema_fast = 2 * mme_fast_a - mme_fast_b
+
+    macd_line = dema_fast - dema_slow
+
+    mme_signal_a = ewm_mean(macd_line, span=tsp)
+    mme_signal_b = ewm_mean(mme_signal_a, span=tsp)
+    signal_line = 2 * mme_signal_a - mme_signal_b
+
+    return macd_line, signal_line, macd_line - signal_line
+
+
+def bollinger_bands(close, volume, length=20, mult=2.0, ma_type="SMA"):
+    basis = moving_average(close, volume, length, ma_type)
+    std = rolling_std(close, length)
+    return basis + mult * std, basis, basis - mult * std
+
+
+def volume_weighted_macd(close, volume, fast=12, slow=26, signal=9):
+    volume_close = volume * close
+    with np.errstate(divide='ignore', invalid='ignore'):
+        macd = (ewm_mean(volume_close, span=fast) / ewm_mean(volume, span=fast)
+                - ewm_mean(volume_close, span=slow) / ewm_mean(volume, span=slow))
+    signal_line = ewm_mean(macd, span=signal)
+    return macd, signal_line, macd - signal_line
+
+
+def stack_frames(frames, columns=('high', 'low', 'close', 'volume')):
+    """
+    {anahtar: DataFrame} sözlüğünü (sembol x mum) dizilerine çevirir.
+    Kısa seriler sola NaN eklenerek en uzun seriye hizalanır.
+    Dönüş: (anahtar listesi, {sütun: 2 boyutlu dizi})
+    """
+    keys = list(frames.keys())
+    length = max(len(frames[key]) for key in keys)
+    arrays = {col: np.full((len(keys), length), np.nan) for col in columns}
+    for row, key in enumerate(keys):
+        df = frames[key]
+        for col in columns:
+            arrays[col][row, length - len(df):] = df[col].to_numpy(dtype=np.float64)
+    return keys, arrays
+
+
+def compute_indicator_batch(frames):
+    """
+    Tüm seriler için dört indikatörü tek geçişte hesaplar.
+
+    frames: {(coin, timeframe): DataFrame}
+    Dönüş: {(coin, timeframe): {'wavetrend': {...}, 'macd': {...},
+            'bollinger': {...}, 'vwmacd': {...}, 'close': float}}
+    Alt sözlükler calculate_wavetrend, calculate_macd_dema,
+    calculate_bollinger_bands ve volume_weighted_macd ile aynı anahtarları kullanır.
+    """
+    frames = {key: df for key, df in frames.items() if df is not None and not df.empty}
+    if not frames:
+        return {}
+
+    keys, data = stack_frames(frames)
+    high, low, close, volume = data['high'], data['low'], data['close'], data['volume']
+
+    wt1, wt2 = wavetrend(high, low, close)
+    macd_line, signal_line, hist = macd_dema(close)
+    bb_upper, bb_middle, bb_lower = bollinger_bands(close, volume)
+    vw_macd, vw_signal, vw_hist = volume_weighted_macd(close, volume)
+
+    results = {}
+    for row, key in enumerate(keys):
+        results[key] = {
+            'wavetrend': {
+                'wt1': float(wt1[row, -1]),
+                'wt2': float(wt2[row, -1])
+            },
+            'macd': {
+                'MACD_DEMA': float(macd_line[row, -1]),
+                'Signal_DEMA': float(signal_line[row, -1]),
+                'MACD_Hist_DEMA': float(hist[row, -1])
+            },
+            'bollinger': {
+                'BB_upper': float(bb_upper[row, -1]),
+                'BB_middle': float(bb_middle[row, -1]),
+                'BB_lower': float(bb_lower[row, -1])
+            },
+            'vwmacd': {
+                'macd': float(vw_macd[row, -1]),
+                'signal': float(vw_signal[row, -1]),
+                'histogram': float(vw_hist[row, -1])
+            },
+            'close': float(close[row, -1])
+        }
+    return results
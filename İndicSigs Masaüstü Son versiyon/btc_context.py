@@ -0,0 +1,184 @@
+"""
+BTC Piyasa Bağlamı Modülü
+
+Sinyal mesajlarına eklenen BTC raporunu (fiyat ve 1m...1h değişim tablosu)
+dakikada bir kez, kapanmış 1 dakikalık mumlardan hesaplar. Aynı dakikada
+tetiklenen tüm sinyaller önbellekteki raporu kullanır; BTC verisi her sinyal
+ve her zaman dilimi için yeniden çekilmez.
+
+Değişimler kapanış dizisi üzerinde tek seferde hesaplanır: k dakikalık değişim
+için son kapanmış mumdan k dakika önce açılmış mumun kapanışı kullanılır
+(mum zamanları searchsorted ile bulunur, eksik mumlarda en yakın önceki mum).
+Mum verisi alınamazsa (borsa erişilemiyor) dakikalık fiyat geçmişi
+(price_history.PriceHistory) kullanılır.
+"""
+
+import threading
+import time
+from datetime import datetime
+
+import numpy as np
+
+MINUTE_MS = 60_000
+
+DEFAULT_TIMEFRAMES = ('1m', '3m', '5m', '15m', '30m', '45m', '1h')
+
+# Bu eşiği aşan değişim "Sert Hareket" olarak işaretlenir (%)
+SHARP_MOVE_THRESHOLDS = {
+    '1m': 0.30, '3m': 0.40, '5m': 0.50,
+    '15m': 1.00, '30m': 1.25, '45m': 1.25, '1h': 1.50
+}
+
+
+def timeframe_minutes(timeframe):
+    """'15m' -> 15, '1h' -> 60, tanınmayan -> None"""
+    try:
+        if timeframe.endswith('m'):
+            return int(timeframe[:-1])
+        if timeframe.endswith('h'):
+            return int(timeframe[:-1]) * 60
+    except ValueError:
+        pass
+    return None
+
+
+def closed_candles(df, now_ms=None):
+    """DataFrame'deki kapanmış mumların açılış zamanları (ms) ve kapanışları"""
+    times = df.index.values.astype('datetime64[ms]').astype(np.int64)
+    closes = df['close'].to_numpy(dtype=float)
+    if now_ms is None:
+        now_ms = int(time.time() * 1000)
+    closed = times + MINUTE_MS <= now_ms
+    return times[closed], closes[closed]
+
+
+def compute_changes(times, closes, minutes):
+    """
+    Son kapanıştan k dakika önceki kapanışa göre yüzde değişimler (vektörel)
+    times, closes: Artan sıralı 1m mum zamanları (ms) ve kapanışları
+    minutes: Dakika sayıları dizisi
+    Dönüş: Değişim dizisi, yeterli geçmiş yoksa NaN
+    """
+    minutes = np.asarray(minutes, dtype=np.int64)
+    targets = times[-1] - minutes * MINUTE_MS
+    idx = np.searchsorted(times, targets, side='right') - 1
+    valid = idx >= 0
+    past = np.where(valid, closes[np.clip(idx, 0, None)], np.nan)
+    return (closes[-1] - past) / past * 100
+
+
+class BTCContext:
+    def __init__(self, get_frame, timeframes=DEFAULT_TIMEFRAMES, thresholds=SHARP_MOVE_THRESHOLDS, history=None):
+        """
+        get_frame: 1 dakikalık BTC mumlarını (DataFrame, zaman indeksli) döndüren fonksiyon
+        history: Mum verisi yoksa kullanılacak PriceHistory
+        """
+        self.get_frame = get_frame
+        self.history = history
+        self.timeframes = tuple(timeframes)
+        self.thresholds = thresholds
+        self._lock = threading.Lock()
+        self._minute = None     # Önbellekteki raporun hesaplandığı dakika (ms)
+        self._snapshot = None
+        self._report = ""
+
+        # İzleme için
+        self.computed = 0
+        self.served = 0
+
+    def _refresh(self):
+        """Dakika değiştiyse yeniden hesapla (kilit altında çağrılır)"""
+        now_ms = int(time.time() * 1000)
+        minute = now_ms - now_ms % MINUTE_MS
+        if minute == self._minute:
+            return
+
+        df = self.get_frame()
+        if df is not None and not df.empty:
+            times, closes = closed_candles(df, now_ms)
+        elif self.history is not None:
+            times, closes = self.history.series()
+            closed = times + MINUTE_MS <= now_ms
+            times, closes = times[closed], closes[closed]
+        else:
+            return
+        if len(times) == 0:
+            return
+
+        minutes = [timeframe_minutes(tf) for tf in self.timeframes]
+        known = [i for i, m in enumerate(minutes) if m is not None]
+        values = compute_changes(times, closes, [minutes[i] for i in known])
+
+        changes = {}
+        for i, change in zip(known, values):
+            if not np.isnan(change):
+                changes[self.timeframes[i]] = float(change)
+
+        self._snapshot = {
+            'price': float(closes[-1]),
+            'candle_time': int(times[-1]),
+            'changes': changes,
+            'sharp': {tf: abs(change) > self.thresholds.get(tf, 1.0) for tf, change in changes.items()}
+        }
+        self._report = self._format(self._snapshot, minute)
+        self._minute = minute
+        self.computed += 1
+
+    def _format(self, snapshot, minute):
+        lines = [f"💲 Fiyat: {snapshot['price']:,.2f} USDT"]
+
+        current_change = snapshot['changes'].get('1m')
+        if current_change is not None:
+            direction = "📈" if current_change > 0 else "📉"
+            current_time = datetime.fromtimestamp(minute / 1000).strftime('%H:%M')
+            lines.append(f"⚡ Anlık ({current_time}): ({current_change:+.2f}%) {direction}")
+
+        for tf in self.timeframes:
+            change = snapshot['changes'].get(tf)
+            if change is None:
+                continue
+            direction = "📈" if change > 0 else "📉"
+            line = f"⏱️ {tf}: ({change:+.2f}%) {direction}"
+            if snapshot['sharp'][tf]:
+                movement_emoji = "🟢" if change > 0 else "🔴"
+                line += f" Sert Hareket {movement_emoji}"
+            lines.append(line)
+
+        return "\n".join(lines)
+
+    def snapshot(self):
+        """Yapısal veriler: {'price', 'candle_time', 'changes': {tf: %}, 'sharp': {tf: bool}} veya None"""
+        with self._lock:
+            self._refresh()
+            self.served += 1
+            return self._snapshot
+
+    def report(self):
+        """Sinyal mesajına eklenen BTC rapor metni"""
+        with self._lock:
+            self._refresh()
+            self.served += 1
+            return self._report
+
+    def change(self, timeframe):
+        """Zaman dilimi için yüzde değişim, hesaplanamıyorsa None"""
+        snapshot = self.snapshot()
+        if snapshot is None:
+            return None
+        return snapshot['changes'].get(timeframe)
+
+
+# Örnek kullanım:
+if __name__ == "__main__":
+    import pandas as pd
+
+    now_ms = int(time.time() * 1000)
+    start = now_ms - now_ms % MINUTE_MS - 99 * MINUTE_MS
+    closes = 97000 + np.cumsum(np.random.default_rng(1).normal(0, 40, 100))
+    frame = pd.DataFrame({'close': closes}, index=pd.to_datetime(start + np.arange(100) * MINUTE_MS, unit='ms'))
+
+    context = BTCContext(lambda: frame)
+    for _ in range(20):
+        report = context.report()
+    print(report)
+    print(f"20 istek, {context.computed} hesaplama")
@@ -0,0 +1,148 @@
+"""
+Mum Verisi Önbelleği
+
+get_coin_data'nın döndürdüğü DataFrame'leri (coin, timeframe) anahtarıyla
+tutar. Önbellek bir bayt bütçesiyle sınırlıdır: toplam boyut bütçeyi aşınca en
+uzun süredir kullanılmayan seri atılır (LRU). Böylece toplu alarmlar ve 5m/1m
+onay çekimleriyle dokunulan her seri sonsuza kadar bellekte kalmaz; uzun
+süre açık kalan oturumlarda bellek sabit kalır.
+
+Bir kaydın ne kadar taze kalacağına freshness.FreshnessPolicy karar verir:
+oluşan mum zaman dilimine göre ayarlanan aralıklarla yenilenir, mum kapanınca
+kayıt eskir.
+
+Atılan seriler on_evict ile bildirilir (mum deposundaki tamponları da silmek
+için).
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+from freshness import FreshnessPolicy
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+def frame_size(df):
+    """DataFrame'in bellek kullanımı (bayt)"""
+    if df is None:
+        return 0
+    return int(df.memory_usage(index=True).sum())
+
+
+class CandleCache:
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES, freshness=None, on_evict=None):
+        """
+        max_bytes: Önbelleğin toplam bayt bütçesi
+        freshness: Kayıtların ne zaman eskiyeceğini belirleyen FreshnessPolicy
+        on_evict: Bütçe aşıldığında atılan her seri için çağrılır, on_evict(coin, timeframe)
+        """
+        self.max_bytes = max_bytes
+        self.freshness = freshness or FreshnessPolicy()
+        self.on_evict = on_evict
+        self._items = OrderedDict()     # {(coin, timeframe): (DataFrame, boyut, geçerlilik sonu)}
+        self._lock = threading.Lock()
+        self.bytes = 0
+
+        # İzleme için
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evictions = 0
+
+    def get(self, coin, timeframe, now=None):
+        """Taze kayıt varsa DataFrame, yoksa None"""
+        if now is None:
+            now = time.time()
+        key = (coin, timeframe)
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            if now >= item[2]:
+                self.expired += 1
+                self.misses += 1
+                return None
+            self.hits += 1
+            return item[0]
+
+    def put(self, coin, timeframe, df, now=None):
+        """Seriyi kaydet, bütçe aşılırsa en eski kullanılan serileri at"""
+        if now is None:
+            now = time.time()
+        key = (coin, timeframe)
+        size = frame_size(df)
+        evicted = []
+        with self._lock:
+            previous = self._items.pop(key, None)
+            if previous is not None:
+                self.bytes -= previous[1]
+            self._items[key] = (df, size, self.freshness.expires_at(timeframe, now))
+            self.bytes += size
+            # Son eklenen seri bütçeden büyük olsa bile tutulur
+            while self.bytes > self.max_bytes and len(self._items) > 1:
+                old_key, (_, old_size, _) = self._items.popitem(last=False)
+                self.bytes -= old_size
+                self.evictions += 1
+                evicted.append(old_key)
+
+        if self.on_evict is not None:
+            for old_key in evicted:
+                try:
+                    self.on_evict(*old_key)
+                except Exception as e:
+                    print(f"Önbellekten atılan seri temizlenirken hata ({old_key[0]} {old_key[1]}): {e}")
+
+    def remove_coin(self, coin):
+        """Bir coine ait tüm serileri sil"""
+        with self._lock:
+            for key in [k for k in self._items if k[0] == coin]:
+                self.bytes -= self._items.pop(key)[1]
+
+    def stats(self):
+        """{'series', 'bytes', 'max_bytes', 'hits', 'misses', 'expired', 'evictions', 'hit_rate'}"""
+        with self._lock:
+            requests = self.hits + self.misses
+            return {
+                'series': len(self._items),
+                'bytes': self.bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'expired': self.expired,
+                'evictions': self.evictions,
+                'hit_rate': round(self.hits / requests, 3) if requests else None
+            }
+
+    def __len__(self):
+        return len(self._items)
+
+
+# Örnek kullanım:
+if __name__ == "__main__":
+    import numpy as np
+    import pandas as pd
+
+    def make_frame(bars):
+        values = np.random.default_rng(0).random((bars, 5))
+        return pd.DataFrame(values, columns=['open', 'high', 'low', 'close', 'volume'],
+                            index=pd.to_datetime(np.arange(bars) * 60_000, unit='ms'))
+
+    evicted = []
+    cache = CandleCache(max_bytes=2 * 1024 * 1024, on_evict=lambda coin, tf: evicted.append((coin, tf)))
+    frame = make_frame(100)
+
+    # Uzun süren bir oturum: 5000 farklı seri, bellek bütçede kalır
+    for i in range(5000):
+        cache.put(f"C{i}USDT", "15m", frame)
+        cache.get("C0USDT", "15m")   # Sık kullanılan seri atılmaz
+    print(cache.stats())
+    print("İlk atılan:", evicted[0], "- C0USDT hâlâ önbellekte:", cache.get("C0USDT", "15m") is not None)
+
+    now = 1_700_000_990.0   # 15m mumunun kapanmasına 10 sn kala
+    cache.put("BTCUSDT", "15m", frame, now=now)
+    print("5 sn sonra:", cache.get("BTCUSDT", "15m", now=now + 5) is not None,
+          "- yeni mum açılınca:", cache.get("BTCUSDT", "15m", now=now + 11) is not None)
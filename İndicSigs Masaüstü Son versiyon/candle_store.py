@@ -0,0 +1,327 @@
+"""
+Mum Verisi Deposu
+
+Her (coin, timeframe) için sabit boyutlu bir halka tampon (ring buffer) tutar.
+Borsadan her seferinde 100 mum indirmek yerine sadece son kayıtlı mumun açılış
+zamanından (since=) itibaren gelen mumlar istenir: oluşmakta olan son mum yerinde
+güncellenir, yeni kapanan mumlar sona eklenir.
+
+Üst zaman dilimleri (3m, 5m, 15m, 45m ...) tek bir 1m serisinden türetilebilir
+(bkz. timeframes.py); türetilen DataFrame'ler 1m serisi değişene kadar önbellekte kalır.
+
+Önbellekteki DataFrame'ler birden fazla çağıran tarafından paylaşıldığından
+salt okunurdur (CandleFrame): sütun eklenemez, .loc/.iloc/.at/.iat ile veya
+inplace=True metotlarıyla değiştirilemez, alttaki NumPy dizisi de yazmaya
+kapalıdır. Yardımcı sütun gereken hesaplamalar yeni Series üretmeli veya
+df.copy() ile çalışmalıdır.
+"""
+
+import threading
+
+import numpy as np
+import pandas as pd
+
+from timeframes import TIMEFRAME_MS, resample_candles
+
+OHLCV_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+
+
+class CandleSeries:
+    """Tek bir (coin, timeframe) serisi için halka tampon"""
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.times = np.zeros(capacity, dtype=np.int64)            # Açılış zamanı (ms)
+        self.values = np.zeros((capacity, 5), dtype=np.float64)    # open, high, low, close, volume
+        self.start = 0   # En eski mumun indeksi
+        self.size = 0
+        self.version = 0
+
+    def last_index(self):
+        return (self.start + self.size - 1) % self.capacity
+
+    def last_open_time(self):
+        if self.size == 0:
+            return None
+        return int(self.times[self.last_index()])
+
+    def append(self, row):
+        if self.size < self.capacity:
+            idx = (self.start + self.size) % self.capacity
+            self.size += 1
+        else:
+            # Tampon dolu, en eski mumun üzerine yaz
+            idx = self.start
+            self.start = (self.start + 1) % self.capacity
+        self.times[idx] = row[0]
+        self.values[idx] = row[1:6]
+
+    def replace_last(self, row):
+        idx = self.last_index()
+        self.values[idx] = row[1:6]
+
+    def ordered(self):
+        """Eskiden yeniye sıralı (times, values) kopyası"""
+        idx = (self.start + np.arange(self.size)) % self.capacity
+        return self.times[idx], self.values[idx]
+
+
+def _read_only(action):
+    return TypeError(f"Önbellekteki mum verisi salt okunur ({action}), df.copy() kullanın")
+
+
+class _ReadOnlyIndexer:
+    """.loc/.iloc/.at/.iat okumalarını iletir, atamaları reddeder"""
+
+    def __init__(self, indexer, name):
+        self._indexer = indexer
+        self._name = name
+
+    def __getitem__(self, key):
+        return self._indexer[key]
+
+    def __setitem__(self, key, value):
+        raise _read_only(f".{self._name}[...] ile yazılamaz")
+
+
+class CandleFrame(pd.DataFrame):
+    """
+    Önbellekte paylaşılan salt okunur mum DataFrame'i.
+    Sütun eklemek/değiştirmek, indeksleyicilerle atama, inplace=True metotlar ve
+    index/columns değiştirmek TypeError verir; değerler yazmaya kapalı dizide
+    durur. Dilimleme, copy() ve hesaplama sonuçları normal DataFrame döndürür.
+    """
+
+    # Oluşturma sırasında pandas kendi alanlarını yazar, kilit build_frame'de açılır
+    _metadata = ['_frozen']
+    _frozen = False
+
+    @property
+    def _constructor(self):
+        return pd.DataFrame
+
+    def freeze(self):
+        for block in self._mgr.blocks:
+            block.values.flags.writeable = False
+        object.__setattr__(self, '_frozen', True)
+        return self
+
+    @property
+    def loc(self):
+        return _ReadOnlyIndexer(super().loc, 'loc')
+
+    @property
+    def iloc(self):
+        return _ReadOnlyIndexer(super().iloc, 'iloc')
+
+    @property
+    def at(self):
+        return _ReadOnlyIndexer(super().at, 'at')
+
+    @property
+    def iat(self):
+        return _ReadOnlyIndexer(super().iat, 'iat')
+
+    def __setitem__(self, key, value):
+        raise _read_only(f"'{key}' sütunu yazılamaz")
+
+    def __delitem__(self, key):
+        raise _read_only(f"'{key}' sütunu silinemez")
+
+    def __setattr__(self, name, value):
+        # df.close = ... gibi atamalar da sütunu gölgeler
+        if self._frozen and (name in ('index', 'columns', '_mgr') or not name.startswith('_')):
+            raise _read_only(f"{name} değiştirilemez")
+        super().__setattr__(name, value)
+
+    def insert(self, loc, column, value, allow_duplicates=False):
+        raise _read_only(f"'{column}' sütunu eklenemez")
+
+    def pop(self, item):
+        raise _read_only(f"'{item}' sütunu çıkarılamaz")
+
+    def update(self, other, *args, **kwargs):
+        raise _read_only("update yapılamaz")
+
+    def _update_inplace(self, result, verify_is_copy=True):
+        # inplace=True ile çağrılan metotlar (drop, rename, fillna, ...) buradan geçer
+        raise _read_only("inplace=True kullanılamaz")
+
+
+def build_frame(times, values):
+    """(times, values) dizilerini get_coin_data'nın döndürdüğü DataFrame formatına çevirir"""
+    df = CandleFrame(np.array(values, dtype=np.float64), columns=OHLCV_COLUMNS,
+                     index=pd.to_datetime(times, unit='ms'))
+    df.index.name = 'timestamp'
+    return df.freeze()
+
+
+class CandleStore:
+    def __init__(self, capacity=100, capacities=None):
+        """
+        capacity: Her seri için tutulacak en fazla mum sayısı
+        capacities: Zaman dilimine özel kapasiteler, örn. {'1m': 1500}
+        """
+        self.capacity = capacity
+        self.capacities = capacities or {}
+        self._series = {}   # {(coin, timeframe): CandleSeries}
+        self._frames = {}   # {(coin, timeframe): (version, DataFrame)}
+        self._derived = {}  # {(coin, timeframe): (base_version, DataFrame)}
+        self._lock = threading.Lock()
+
+    def capacity_for(self, timeframe):
+        return self.capacities.get(timeframe, self.capacity)
+
+    def last_open_time(self, coin, timeframe):
+        """Serideki son mumun açılış zamanı (ms), seri yoksa None"""
+        with self._lock:
+            series = self._series.get((coin, timeframe))
+            return series.last_open_time() if series else None
+
+    def since_for(self, coin, timeframe, now_ms):
+        """
+        fetch_ohlcv için since değeri.
+        Seri yoksa veya aradaki boşluk tamponu aşıyorsa None döner (tam yükleme gerekir).
+        """
+        last_open = self.last_open_time(coin, timeframe)
+        if last_open is None:
+            return None
+        interval = TIMEFRAME_MS.get(timeframe)
+        if interval is None or now_ms - last_open >= interval * self.capacity_for(timeframe):
+            return None
+        return last_open
+
+    def reset(self, coin, timeframe, ohlcv):
+        """Seriyi baştan yükle (ilk çekim veya uzun boşluk sonrası)"""
+        capacity = self.capacity_for(timeframe)
+        with self._lock:
+            previous = self._series.get((coin, timeframe))
+            series = CandleSeries(capacity)
+            for row in ohlcv[-capacity:]:
+                series.append(row)
+            series.version = previous.version + 1 if previous else 1
+            self._series[(coin, timeframe)] = series
+            self._frames.pop((coin, timeframe), None)
+
+    def merge(self, coin, timeframe, ohlcv):
+        """
+        since= ile alınan mumları seriye işle.
+        Son mumla aynı açılış zamanına sahip mum yerinde güncellenir, daha yeniler eklenir.
+        """
+        key = (coin, timeframe)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = CandleSeries(self.capacity_for(timeframe))
+                self._series[key] = series
+
+            changed = False
+            for row in ohlcv:
+                open_time = int(row[0])
+                last_open = series.last_open_time()
+                if last_open is None or open_time > last_open:
+                    series.append(row)
+                    changed = True
+                elif open_time == last_open:
+                    series.replace_last(row)
+                    changed = True
+                # Daha eski mumlar zaten tamponda, atla
+
+            if changed:
+                series.version += 1
+
+    def get_ohlcv(self, coin, timeframe):
+        """Seriyi fetch_ohlcv formatında (liste) döndürür"""
+        with self._lock:
+            series = self._series.get((coin, timeframe))
+            if not series or series.size == 0:
+                return None
+            times, values = series.ordered()
+        return [[int(t)] + list(v) for t, v in zip(times, values)]
+
+    def get_frame(self, coin, timeframe):
+        """
+        Seriyi DataFrame olarak döndürür.
+        Seri değişmediyse önceki DataFrame yeniden kullanılır.
+        """
+        key = (coin, timeframe)
+        with self._lock:
+            series = self._series.get(key)
+            if not series or series.size == 0:
+                return None
+
+            cached = self._frames.get(key)
+            if cached and cached[0] == series.version:
+                return cached[1]
+
+            times, values = series.ordered()
+            df = build_frame(times, values)
+            self._frames[key] = (series.version, df)
+            return df
+
+    def get_derived_frame(self, coin, timeframe, base_timeframe='1m'):
+        """
+        Üst zaman dilimini taban (1m) serisinden türetip DataFrame olarak döndürür.
+        Taban seri değişmediyse önceki sonuç yeniden kullanılır.
+        """
+        key = (coin, timeframe)
+        with self._lock:
+            series = self._series.get((coin, base_timeframe))
+            if not series or series.size == 0:
+                return None
+
+            version = series.version
+            cached = self._derived.get(key)
+            if cached and cached[0] == version:
+                return cached[1]
+
+            times, values = series.ordered()
+
+        times, values = resample_candles(times, values, timeframe)
+        if len(times) == 0:
+            return None
+        df = build_frame(times, values)
+        with self._lock:
+            self._derived[key] = (version, df)
+        return df
+
+    def remove_coin(self, coin):
+        """Bir coine ait tüm serileri sil"""
+        with self._lock:
+            for key in [k for k in self._series if k[0] == coin]:
+                del self._series[key]
+                self._frames.pop(key, None)
+            for key in [k for k in self._derived if k[0] == coin]:
+                del self._derived[key]
+
+    def remove_series(self, coin, timeframe):
+        """Tek bir seriyi ve o coinden türetilen serileri sil"""
+        with self._lock:
+            self._series.pop((coin, timeframe), None)
+            self._frames.pop((coin, timeframe), None)
+            for key in [k for k in self._derived if k[0] == coin]:
+                del self._derived[key]
+
+    def memory_report(self):
+        """
+        Önbelleğin bellek kullanımı (bayt)
+        Dönüş: {'series', 'buffers', 'frames', 'derived', 'total', 'per_series', 'max_columns'}
+        """
+        with self._lock:
+            buffers = sum(s.times.nbytes + s.values.nbytes for s in self._series.values())
+            frames = [df for _, df in self._frames.values()]
+            derived = [df for _, df in self._derived.values()]
+            series_count = len(self._series)
+
+        frame_bytes = sum(int(df.memory_usage(index=True).sum()) for df in frames)
+        derived_bytes = sum(int(df.memory_usage(index=True).sum()) for df in derived)
+        total = buffers + frame_bytes + derived_bytes
+        return {
+            'series': series_count,
+            'buffers': buffers,
+            'frames': frame_bytes,
+            'derived': derived_bytes,
+            'total': total,
+            'per_series': total // series_count if series_count else 0,
+            'max_columns': max((df.shape[1] for df in frames + derived), default=0)
+        }
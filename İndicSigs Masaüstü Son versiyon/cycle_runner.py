@@ -0,0 +1,121 @@
+"""
+Döngü Çalıştırıcı Modülü
+
+Zamanlayıcıyla tetiklenen döngüleri (kart güncelleme, alarm kontrolü) Qt ana
+thread'i yerine QThreadPool'da çalıştırır; veri çekme ve indikatör hesaplama
+sürerken pencere donmaz. Döngünün sonucu Qt sinyaliyle ana thread'e taşınır ve
+sonuç fonksiyonu (kartların güncellenmesi gibi arayüz işleri) orada çağrılır.
+
+Aynı isimli döngü bitmeden yenisi başlatılmaz (üst üste binme yok); atlanan
+döngüler sayılır. Her döngünün süresi ölçülür ve cycle_finished sinyaliyle
+bildirilir.
+
+Havuz varsayılan olarak tek thread'lidir: döngüler aynı veri önbelleklerini
+(mum deposu, indikatör durumları, ccxt istemcisi) kullandığından sırayla
+çalışırlar.
+"""
+
+import time
+import traceback
+
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+
+class _CycleSignals(QObject):
+    finished = pyqtSignal(str, object, float)   # (döngü adı, sonuç, süre sn)
+    failed = pyqtSignal(str, str, float)        # (döngü adı, hata, süre sn)
+
+
+class _CycleTask(QRunnable):
+    def __init__(self, name, fn, signals):
+        super().__init__()
+        self.name = name
+        self.fn = fn
+        self.signals = signals
+
+    def run(self):
+        start = time.perf_counter()
+        try:
+            result = self.fn()
+        except Exception as e:
+            traceback.print_exc()
+            self._emit(self.signals.failed, str(e), time.perf_counter() - start)
+            return
+        self._emit(self.signals.finished, result, time.perf_counter() - start)
+
+    def _emit(self, signal, value, duration):
+        try:
+            signal.emit(self.name, value, duration)
+        except RuntimeError:
+            # Uygulama kapanırken sinyal nesnesi silinmiş olabilir
+            pass
+
+
+class CycleRunner(QObject):
+    # (döngü adı, süre sn) - her döngü bittiğinde ana thread'de yayınlanır
+    cycle_finished = pyqtSignal(str, float)
+
+    def __init__(self, max_threads=1, parent=None):
+        """Ana thread'de oluşturulmalıdır (sonuçlar bu nesnenin thread'ine taşınır)"""
+        super().__init__(parent)
+        self.pool = QThreadPool()
+        self.pool.setMaxThreadCount(max_threads)
+        self._signals = _CycleSignals()
+        self._signals.finished.connect(self._on_finished)
+        self._signals.failed.connect(self._on_failed)
+        self._running = {}      # {döngü adı: sonuç fonksiyonu}
+        self.stats = {}         # {döngü adı: süre istatistikleri}
+
+    def submit(self, name, fn, on_result=None):
+        """
+        fn'i arka planda çalıştır, bitince on_result(sonuç) ana thread'de çağrılır.
+        Aynı isimli döngü hâlâ çalışıyorsa başlatmaz ve False döner.
+        """
+        stats = self._stats(name)
+        if name in self._running:
+            stats['skipped'] += 1
+            return False
+        self._running[name] = on_result
+        self.pool.start(_CycleTask(name, fn, self._signals))
+        return True
+
+    def is_running(self, name):
+        return name in self._running
+
+    def wait(self, msecs=-1):
+        """Çalışan döngülerin bitmesini bekle (kapanışta)"""
+        return self.pool.waitForDone(msecs)
+
+    def _stats(self, name):
+        if name not in self.stats:
+            self.stats[name] = {'runs': 0, 'failed': 0, 'skipped': 0,
+                                'last_ms': None, 'avg_ms': None, 'max_ms': 0.0, 'total_ms': 0.0}
+        return self.stats[name]
+
+    def _record(self, name, duration):
+        stats = self._stats(name)
+        duration_ms = duration * 1000
+        stats['runs'] += 1
+        stats['last_ms'] = round(duration_ms, 1)
+        stats['total_ms'] += duration_ms
+        stats['avg_ms'] = round(stats['total_ms'] / stats['runs'], 1)
+        stats['max_ms'] = round(max(stats['max_ms'], duration_ms), 1)
+        print(f"[{name}] Döngü {duration_ms:.0f} ms sürdü (ortalama {stats['avg_ms']:.0f} ms, "
+              f"atlanan {stats['skipped']})")
+        self.cycle_finished.emit(name, duration)
+
+    def _on_finished(self, name, result, duration):
+        on_result = self._running.pop(name, None)
+        self._record(name, duration)
+        if on_result is not None:
+            try:
+                on_result(result)
+            except Exception as e:
+                print(f"[{name}] Sonuç işlenirken hata: {e}")
+                traceback.print_exc()
+
+    def _on_failed(self, name, error, duration):
+        self._running.pop(name, None)
+        self._stats(name)['failed'] += 1
+        print(f"[{name}] Döngü hatası: {error}")
+        self._record(name, duration)
@@ -0,0 +1,120 @@
+"""
+Veri Tazelik Politikası
+
+Önbellekteki bir mum serisinin ne zaman yeniden çekileceğine karar verir.
+Tüm zaman dilimleri için sabit 10 sn yerine:
+
+- Oluşmakta olan mum, zaman dilimine göre ayarlanan aralıklarla yenilenir
+  (1m serisi 5 sn'de bir, 1h serisi dakikada bir ...).
+- Mum kapandığı anda kayıt eskir; yeni mum açılır açılmaz veri tekrar çekilir.
+
+Mum sınırları borsa saatine göredir. Yerel saat ile borsa saati arasındaki
+fark (fetch_time ile ölçülür) belirli aralıklarla güncellenir.
+"""
+
+import threading
+import time
+
+from timeframes import TIMEFRAME_MS
+
+# Oluşan mumun yenilenme aralıkları (sn)
+DEFAULT_INTRABAR_REFRESH = {
+    '1m': 5, '3m': 10, '5m': 10, '15m': 20, '30m': 30,
+    '1h': 60, '2h': 60, '4h': 120, '6h': 120, '8h': 120, '12h': 180, '1d': 300
+}
+
+
+class FreshnessPolicy:
+    def __init__(self, intrabar_refresh=None, default_refresh=10, close_delay=0.5, sync_interval=3600):
+        """
+        intrabar_refresh: {zaman dilimi: oluşan mumun yenilenme aralığı (sn)}
+        default_refresh: Listede olmayan zaman dilimleri için aralık (sn)
+        close_delay: Mum kapandıktan sonra borsanın yeni mumu açması için beklenecek süre (sn)
+        sync_interval: Borsa saat farkının yeniden ölçülme aralığı (sn)
+        """
+        self.intrabar_refresh = dict(DEFAULT_INTRABAR_REFRESH)
+        if intrabar_refresh:
+            self.intrabar_refresh.update(intrabar_refresh)
+        self.default_refresh = default_refresh
+        self.close_delay = close_delay
+        self.sync_interval = sync_interval
+
+        self.offset = 0.0           # Borsa saati - yerel saat (sn)
+        self._synced_at = None      # Son ölçüm (monotonic)
+        self._lock = threading.Lock()
+
+    def sync(self, fetch_time):
+        """
+        Borsa saat farkını ölç.
+        fetch_time: Borsa saatini ms olarak döndüren fonksiyon (ccxt fetch_time)
+        """
+        try:
+            sent = time.time()
+            server_ms = fetch_time()
+            received = time.time()
+        except Exception as e:
+            print(f"Borsa saati alınamadı: {e}")
+            return False
+        if server_ms is None:
+            return False
+        # İstek süresinin yarısı kadar önceki yerel saate karşılık gelir
+        offset = server_ms / 1000 - (sent + received) / 2
+        with self._lock:
+            self.offset = offset
+            self._synced_at = time.monotonic()
+        return True
+
+    def maybe_sync(self, fetch_time):
+        """Son ölçümün üzerinden sync_interval geçtiyse saat farkını yeniden ölç"""
+        with self._lock:
+            due = self._synced_at is None or time.monotonic() - self._synced_at >= self.sync_interval
+        if due:
+            self.sync(fetch_time)
+
+    def server_time(self, now=None):
+        """Borsa saati (sn)"""
+        return (time.time() if now is None else now) + self.offset
+
+    def refresh_interval(self, timeframe):
+        return self.intrabar_refresh.get(timeframe, self.default_refresh)
+
+    def next_close(self, timeframe, now=None):
+        """Oluşan mumun kapanış anı (yerel saat, sn), bilinmeyen zaman diliminde None"""
+        interval = TIMEFRAME_MS.get(timeframe)
+        if not interval:
+            return None
+        interval_sec = interval / 1000
+        server_now = self.server_time(now)
+        server_close = (server_now // interval_sec + 1) * interval_sec
+        return server_close - self.offset
+
+    def expires_at(self, timeframe, now=None):
+        """Şimdi çekilen verinin eskiyeceği an (yerel saat, sn)"""
+        if now is None:
+            now = time.time()
+        expires = now + self.refresh_interval(timeframe)
+        close = self.next_close(timeframe, now)
+        if close is not None:
+            expires = min(expires, close + self.close_delay)
+        return expires
+
+
+# Örnek kullanım:
+if __name__ == "__main__":
+    policy = FreshnessPolicy()
+    # Borsa saati yerel saatten 1.5 sn ileride
+    policy.sync(lambda: int((time.time() + 1.5) * 1000))
+    print(f"Saat farkı: {policy.offset:+.2f} sn")
+
+    start = 1_700_000_000.0
+    for timeframe in ('1m', '15m', '1h'):
+        requests = 0
+        now = start
+        while now < start + 3600:   # Bir saat boyunca her saniye soruluyor
+            expires = policy.expires_at(timeframe, now)
+            requests += 1
+            now = max(now + 1, expires)
+        print(f"{timeframe}: saatte {requests} istek (sabit 10 sn ile 360)")
+
+    now = policy.next_close('1m', start) - 1    # Mum kapanmadan 1 sn önce çekildi
+    print(f"1m mum kapanışından {policy.expires_at('1m', now) - now - 1:.1f} sn sonra yeniden çekilir")
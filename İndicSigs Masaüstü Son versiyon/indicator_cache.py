@@ -0,0 +1,127 @@
+"""
+İndikatör Sonuç Önbelleği
+
+Aynı seri için aynı indikatörün tekrar tekrar hesaplanmasını önler (kart
+güncellemesi, alarm kontrolü, sinyal gücü ve bildirim merdiveni aynı
+DataFrame'i ayrı ayrı istiyordu). Sonuçlar şu anahtarla saklanır:
+
+    (seri (coin, timeframe), ilk mumun açılış zamanı, mum sayısı,
+     son mumun açılış zamanı, son mumun OHLCV değerleri, indikatör adı, parametreler)
+
+İlk mum ve mum sayısı, son mumu aynı olup geçmişi farklı olan serileri (ör.
+boşluk doldurulduktan sonra veya daha uzun geçmişle yeniden yüklenen seri)
+ayırır; indikatörler tüm geçmişe bağlıdır.
+Son mum oluşmaya devam ettiği sürece değerleri değiştiğinden anahtara dahildir;
+yeni mum geldiğinde veya son mum güncellendiğinde anahtar değişir ve indikatör
+bir kez yeniden hesaplanır. Önbellek boyutu sınırlıdır, en uzun süredir
+kullanılmayan sonuç atılır (LRU).
+"""
+
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+
+class IndicatorCache:
+    def __init__(self, maxsize=512):
+        """maxsize: Tutulacak en fazla sonuç sayısı"""
+        self.maxsize = maxsize
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+        # İzleme için
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(series, df, name, params=None):
+        """
+        series: (coin, timeframe)
+        df: get_coin_data'nın döndürdüğü DataFrame
+        Dönüş: Anahtar, DataFrame boşsa None
+        """
+        if df is None or df.empty:
+            return None
+        times = df.index.values
+        first_time = int(times[0].astype('datetime64[ms]').astype(np.int64))
+        last_time = int(times[-1].astype('datetime64[ms]').astype(np.int64))
+        last_bar = tuple(float(v) for v in df[['open', 'high', 'low', 'close', 'volume']].iloc[-1])
+        return (tuple(series), first_time, len(df), last_time, last_bar, name,
+                tuple(sorted((params or {}).items())))
+
+    def get(self, key):
+        """Önbellekteki sonuç, yoksa None"""
+        if key is None:
+            return None
+        with self._lock:
+            value = self._items.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        if key is None or value is None:
+            return
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+                self.evictions += 1
+
+    def compute(self, series, df, name, fn, **params):
+        """fn(df, **params) sonucunu önbellekten döndür, yoksa hesaplayıp sakla"""
+        key = self.make_key(series, df, name, params)
+        value = self.get(key)
+        if value is None:
+            value = fn(df, **params)
+            self.put(key, value)
+        return value
+
+    def remove_coin(self, coin):
+        """Bir coine ait tüm sonuçları sil"""
+        with self._lock:
+            for key in [k for k in self._items if k[0][0] == coin]:
+                del self._items[key]
+
+    def __len__(self):
+        return len(self._items)
+
+
+# Örnek kullanım:
+if __name__ == "__main__":
+    import time
+
+    import pandas as pd
+
+    rng = np.random.default_rng(0)
+    close = 100 + np.cumsum(rng.normal(size=1500))
+    df = pd.DataFrame({
+        'open': close, 'high': close + 0.5, 'low': close - 0.5,
+        'close': close, 'volume': rng.random(1500) * 1000
+    }, index=pd.to_datetime(np.arange(1500) * 60_000, unit='ms'))
+
+    def wavetrend(df, n1=10, n2=21):
+        ap = (df['high'] + df['low'] + df['close']) / 3
+        esa = ap.ewm(span=n1, adjust=False).mean()
+        d = abs(ap - esa).ewm(span=n1, adjust=False).mean()
+        wt1 = ((ap - esa) / (0.015 * d)).ewm(span=n2, adjust=False).mean()
+        return {'wt1': wt1.iloc[-1], 'wt2': wt1.rolling(window=4).mean().iloc[-1]}
+
+    cache = IndicatorCache()
+    start = time.perf_counter()
+    for _ in range(7):  # Bir tetiklenmede aynı seriyi isteyen yerler
+        result = cache.compute(('BTCUSDT', '1m'), df, 'wavetrend', wavetrend)
+    print(f"7 istek {(time.perf_counter() - start) * 1000:.1f} ms - hesaplama: {cache.misses}, önbellek: {cache.hits}")
+
+    df.iloc[-1, df.columns.get_loc('close')] += 1   # Oluşan mum güncellendi
+    cache.compute(('BTCUSDT', '1m'), df, 'wavetrend', wavetrend)
+    print("Son mum değişince yeniden hesaplama:", cache.misses)
+
+    cache.compute(('BTCUSDT', '1m'), df.iloc[-500:], 'wavetrend', wavetrend)
+    print("Aynı son mum, daha kısa geçmiş:", cache.misses)
@@ -0,0 +1,260 @@
+"""
+Binance Kline WebSocket Akış Modülü
+
+Alarmı veya açık CoinCard'ı olan her (coin, timeframe) çifti için Binance kline
+akışına abone olur, son mumları bellekte tutar ve get_coin_data'yı REST
+yerine buradan besler. Bağlantı koptuğunda veya mumlar arasında boşluk
+oluştuğunda ilgili seri "hazır değil" olarak işaretlenir; çağıran taraf REST
+ile veriyi çekip seed() ile akışa geri verir.
+
+Test için url parametresine yerel bir WebSocket sunucusu verilebilir
+(bkz. dosyanın sonundaki örnek).
+"""
+
+import asyncio
+import json
+import threading
+import time
+from collections import deque
+
+import websockets
+
+from timeframes import TIMEFRAME_MS
+
+# Binance birleşik akış adresi (abonelikler SUBSCRIBE mesajı ile yapılır)
+BINANCE_STREAM_URL = "wss://stream.binance.com:9443/stream"
+
+# Binance tek mesajda çok fazla parametreyi kabul etmiyor, abonelikleri parçala
+SUBSCRIBE_CHUNK_SIZE = 200
+
+
+def stream_name(coin, timeframe):
+    """(BTCUSDT, 1m) -> btcusdt@kline_1m"""
+    return f"{coin.lower()}@kline_{timeframe}"
+
+
+class KlineStreamManager:
+    def __init__(self, url=BINANCE_STREAM_URL, max_candles=100, reconnect_delay=5):
+        """
+        url: WebSocket adresi (testlerde yerel sunucu verilebilir)
+        max_candles: Her seri için bellekte tutulacak mum sayısı
+        reconnect_delay: Bağlantı koptuğunda yeniden denemeden önce beklenecek süre (sn)
+        """
+        self.url = url
+        self.max_candles = max_candles
+        self.reconnect_delay = reconnect_delay
+
+        self._candles = {}          # {(coin, timeframe): deque([[ts, o, h, l, c, v], ...])}
+        self._ready = set()         # REST ile seed edilmiş ve boşluğu olmayan seriler
+        self._subscriptions = set()
+        self._lock = threading.Lock()
+
+        self._loop = None
+        self._thread = None
+        self._ws = None
+        self._running = False
+        self._request_id = 0
+
+        # İzleme için
+        self.connected = False
+        self.last_message_time = None
+        self.message_count = 0
+
+    def start(self):
+        """Akış thread'ini başlat"""
+        if self._running:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._thread_main, name="KlineStream", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Akışı durdur, bellekteki serileri geçersiz say"""
+        self._running = False
+        if self._loop and self._ws:
+            asyncio.run_coroutine_threadsafe(self._ws.close(), self._loop)
+        with self._lock:
+            self._ready.clear()
+
+    def set_subscriptions(self, pairs):
+        """
+        Takip edilecek (coin, timeframe) çiftlerini güncelle.
+        Yeni çiftler için SUBSCRIBE, artık gerekmeyenler için UNSUBSCRIBE gönderilir.
+        """
+        pairs = {(coin.upper(), timeframe) for coin, timeframe in pairs if timeframe in TIMEFRAME_MS}
+        with self._lock:
+            added = pairs - self._subscriptions
+            removed = self._subscriptions - pairs
+            self._subscriptions = pairs
+            for key in removed:
+                self._candles.pop(key, None)
+                self._ready.discard(key)
+
+        if self._loop and self.connected:
+            if added:
+                asyncio.run_coroutine_threadsafe(self._send_method("SUBSCRIBE", added), self._loop)
+            if removed:
+                asyncio.run_coroutine_threadsafe(self._send_method("UNSUBSCRIBE", removed), self._loop)
+
+    def is_subscribed(self, coin, timeframe):
+        with self._lock:
+            return (coin.upper(), timeframe) in self._subscriptions
+
+    def seed(self, coin, timeframe, ohlcv):
+        """REST ile alınan mumları akışa ver, seri bundan sonra WebSocket ile güncellenir"""
+        key = (coin.upper(), timeframe)
+        with self._lock:
+            if key not in self._subscriptions or not ohlcv:
+                return
+            rows = [[int(c[0])] + [float(v) for v in c[1:6]] for c in ohlcv]
+            self._candles[key] = deque(rows, maxlen=self.max_candles)
+            self._ready.add(key)
+
+    def get_ohlcv(self, coin, timeframe):
+        """
+        Bellekteki mumları fetch_ohlcv formatında döndürür.
+        Seri hazır değilse (seed edilmemiş, boşluk var veya bağlantı yok) None döner.
+        """
+        key = (coin.upper(), timeframe)
+        with self._lock:
+            if not self.connected or key not in self._ready:
+                return None
+            return [list(row) for row in self._candles[key]]
+
+    # ------------------------------------------------------------------
+    # WebSocket döngüsü
+    # ------------------------------------------------------------------
+    def _thread_main(self):
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        try:
+            self._loop.run_until_complete(self._run())
+        finally:
+            self._loop.close()
+            self._loop = None
+
+    async def _run(self):
+        while self._running:
+            try:
+                async with websockets.connect(self.url, ping_interval=20, ping_timeout=20) as ws:
+                    self._ws = ws
+                    self.connected = True
+                    print(f"Kline akışına bağlanıldı: {self.url}")
+
+                    with self._lock:
+                        subscriptions = set(self._subscriptions)
+                    if subscriptions:
+                        await self._send_method("SUBSCRIBE", subscriptions)
+
+                    async for message in ws:
+                        self._handle_message(message)
+
+            except Exception as e:
+                if self._running:
+                    print(f"Kline akışı bağlantı hatası: {e}")
+            finally:
+                self._ws = None
+                self.connected = False
+                # Bağlantı koptuysa aradaki mumlar kaçmış olabilir, REST ile yeniden seed edilmeli
+                with self._lock:
+                    self._ready.clear()
+
+            if self._running:
+                await asyncio.sleep(self.reconnect_delay)
+
+    async def _send_method(self, method, pairs):
+        """SUBSCRIBE/UNSUBSCRIBE mesajlarını parça parça gönder"""
+        if not self._ws:
+            return
+        streams = sorted(stream_name(coin, timeframe) for coin, timeframe in pairs)
+        for i in range(0, len(streams), SUBSCRIBE_CHUNK_SIZE):
+            self._request_id += 1
+            payload = {
+                "method": method,
+                "params": streams[i:i + SUBSCRIBE_CHUNK_SIZE],
+                "id": self._request_id
+            }
+            try:
+                await self._ws.send(json.dumps(payload))
+            except Exception as e:
+                print(f"Kline akışı {method} hatası: {e}")
+                return
+            # Binance saniyede en fazla 5 kontrol mesajına izin veriyor
+            await asyncio.sleep(0.25)
+
+    def _handle_message(self, message):
+        try:
+            data = json.loads(message)
+        except ValueError:
+            return
+
+        # Birleşik akışta veri "data" alanında gelir
+        data = data.get("data", data)
+        if data.get("e") != "kline":
+            return
+
+        k = data["k"]
+        key = (k["s"].upper(), k["i"])
+        row = [int(k["t"]), float(k["o"]), float(k["h"]), float(k["l"]), float(k["c"]), float(k["v"])]
+        interval = TIMEFRAME_MS.get(k["i"])
+
+        self.last_message_time = time.time()
+        self.message_count += 1
+
+        with self._lock:
+            if key not in self._ready:
+                return
+            candles = self._candles[key]
+            last_open = candles[-1][0]
+
+            if row[0] == last_open:
+                # Oluşmakta olan mum güncellendi
+                candles[-1] = row
+            elif interval and row[0] == last_open + interval:
+                # Yeni mum açıldı
+                candles.append(row)
+            elif row[0] > last_open:
+                # Arada kaçan mum(lar) var, REST'e düş
+                print(f"Kline akışında boşluk: {key[0]} {key[1]}, REST ile yenilenecek")
+                self._ready.discard(key)
+
+
+# Yerel test sunucusu ile örnek kullanım
+if __name__ == "__main__":
+    async def fake_binance(websocket):
+        """SUBSCRIBE mesajını bekleyip sahte kline verisi gönderen yerel sunucu"""
+        request = json.loads(await websocket.recv())
+        await websocket.send(json.dumps({"result": None, "id": request["id"]}))
+        open_time = 1_699_999_980_000
+        for i, price in enumerate([100.0, 101.0, 102.5]):
+            await websocket.send(json.dumps({
+                "stream": "btcusdt@kline_1m",
+                "data": {
+                    "e": "kline", "s": "BTCUSDT",
+                    "k": {"t": open_time + (60_000 if i == 2 else 0), "s": "BTCUSDT", "i": "1m",
+                          "o": "100", "h": str(price), "l": "99", "c": str(price), "v": "10", "x": i == 1}
+                }
+            }))
+            await asyncio.sleep(0.1)
+        await asyncio.sleep(2)
+
+    async def serve():
+        async with websockets.serve(fake_binance, "127.0.0.1", 8765):
+            await asyncio.sleep(4)
+
+    server_thread = threading.Thread(target=lambda: asyncio.run(serve()), daemon=True)
+    server_thread.start()
+    time.sleep(0.5)
+
+    manager = KlineStreamManager(url="ws://127.0.0.1:8765", reconnect_delay=60)
+    manager.set_subscriptions({("BTCUSDT", "1m")})
+    manager.seed("BTCUSDT", "1m", [[1_699_999_860_000, 98, 99, 97, 98, 5],
+                                   [1_699_999_920_000, 98, 100, 97, 99, 5],
+                                   [1_699_999_980_000, 99, 100, 98, 100, 1]])
+    manager.start()
+    time.sleep(1.5)
+
+    candles = manager.get_ohlcv("BTCUSDT", "1m")
+    print("Alınan mesaj sayısı:", manager.message_count)
+    print("Son mumlar:", candles[-2:] if candles else candles)
+    manager.stop()
@@ -11,18 +11,41 @@ from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
                             QDateTimeEdit, QCheckBox, QGroupBox, QStackedWidget,
                             QListWidgetItem, QTableWidget, QTableWidgetItem,
                             QTextEdit, QGridLayout)
-from PyQt5.QtCore import Qt, QTimer, QDateTime, QSize
+from PyQt5.QtCore import Qt, QTimer, QDateTime, QSize, pyqtSignal
 from PyQt5.QtGui import QPalette, QColor, QIcon
 import pandas as pd
 import numpy as np
 import ccxt
 # import pandas_ta as ta  # Removed due to Windows compatibility issues
-import winsound
 import telegram
-from nextjs_integration import send_to_nextjs
+from nextjs_integration import send_batch_to_nextjs
 import requests
 from login import API_URL
 from telegram_groups import TelegramGroupsDialog
+from kline_stream import KlineStreamManager
+from candle_store import CandleStore
+from timeframes import BASE_TIMEFRAME, required_base_capacity, source_timeframe
+from batch_indicators import compute_indicator_batch
+from streaming_indicators import IndicatorStreams
+from threshold_index import ThresholdIndex, alarm_key
+from alarm_store import AlarmStore
+from alert_sound import AlertSound
+from notification_dispatcher import NotificationDispatcher, JOB_DELIVERED
+from notification_outbox import NotificationOutbox
+from telegram_routing import TelegramRouter
+from telegram_sender import TelegramSender
+from signal_model import Signal, format_market_position
+from btc_context import BTCContext
+from price_history import PriceHistory
+from market_ranking import MarketRanking
+from cycle_runner import CycleRunner
+from async_fetcher import AsyncCandleFetcher
+from indicator_cache import IndicatorCache
+from candle_cache import CandleCache
+from freshness import FreshnessPolicy
+from request_scheduler import (RequestScheduler, PRIORITY_ALARM, PRIORITY_CONFIRM, PRIORITY_CARD,
+                               PRIORITY_MARKET, KLINES_WEIGHT, TICKERS_WEIGHT, TIME_WEIGHT, RequestDeferred,
+                               track_response_headers)
 
 def calculate_wavetrend(df, n1=10, n2=21):
     ap = (df['high'] + df['low'] + df['close']) / 3
@@ -43,31 +66,34 @@ def calculate_macd_dema(df):
     lma = 26  # DEMA Uzun
     tsp = 9   # Sinyal
 
+    # Ara seriler yerel tutulur; df önbellekte paylaşıldığı için sütun eklenmez
+    close = df['close']
+
     # DEMA Yavaş hesaplama
-    df['MMEslowa'] = df['close'].ewm(span=lma, adjust=False).mean()
-    df['MMEslowb'] = df['MMEslowa'].ewm(span=lma, adjust=False).mean()
-    df['DEMAslow'] = (2 * df['MMEslowa']) - df['MMEslowb']
+    MMEslowa = close.ewm(span=lma, adjust=False).mean()
+    MMEslowb = MMEslowa.ewm(span=lma, adjust=False).mean()
+    DEMAslow = (2 * MMEslowa) - MMEslowb
 
     # DEMA Hızlı hesaplama
-    df['MMEfasta'] = df['close'].ewm(span=sma, adjust=False).mean()
-    df['MMEfastb'] = df['MMEfasta'].ewm(span=sma, adjust=False).mean()
-    df['DEMAfast'] = (2 * df['MMEfasta']) - df['MMEfastb']
+    MMEfasta = close.ewm(span=sma, adjust=False).mean()
+    MMEfastb = MMEfasta.ewm(span=sma, adjust=False).mean()
+    DEMAfast = (2 * MMEfasta) - MMEfastb
 
     # MACD ZeroLag Line
-    df['LigneMACDZeroLag'] = df['DEMAfast'] - df['DEMAslow']
+    LigneMACDZeroLag = DEMAfast - DEMAslow
 
     # Sinyal çizgisi
-    df['MMEsignala'] = df['LigneMACDZeroLag'].ewm(span=tsp, adjust=False).mean()
-    df['MMEsignalb'] = df['MMEsignala'].ewm(span=tsp, adjust=False).mean()
-    df['Lignesignal'] = (2 * df['MMEsignala']) - df['MMEsignalb']
+    MMEsignala = LigneMACDZeroLag.ewm(span=tsp, adjust=False).mean()
+    MMEsignalb = MMEsignala.ewm(span=tsp, adjust=False).mean()
+    Lignesignal = (2 * MMEsignala) - MMEsignalb
 
     # MACD ZeroLag Histogram
-    df['MACDZeroLag'] = df['LigneMACDZeroLag'] - df['Lignesignal']
+    MACDZeroLag = LigneMACDZeroLag - Lignesignal
 
     return {
-        'MACD_DEMA': df['LigneMACDZeroLag'].iloc[-1],
-        'Signal_DEMA': df['Lignesignal'].iloc[-1],
-        'MACD_Hist_DEMA': df['MACDZeroLag'].iloc[-1]
+        'MACD_DEMA': LigneMACDZeroLag.iloc[-1],
+        'Signal_DEMA': Lignesignal.iloc[-1],
+        'MACD_Hist_DEMA': MACDZeroLag.iloc[-1]
     }
 
 def calculate_bollinger_bands(df, length=20, mult=2.0, ma_type="SMA"):
@@ -445,6 +471,9 @@ class SavedCoinsDialog(QDialog):
                 QMessageBox.warning(self, "Hata", f"Coin silinirken hata oluştu: {str(e)}")
             
 class MainWindow(QMainWindow):
+    # Arka plan döngülerinden gelen bildirimler ana thread'de listeye eklenir
+    notification_received = pyqtSignal(str)
+    
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Kripto Para Analiz")
@@ -453,24 +482,39 @@ class MainWindow(QMainWindow):
         # Dosya yolları
         self.saved_coins_file = "saved_coins.json"
         self.settings_file = "settings.json"
+        # Coin -> Telegram grupları indeksi (settings.json değişince yeniden yüklenir)
+        self.telegram_router = TelegramRouter(self.settings_file)
         
         # Exchange setup
-        self.exchange = ccxt.binance()
+        self.exchange = track_response_headers(ccxt.binance())
+        # Tüm REST istekleri Binance ağırlık bütçesinden önceliğe göre geçer
+        # (alarm > onay zaman dilimleri > kartlar > piyasa verisi)
+        self.request_scheduler = RequestScheduler()
+        # Döngü başında gereken tüm seriler asyncio istemcisiyle eşzamanlı çekilir
+        self.candle_fetcher = AsyncCandleFetcher(scheduler=self.request_scheduler)
+        
+        # Kline WebSocket akışı (alarm ve kart verilerini REST yerine buradan alır)
+        self.kline_stream = KlineStreamManager()
         
         # Telegram bot setup
         self.telegram_bot = None
         self.telegram_token = ""
         self.telegram_chat_ids = []
+        self.telegram_sender = None
         self.load_settings()
         self.setup_telegram_bot()
         
+        # Kart güncelleme ve alarm kontrolü arka planda çalışır, pencere donmaz
+        self.cycle_runner = CycleRunner()
+        self.notification_received.connect(self.add_notification)
+        
         # Timer setup
         self.timer = QTimer()
         self.timer.timeout.connect(self.update_data)
         
         # Alarm timer setup
         self.alarm_timer = QTimer()
-        self.alarm_timer.timeout.connect(self.check_all_alarms)
+        self.alarm_timer.timeout.connect(self.schedule_alarm_check)
         # Timer'lar başlangıçta başlamayacak, sadece başlat butonuna basıldığında başlayacak
         
         # Önceki değerleri tutmak için sözlük
@@ -481,8 +525,48 @@ class MainWindow(QMainWindow):
         
         # Coin verileri için sözlükler
         self.coin_cards = {}
-        self.coin_data_cache = {}
-        self.last_update_time = {}
+        
+        # Mum verileri için halka tamponlar (sadece eksik mumlar çekilir)
+        # 1m serisi daha uzun tutulur, 3m/5m/15m bu seriden türetilir (en az 100 mum);
+        # daha uzun dilimler Binance'ten çekilir, Binance'in sunmadığı ve 1500 1m mumdan
+        # türetilemeyen dilimler (örn. 45m: 4500 mum gerekir) sunulamaz ve loglanır
+        self.candle_store = CandleStore(capacity=100, capacities={BASE_TIMEFRAME: 1500})
+        self._unservable_timeframes = set()
+        
+        # Son çekilen seriler bayt bütçeli LRU'da tutulur; bütçeden atılan seriler
+        # mum deposundan da silinir (bellek sabit kalır). Oluşan mum zaman dilimine
+        # göre yenilenir, mum kapanınca (borsa saatine göre) hemen yeniden çekilir
+        self.freshness = FreshnessPolicy()
+        self.candle_cache = CandleCache(freshness=self.freshness, on_evict=self.candle_store.remove_series)
+        
+        # Her seri için indikatör durumları (yeni mumlar sabit sürede işlenir)
+        self.indicator_streams = IndicatorStreams()
+        self.cycle_indicators = {}  # Bir kontrol döngüsünde hesaplanan {(coin, timeframe): (df, sonuçlar)}
+        # Seri, son mum ve parametrelere göre indikatör sonuçları (yeni veri gelmedikçe yeniden hesaplanmaz)
+        self.indicator_cache = IndicatorCache()
+        
+        # Alarmlar SQLite'ta (WAL) tutulur; alarms.json ilk açılışta bir kez içe aktarılır
+        self.alarm_store = AlarmStore()
+        
+        # Alarm sesi arka planda çalınır, değerlendirme döngüsünü bekletmez
+        self.alert_sound = AlertSound()
+        
+        # Bildirimler her hedef için ayrı kuyruk ve thread ile gönderilir;
+        # teslim edilene kadar outbox.db'de saklanır (hedef kapalıyken sinyal kaybolmaz)
+        # Bir saatten eski veya 10 denemede gönderilemeyen sinyaller bırakılır
+        self.notification_outbox = NotificationOutbox(max_attempts=10, max_age=3600)
+        self.notification_outbox.purge()
+        self.notification_dispatcher = NotificationDispatcher(outbox=self.notification_outbox)
+        self.notification_dispatcher.add_sink("Telegram", self.deliver_telegram)
+        self.notification_dispatcher.add_sink("Backend", lambda job: self.send_web_notification(job['message'], job.get('signal')))
+        # Next.js: yoğun dakikalarda sinyaller 2 sn'lik pencerede toplanıp tek istekte gönderilir
+        self.notification_dispatcher.add_sink("Next.js", self.deliver_nextjs, batch_size=25, batch_window=2.0)
+        # Önceki çalışmadan kalan bildirimleri gönder
+        self.notification_dispatcher.resume()
+        
+        # Eşik alarmları için sıralı indeks (alarm deposu değiştiğinde yeniden kurulur)
+        self.threshold_index = ThresholdIndex()
+        self.alarms_cache = None  # (depo sürümü, alarms, plan)
         
         # Bildirimler listesi
         self.notifications = []
@@ -495,20 +579,21 @@ class MainWindow(QMainWindow):
         self.alarm_trigger_price = None
         
         # BTC fiyatları
-        self.btc_prices = {}  # Her zaman dilimi için BTC fiyatlarını tutacak dictionary
+        # Dakikalık BTC fiyat geçmişi (halka tampon, her dakika dosyaya tek kayıt eklenir)
+        self.btc_price_history = PriceHistory("btc_prices.bin", legacy_json="btc_prices.json")
+        # Sinyallere eklenen BTC raporu dakikada bir kez hesaplanır, tüm sinyaller paylaşır
+        self.btc_context = BTCContext(lambda: self.get_coin_data('BTCUSDT', '1m'), history=self.btc_price_history)
         
-        # 24 saatlik performans verileri için cache
-        self.market_performance_cache = {}
-        self.market_performance_last_update = None
+        # 24 saatlik performans sıralaması (5 dakikada bir arka planda yenilenir)
+        self.market_ranking = MarketRanking(
+            lambda: self.exchange_call(self.exchange.fetch_tickers, weight=TICKERS_WEIGHT, priority=PRIORITY_MARKET))
+        self.market_ranking.refresh_async()
         
         # Spam önleme için son sinyal zamanları
         self.last_signal_times = {}  # {coin: datetime}
         
         # UI setup
         self.setup_ui()
-        
-        # Kayıtlı BTC fiyatlarını yükle
-        self.load_btc_prices()
     
     def load_settings(self):
         """Ayarları yükle"""
@@ -540,6 +625,11 @@ class MainWindow(QMainWindow):
                     connect_timeout=30.0
                 )
                 self.telegram_bot = telegram.Bot(token=self.telegram_token, request=request)
+                # Sinyal mesajları hız sınırlarına uyan paralel gönderici ile gider
+                if self.telegram_sender is None or self.telegram_sender.token != self.telegram_token:
+                    if self.telegram_sender is not None:
+                        self.telegram_sender.close()
+                    self.telegram_sender = TelegramSender(self.telegram_token)
                 print("Telegram bot başarıyla kuruldu!")
             else:
                 print("Telegram bot kurulumu için token ve en az bir chat ID gerekli!")
@@ -548,89 +638,96 @@ class MainWindow(QMainWindow):
             print(f"Telegram bot kurulumunda hata: {e}")
             self.telegram_bot = None
 
-    def send_telegram_message(self, message):
-        """Birden fazla gruba Telegram mesajı gönder"""
+    def send_telegram_message(self, message, chat_ids=None, coin=None):
+        """
+        Birden fazla gruba Telegram mesajı gönder
+        chat_ids: Verilirse sadece bu gruplara gönderilir (tekrar denemeler için)
+        coin: Sinyalin coini; verilmezse mesajdan okunur
+        Dönüş: Gönderilemeyen chat_id kümesi, bot yoksa veya genel hatada None
+        """
         try:
             if not self.telegram_bot:
                 self.setup_telegram_bot()
             
             if self.telegram_bot:
-                # Ayarlardan grupları al
-                with open(self.settings_file, "r") as f:
-                    settings = json.load(f)
-                
-                telegram_groups = settings.get("telegram_groups", [])
-                
                 # Mesajdaki coin'i bul
-                coin = ""
-                for line in message.split('\n'):
-                    if 'Coin:' in line:
-                        coin = line.split('Coin:')[1].strip()
-                        break
+                if not coin:
+                    coin = ""
+                    for line in message.split('\n'):
+                        if 'Coin:' in line:
+                            coin = line.split('Coin:')[1].strip()
+                            break
                 
                 print(f"Mesajdaki coin: {coin}")  # Debug için
                 
-                # Her grup için kontrol et
-                for group in telegram_groups:
-                    group_coins = group.get("coins", "")
-                    group_name = group.get("name", "")
+                # Coin'e ait gruplar ve "ALL" grupları (indeksten, dosya okumadan)
+                groups = {}
+                for group in self.telegram_router.route(coin):
                     chat_id = group.get("chat_id", "")
-                    
-                    print(f"Grup kontrol ediliyor: {group_name}, Coins: {group_coins}, Chat ID: {chat_id}")
-                    
-                    # Eğer grup "ALL" ise veya coin grup listesinde varsa
-                    if group_coins == "ALL" or coin == group_coins:
-                        try:
-                            # Basit senkron yaklaşım - requests kullanarak
-                            import requests
-                            
-                            telegram_url = f"https://api.telegram.org/bot{self.telegram_token}/sendMessage"
-                            
-                            # Inline klavye için buton tanımla
-                            reply_markup = {
-                                "inline_keyboard": [
-                                    [
-                                        {
-                                            "text": "Simülasyon Sitesinde Dene",
-                                            "url": "https://trading-signals-app-24yu.vercel.app/"
-                                        }
-                                    ]
-                                ]
-                            }
-
-                            payload = {
-                                'chat_id': chat_id,
-                                'text': message,
-                                'parse_mode': 'HTML',
-                                'reply_markup': json.dumps(reply_markup) # JSON nesnesini string'e çevir
+                    # Önceki denemede başarılı olan gruplar atlanır
+                    if chat_ids is not None and chat_id not in chat_ids:
+                        continue
+                    groups[chat_id] = group.get("name", "")
+                
+                # Inline klavye için buton tanımla
+                reply_markup = {
+                    "inline_keyboard": [
+                        [
+                            {
+                                "text": "Simülasyon Sitesinde Dene",
+                                "url": "https://trading-signals-app-24yu.vercel.app/"
                             }
-                            
-                            response = requests.post(telegram_url, data=payload, timeout=30)
-                            
-                            if response.status_code == 200:
-                                print(f"Mesaj başarıyla gönderildi: {group_name}")
-                            else:
-                                print(f"Grup {group_name} için mesaj gönderilirken hata: HTTP {response.status_code}")
-                                
-                        except Exception as e:
-                            print(f"Grup {group_name} için mesaj gönderilirken hata: {e}")
+                        ]
+                    ]
+                }
+                
+                # Gruplara paralel gönderim (hız sınırı ve 429 beklemesi gönderici içinde)
+                failed = self.telegram_sender.send(list(groups), message, reply_markup)
+                for chat_id, group_name in groups.items():
+                    if chat_id in failed:
+                        print(f"Grup {group_name} için mesaj gönderilemedi")
                     else:
-                        print(f"Grup {group_name} için coin eşleşmedi: {group_coins} != {coin}")
+                        print(f"Mesaj başarıyla gönderildi: {group_name}")
+                return failed
             else:
                 print("Telegram mesajı gönderilemedi: Bot eksik!")
         except Exception as e:
             print(f"Telegram mesajı gönderilirken genel hata: {e}")
+        return None
+
+    def deliver_telegram(self, job):
+        """Dağıtıcı için Telegram hedefi; tekrar denemede sadece başarısız gruplara gönderilir"""
+        failed = self.send_telegram_message(job['message'], job.get('chat_ids'), job.get('coin'))
+        if failed is None:
+            return False
+        job['chat_ids'] = failed
+        return not failed
 
-    def send_web_notification(self, message):
-        """Web sitesine bildirim gönder"""
+    def deliver_nextjs(self, jobs):
+        """
+        Dağıtıcı için toplu Next.js hedefi; tekrar denemede sadece gönderilemeyenler gider.
+        Teslim edilen işler JOB_DELIVERED ile işaretlenir, dağıtıcı onları başarılı sayar.
+        """
+        pending = [job for job in jobs if not job.get(JOB_DELIVERED)]
+        failed = send_batch_to_nextjs([job.get('signal') or job['message'] for job in pending])
+        for index, job in enumerate(pending):
+            if index not in failed:
+                job[JOB_DELIVERED] = True
+        return not failed
+
+    def send_web_notification(self, message, signal=None):
+        """Web sitesine bildirim gönder. Başarılıysa (veya giriş yapılmamışsa) True döner"""
         try:
             if self.user and self.token:
-                notification_data = {
-                    "type": "SIGNAL",
-                    "userId": self.user['id'],
-                    "status": "TETİKLENDİ",
-                    "messageContent": message  # Telegram'a gönderilen mesajın aynısı
-                }
+                if signal is not None:
+                    notification_data = signal.to_backend_payload(self.user['id'])
+                else:
+                    notification_data = {
+                        "type": "SIGNAL",
+                        "userId": self.user['id'],
+                        "status": "TETİKLENDİ",
+                        "messageContent": message  # Telegram'a gönderilen mesajın aynısı
+                    }
 
                 print("\n=== Web Bildirimi Debug ===")
                 print("Gönderilen veri:")
@@ -642,7 +739,8 @@ class MainWindow(QMainWindow):
                         "Authorization": f"Bearer {self.token}",
                         "Content-Type": "application/json"
                     },
-                    json=notification_data
+                    json=notification_data,
+                    timeout=10
                 )
                 
                 print("\nAPI URL:", f"{API_URL}/api/notifications")
@@ -656,14 +754,35 @@ class MainWindow(QMainWindow):
                 
                 if response.status_code != 201:
                     print(f"Web bildirimi gönderilemedi: {response.text}")
+                    return False
+            return True
                 
         except Exception as e:
             print(f"Web bildirimi gönderilirken hata: {str(e)}")
             import traceback
             print(traceback.format_exc())
+            return False
     
-    def send_notification(self, message):
-        """Hem Telegram hem web sitesine bildirim gönder"""
+    def send_notification(self, message, coin=None):
+        """
+        Hem Telegram hem web sitesine bildirim gönder.
+        Mesaj hazırlanıp dağıtıcı kuyruklarına eklenir, gönderim arka planda yapılır.
+        message: Signal nesnesi (her hedef kendi formatını üretir) veya hazır metin
+        coin: Telegram gruplarını seçmek için (verilmezse mesajdan okunur)
+        """
+        if isinstance(message, Signal):
+            signal = message
+            try:
+                # Aynı dakikadaki tüm sinyaller önbellekteki BTC raporunu kullanır
+                signal.btc_report = self.get_btc_analysis()
+                btc_snapshot = self.btc_context.snapshot()
+                if btc_snapshot:
+                    signal.btc_changes = btc_snapshot['changes']
+            except Exception as e:
+                print(f"Bildirim gönderme hatası: {str(e)}")
+            self.notification_dispatcher.dispatch(signal.to_telegram_text(), key=signal.key, coin=signal.coin, signal=signal)
+            return
+        
         try:
             # BTC analizini al
             btc_report = self.get_btc_analysis()
@@ -677,16 +796,12 @@ class MainWindow(QMainWindow):
                 # Eğer format farklıysa sona ekle
                 enhanced_message = message + "\n\n" + btc_report
             
-            # Bildirimleri gönder
-            self.send_telegram_message(enhanced_message)
-            self.send_web_notification(enhanced_message)
-            send_to_nextjs(enhanced_message)  # Next.js API'ye gönder
+            # Bildirimleri gönder (Telegram, backend API, Next.js)
+            self.notification_dispatcher.dispatch(enhanced_message, coin=coin)
         except Exception as e:
             print(f"Bildirim gönderme hatası: {str(e)}")
             # Hata durumunda orijinal mesajı gönder
-            self.send_telegram_message(message)
-            self.send_web_notification(message)
-            send_to_nextjs(message)  # Next.js API'ye gönder
+            self.notification_dispatcher.dispatch(message, coin=coin)
 
     def setup_ui(self):
         central_widget = QWidget()
@@ -853,6 +968,7 @@ class MainWindow(QMainWindow):
         
         # Timer aktifse veriyi güncelle
         if self.timer.isActive():
+            self.update_stream_subscriptions()
             self.calculate_indicators(coin)
     
     def show_list_view(self):
@@ -882,119 +998,386 @@ class MainWindow(QMainWindow):
         
         QMessageBox.information(self, "Bilgi", "Görünüm sıfırlandı!")
 
+    def source_timeframe(self, timeframe):
+        """
+        Zaman diliminin verisinin alınacağı seri (türetilecekse 1m), sunulamıyorsa None.
+        Sunulamayan zaman dilimi bir kez loglanır.
+        """
+        base_capacity = self.candle_store.capacity_for(BASE_TIMEFRAME)
+        source = source_timeframe(timeframe, base_capacity)
+        if source is None and timeframe not in self._unservable_timeframes:
+            self._unservable_timeframes.add(timeframe)
+            required = required_base_capacity(timeframe)
+            print(f"{timeframe} zaman dilimi sunulamıyor: Binance sunmuyor, türetmek için "
+                  f"{required or '?'} adet 1m mum gerekir (tampon {base_capacity})")
+        return source
+
     def get_coin_data(self, coin, timeframe):
         try:
-            current_time = datetime.now()
-            cache_key = f"{coin}_{timeframe}"
-            
-            # Check if we have cached data and if it's still fresh (less than 10 seconds old)
-            if (cache_key in self.coin_data_cache and 
-                cache_key in self.last_update_time and 
-                (current_time - self.last_update_time[cache_key]).total_seconds() < 10):
-                return self.coin_data_cache[cache_key]
+            source = self.source_timeframe(timeframe)
+            if source is None:
+                return None
             
-            # Fetch new data from the exchange
-            try:
-                ohlcv = self.exchange.fetch_ohlcv(coin, timeframe, limit=100)
-                if not ohlcv:
-                    print(f"Warning: No data received for {coin} on {timeframe} timeframe")
+            # 1m serisinden türetilebilen zaman dilimleri için ayrı istek atma
+            if source != timeframe:
+                if self.refresh_candles(coin, source) is None:
                     return None
-                
-                df = pd.DataFrame(ohlcv, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
-                df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-                df.set_index('timestamp', inplace=True)
-                
-                # Cache the data
-                self.coin_data_cache[cache_key] = df
-                self.last_update_time[cache_key] = current_time
-                
-                return df
-                
-            except ccxt.NetworkError as e:
-                print(f"Network error while fetching data for {coin}: {str(e)}")
-                return None
-            except ccxt.ExchangeError as e:
-                print(f"Exchange error for {coin}: {str(e)}")
-                return None
-            except Exception as e:
-                print(f"Unexpected error fetching data for {coin}: {str(e)}")
-                return None
+                return self.candle_store.get_derived_frame(coin, timeframe, source)
+            
+            return self.refresh_candles(coin, timeframe)
                 
         except Exception as e:
             print(f"Error in get_coin_data: {str(e)}")
             return None
 
-    def calculate_indicators(self, symbol):
+    def refresh_candles(self, coin, timeframe):
+        """Seriyi güncel tutar ve DataFrame olarak döndürür (akış > önbellek > REST)"""
+        # Kline akışında güncel veri varsa REST'e hiç gitme
+        stream_ohlcv = self.kline_stream.get_ohlcv(coin, timeframe)
+        last_open = self.candle_store.last_open_time(coin, timeframe)
+        if stream_ohlcv and last_open is not None:
+            self.candle_store.merge(coin, timeframe, [row for row in stream_ohlcv if row[0] >= last_open])
+            df = self.candle_store.get_frame(coin, timeframe)
+            # Akıştan beslenen seri de LRU'da güncel kalsın (bütçeden atılmasın)
+            self.candle_cache.put(coin, timeframe, df)
+            return df
+        
+        # Önbellekteki veri taze mi (yenilenme aralığı dolmadı ve mum kapanmadı)
+        df = self.candle_cache.get(coin, timeframe)
+        if df is not None:
+            return df
+        
+        # Fetch new data from the exchange
         try:
-            if symbol not in self.coin_cards:
-                return
-                
-            timeframe = self.timeframe_combo.currentText()
-            df = self.get_coin_data(symbol, timeframe)
-            
-            if df is None:
-                return
-            
-            # Son fiyat
-            last_price = df['close'].iloc[-1]
-            
-            # WaveTrend hesapla
-            wt_data = calculate_wavetrend(df)
-            
-            # MACD DEMA hesapla
-            macd_data = calculate_macd_dema(df)
-            
-            # Bollinger Bands hesapla
-            bb_data = calculate_bollinger_bands(df)
+            # Seride kayıtlı son mumdan itibaren sadece eksik mumları iste
+            since = self.candle_store.since_for(coin, timeframe, self.exchange.milliseconds())
+            if since is not None:
+                ohlcv = self.fetch_candles_since(coin, timeframe, since)
+            else:
+                ohlcv = self.fetch_candle_history(coin, timeframe, self.candle_store.capacity_for(timeframe))
+            return self.store_candles(coin, timeframe, ohlcv, since is None)
+            
+        except RequestDeferred as e:
+            # Ağırlık bütçesi dolu: varsa eldeki (biraz eski) seri kullanılır
+            print(f"{coin} {timeframe}: {e}")
+            return self.candle_store.get_frame(coin, timeframe)
+        except ccxt.NetworkError as e:
+            print(f"Network error while fetching data for {coin}: {str(e)}")
+            return None
+        except ccxt.ExchangeError as e:
+            print(f"Exchange error for {coin}: {str(e)}")
+            return None
+        except Exception as e:
+            print(f"Unexpected error fetching data for {coin}: {str(e)}")
+            return None
+
+    def store_candles(self, coin, timeframe, ohlcv, full_load):
+        """
+        Borsadan gelen mumları seriye işle ve önbelleğe yaz.
+        full_load: Seri baştan yüklendi mi (False ise since= ile eksik mumlar alındı)
+        Dönüş: Güncel DataFrame, tam yüklemede veri yoksa None
+        """
+        if full_load:
+            if not ohlcv:
+                print(f"Warning: No data received for {coin} on {timeframe} timeframe")
+                return None
+            self.candle_store.reset(coin, timeframe, ohlcv)
+        else:
+            # Oluşan son mum yerinde güncellenir, kapanan mumlar eklenir
+            self.candle_store.merge(coin, timeframe, ohlcv)
+        
+        # Akışa abone olunan seriyse buradan sonra WebSocket ile güncellensin
+        if self.kline_stream.is_subscribed(coin, timeframe):
+            self.kline_stream.seed(coin, timeframe, self.candle_store.get_ohlcv(coin, timeframe))
+        
+        df = self.candle_store.get_frame(coin, timeframe)
+        
+        # Cache the data
+        self.candle_cache.put(coin, timeframe, df)
+        
+        return df
+
+    def prefetch_candles(self, keys):
+        """
+        Döngüde gereken ve REST ile çekilmesi gereken tüm serileri eşzamanlı çek.
+        Akıştan beslenen veya önbellekte taze olan seriler atlanır; başarısız
+        olanlar get_coin_data içinde tek tek yeniden denenir.
+        """
+        # Mum sınırları borsa saatine göre hesaplanır (saat farkı saatte bir ölçülür)
+        self.freshness.maybe_sync(lambda: self.exchange_call(self.exchange.fetch_time, weight=TIME_WEIGHT))
+        now_ms = self.exchange.milliseconds()
+        requests = {}
+        for coin, timeframe in keys:
+            # Türetilen zaman dilimleri 1m serisinden hesaplanır
+            timeframe = self.source_timeframe(timeframe)
+            if timeframe is None or (coin, timeframe) in requests:
+                continue
+            if self.kline_stream.get_ohlcv(coin, timeframe) and self.candle_store.last_open_time(coin, timeframe) is not None:
+                continue
+            if self.candle_cache.get(coin, timeframe) is not None:
+                continue
+            since = self.candle_store.since_for(coin, timeframe, now_ms)
+            bars = 100 if since is not None else self.candle_store.capacity_for(timeframe)
+            requests[(coin, timeframe)] = (coin, timeframe, since, bars)
+        
+        if not requests:
+            return
+        
+        start = time.perf_counter()
+        try:
+            results = self.candle_fetcher.fetch_many(requests.values(), self.request_scheduler.current_priority())
+        except Exception as e:
+            print(f"Toplu veri çekiminde hata: {e}")
+            return
+        
+        failed = 0
+        for (coin, timeframe), ohlcv in results.items():
+            if isinstance(ohlcv, Exception):
+                print(f"Veri çekilemedi ({coin} {timeframe}): {ohlcv}")
+                failed += 1
+                continue
+            try:
+                self.store_candles(coin, timeframe, ohlcv, requests[(coin, timeframe)][2] is None)
+            except Exception as e:
+                print(f"Mumlar işlenirken hata ({coin} {timeframe}): {e}")
+                failed += 1
+        print(f"{len(requests)} seri {(time.perf_counter() - start) * 1000:.0f} ms'de eşzamanlı çekildi"
+              + (f" ({failed} hata)" if failed else ""))
+
+    def exchange_call(self, fn, *args, weight=1, priority=None, **kwargs):
+        """Borsa isteğini zamanlayıcıdan geçirerek çağır (öncelik verilmezse thread'in önceliği)"""
+        return self.request_scheduler.call(fn, *args, weight=weight, priority=priority,
+                                           headers=lambda: self.exchange.last_response_headers, **kwargs)
+
+    def fetch_candles_since(self, coin, timeframe, since, limit=100):
+        """
+        since'tan itibaren oluşan muma kadar tüm mumları çeker.
+        Sayfa dolu geldiyse (uzun boşluk) sonraki mumlar 1000'lik sayfalarla istenir;
+        sadece ilk 100 mum alınıp saatler önceki veri güncel sanılmaz.
+        """
+        interval = self.exchange.parse_timeframe(timeframe) * 1000
+        ohlcv = []
+        while True:
+            batch = self.exchange_call(self.exchange.fetch_ohlcv, coin, timeframe, since=since, limit=limit,
+                                       weight=KLINES_WEIGHT)
+            ohlcv.extend(batch)
+            if len(batch) < limit:
+                break
+            since = batch[-1][0] + interval
+            limit = 1000
+        return ohlcv
+
+    def fetch_candle_history(self, coin, timeframe, bars):
+        """Son 'bars' kadar mumu çeker, Binance limiti (1000) aşılırsa sayfa sayfa ister"""
+        if bars <= 1000:
+            return self.exchange_call(self.exchange.fetch_ohlcv, coin, timeframe, limit=bars, weight=KLINES_WEIGHT)
+        
+        interval = self.exchange.parse_timeframe(timeframe) * 1000
+        since = self.exchange.milliseconds() - bars * interval
+        ohlcv = []
+        while True:
+            batch = self.exchange_call(self.exchange.fetch_ohlcv, coin, timeframe, since=since, limit=1000,
+                                       weight=KLINES_WEIGHT)
+            ohlcv.extend(batch)
+            if len(batch) < 1000:
+                break
+            since = batch[-1][0] + interval
+        return ohlcv[-bars:]
+
+    def card_subscriptions(self):
+        """Açık kartların coinleri ve seçili zaman dilimi (ana thread'de okunur)"""
+        timeframe_combo = getattr(self, 'timeframe_combo', None)
+        if timeframe_combo is None:
+            return [], None
+        coins = [coin for coin, card in self.coin_cards.items() if card is not None]
+        return coins, timeframe_combo.currentText()
+
+    def update_stream_subscriptions(self, alarms=None, cards=None):
+        """
+        Alarmı veya açık kartı olan (coin, timeframe) çiftlerini kline akışına abone et.
+        cards: card_subscriptions() sonucu; arka plan döngüsünden çağrılırken ana
+            thread'de alınıp verilmelidir (None ise burada okunur, sadece ana thread)
+        """
+        try:
+            if alarms is None:
+                alarms = self.alarm_store.active()
+            if cards is None:
+                cards = self.card_subscriptions()
             
-            # Volume Weighted MACD hesapla
-            vwmacd_data = volume_weighted_macd(df)
+            pairs = set()
+            for alarm in alarms:
+                # Tetiklenmiş tek seferlik alarmlar artık kontrol edilmiyor
+                if alarm.get('triggered', False) and alarm.get('is_once', True):
+                    continue
+                # Türetilen zaman dilimleri 1m akışından beslenir
+                timeframe = self.source_timeframe(alarm['timeframe'])
+                if timeframe is not None:
+                    pairs.add((alarm['coin'], timeframe))
+            
+            # Açık kartlar
+            card_coins, timeframe = cards
+            if timeframe:
+                timeframe = self.source_timeframe(timeframe)
+            if timeframe:
+                for coin in card_coins:
+                    pairs.add((coin, timeframe))
+            
+            self.kline_stream.set_subscriptions(pairs)
+        except Exception as e:
+            print(f"Kline akışı abonelikleri güncellenirken hata: {e}")
+
+    def compute_indicator_snapshot(self, keys):
+        """
+        Verilen (coin, timeframe) çiftleri için indikatörleri tek seferde hesapla
+        ve kontrol döngüsünün önbelleğine (cycle_indicators) yaz. Her çift bir kez
+        çekilir; indikatör durumu olan seriler sadece yeni mumlarla güncellenir
+        (streaming_indicators), hata olursa kalan seriler batch_indicators ile
+        vektörel olarak hesaplanır. Son mumu değişmemiş seriler için önceki
+        sonuç indikatör önbelleğinden alınır.
+        """
+        keys = list(keys)
+        self.prefetch_candles(keys)
+        frames = {key: self.get_coin_data(*key) for key in keys}
+
+        results = {}
+        cache_keys = {}
+        for key, df in frames.items():
+            cache_keys[key] = IndicatorCache.make_key(key, df, 'snapshot')
+            cached = self.indicator_cache.get(cache_keys[key])
+            if cached is not None:
+                results[key] = cached
+                continue
+            try:
+                snapshot = self.indicator_streams.update_frame(key, df)
+                if snapshot is not None:
+                    results[key] = snapshot
+            except Exception as e:
+                print(f"İndikatör durumu güncellenirken hata ({key[0]} {key[1]}): {e}")
+
+        missing = {key: df for key, df in frames.items() if key not in results}
+        if missing:
+            try:
+                results.update(compute_indicator_batch(missing))
+            except Exception as e:
+                print(f"Toplu indikatör hesaplamasında hata: {e}")
+                traceback.print_exc()
+        
+        for key, df in frames.items():
+            self.indicator_cache.put(cache_keys[key], results.get(key))
+            self.cycle_indicators[key] = (df, results.get(key))
+
+    def compute_card_data(self, coins, timeframe):
+        """
+        Kartların verisini çek ve indikatörleri hesapla (arka plan thread'inde çalışır)
+        Dönüş: {coin: (fiyat, zaman dilimi, wt, macd, bb, vwmacd) veya hata durumunda None}
+        """
+        self.prefetch_candles([(symbol, timeframe) for symbol in coins])
+        results = {}
+        for symbol in coins:
+            try:
+                df = self.get_coin_data(symbol, timeframe)
+                
+                if df is None:
+                    continue
+                
+                # Son mum değişmediyse önceki sonuçlar önbellekten gelir
+                series = (symbol, timeframe)
+                results[symbol] = (
+                    df['close'].iloc[-1],           # Son fiyat
+                    timeframe,
+                    self.indicator_cache.compute(series, df, 'wavetrend', calculate_wavetrend),        # WaveTrend
+                    self.indicator_cache.compute(series, df, 'macd_dema', calculate_macd_dema),        # MACD DEMA
+                    self.indicator_cache.compute(series, df, 'bollinger', calculate_bollinger_bands),  # Bollinger Bands
+                    self.indicator_cache.compute(series, df, 'vwmacd', volume_weighted_macd)           # Volume Weighted MACD
+                )
+            except Exception as e:
+                print(f"İndikatör hesaplama hatası ({symbol}): {str(e)}")
+                results[symbol] = None
+        return results
+
+    def apply_card_data(self, results):
+        """Hesaplanan değerleri kartlara yaz (ana thread)"""
+        for symbol, data in results.items():
+            if data is None:
+                if symbol in self.coin_cards:
+                    del self.coin_cards[symbol]
+                continue
             
             # Kart hala mevcut mu kontrol et
             if symbol in self.coin_cards and self.coin_cards[symbol] is not None:
-                self.coin_cards[symbol].update_data(
-                    last_price,
-                    timeframe,
-                    wt_data,
-                    macd_data,
-                    bb_data,
-                    vwmacd_data
-                )
-                
+                self.coin_cards[symbol].update_data(*data)
+
+    def calculate_indicators(self, symbol):
+        """Tek kartı arka planda güncelle"""
+        self.update_data([symbol])
+
+    def update_data(self, coins=None):
+        """Aktif kartları arka planda güncelle; önceki güncelleme sürüyorsa atlanır"""
+        if coins is None:
+            coins = [coin for coin, card in self.coin_cards.items() if card is not None]
+        coins = [coin for coin in coins if self.coin_cards.get(coin) is not None]
+        if not coins:
+            return
+        
+        try:
+            timeframe = self.timeframe_combo.currentText()
         except Exception as e:
-            print(f"İndikatör hesaplama hatası ({symbol}): {str(e)}")
-            if symbol in self.coin_cards:
-                del self.coin_cards[symbol]
+            print(f"İndikatör hesaplama hatası: {str(e)}")
+            return
+        
+        compute = self.request_scheduler.bind(PRIORITY_CARD, lambda: self.compute_card_data(coins, timeframe))
+        self.cycle_runner.submit("Kartlar", compute, self.apply_card_data)
 
-    def update_data(self):
-        # Aktif kartları güncelle
-        for coin in list(self.coin_cards.keys()):
-            if self.coin_cards[coin] is not None:
-                self.calculate_indicators(coin)
+    def schedule_alarm_check(self):
+        """Alarm kontrolünü arka planda başlat; önceki kontrol sürüyorsa atlanır"""
+        # Arayüz durumu (açık kartlar, zaman dilimi) döngüye ana thread'de alınıp verilir
+        cards = self.card_subscriptions()
+        check = self.request_scheduler.bind(PRIORITY_ALARM, lambda: self.check_all_alarms(cards))
+        self.cycle_runner.submit("Alarmlar", check)
 
     def start_tracking(self):
         # Timer'ı başlat
         self.timer.start(5000)
         self.alarm_timer.start(3000)  # Her 3 saniyede bir kontrol et
         
+        # Kline akışını başlat
+        self.update_stream_subscriptions()
+        self.kline_stream.start()
+        
         # Buton durumlarını güncelle
         self.start_button.setEnabled(False)
         self.stop_button.setEnabled(True)
         
         # Eğer kart görünümündeyse mevcut kartı güncelle
         if self.stacked_widget.currentWidget() == self.card_widget:
-            for coin in self.coin_cards:
-                self.calculate_indicators(coin)
+            self.update_data()
         
         QMessageBox.information(self, "Bilgi", "Veri takibi başlatıldı!")
 
     def stop_tracking(self):
         self.timer.stop()
         self.alarm_timer.stop()
+        self.kline_stream.stop()
         self.start_button.setEnabled(True)
         self.stop_button.setEnabled(False)
         QMessageBox.information(self, "Bilgi", "Veri takibi durduruldu!")
-        
+
+    def closeEvent(self, event):
+        """Pencere kapanırken döngüleri durdur ve arka plan bağlantılarını kapat"""
+        self.timer.stop()
+        self.alarm_timer.stop()
+
+        # Çalışan döngü bitmeden önbellekler ve bağlantılar kapatılmaz
+        if not self.cycle_runner.wait(15000):
+            print("Çalışan döngü 15 sn içinde bitmedi, kapanışa devam ediliyor")
+
+        self.kline_stream.stop()
+        self.candle_fetcher.close()
+
+        # Tamponda bekleyen BTC fiyatları diske yazılır
+        self.btc_price_history.flush()
+        super().closeEvent(event)
+
     def clear_cards(self):
         # Güvenli bir şekilde kartları temizle
         if hasattr(self, 'coin_cards'):
@@ -1051,21 +1434,25 @@ class MainWindow(QMainWindow):
             self.coin_cards[coin].deleteLater()
             del self.coin_cards[coin]
         
-        # Coin verilerini önbellekten temizle
-        cache_key_prefix = f"{coin}_"
-        keys_to_remove = [k for k in self.coin_data_cache.keys() if k.startswith(cache_key_prefix)]
-        for key in keys_to_remove:
-            del self.coin_data_cache[key]
-            if key in self.last_update_time:
-                del self.last_update_time[key]
+        # Coin verilerini önbellekten temizle; önbellekleri döngüler kullandığından
+        # temizlik de döngü havuzunda, çalışan döngü bittikten sonra yapılır
+        self.cycle_runner.submit(f"Temizlik {coin}", lambda: self.remove_coin_data(coin))
         
         # Liste görünümünü güncelle
         self.load_coin_list()
 
+    def remove_coin_data(self, coin):
+        """Coinin mum ve indikatör verilerini sil (döngü havuzunda çalışır)"""
+        self.candle_cache.remove_coin(coin)
+        self.candle_store.remove_coin(coin)
+        self.indicator_streams.remove_coin(coin)
+        self.indicator_cache.remove_coin(coin)
+
     def reset_view(self):
         # Timer'ı durdur
         self.timer.stop()
         self.alarm_timer.stop()
+        self.kline_stream.stop()
         
         # Coin kartlarını temizle
         self.clear_cards()
@@ -1137,80 +1524,12 @@ class MainWindow(QMainWindow):
             }
         """)
 
-    def load_btc_prices(self):
-        """Kaydedilmiş BTC fiyatlarını yükler"""
-        try:
-            if os.path.exists("btc_prices.json"):
-                with open("btc_prices.json", "r") as f:
-                    saved_prices = json.load(f)
-                    # String olan tarihleri datetime objesine çevir
-                    self.btc_prices = {datetime.fromisoformat(k): v for k, v in saved_prices.items()}
-        except Exception as e:
-            print(f"BTC fiyatları yüklenirken hata: {str(e)}")
-
-    def save_btc_prices(self):
-        """BTC fiyatlarını dosyaya kaydeder"""
-        try:
-            # datetime objeleri string'e çevir
-            prices_to_save = {k.isoformat(): v for k, v in self.btc_prices.items()}
-            with open("btc_prices.json", "w") as f:
-                json.dump(prices_to_save, f)
-        except Exception as e:
-            print(f"BTC fiyatları kaydedilirken hata: {str(e)}")
-    
     def get_market_performance(self):
         """
-        Binance'den tüm coinlerin 24 saatlik performansını çeker
-        Cache kullanarak 5 dakikada bir günceller
+        Binance'den tüm coinlerin 24 saatlik performansı
+        5 dakikada bir arka planda güncellenir, veri yoksa None (beklemez)
         """
-        try:
-            current_time = datetime.now()
-            
-            # Cache kontrolü - 5 dakikada bir güncelle
-            if (self.market_performance_last_update and 
-                (current_time - self.market_performance_last_update).seconds < 300 and
-                self.market_performance_cache):
-                return self.market_performance_cache
-            
-            print("Binance'den 24 saatlik performans verileri çekiliyor...")
-            
-            # Binance'den tüm ticker verilerini çek
-            tickers = self.exchange.fetch_tickers()
-            
-            # Sadece USDT paritelerini filtrele
-            usdt_tickers = []
-            for symbol, ticker in tickers.items():
-                if symbol.endswith('/USDT'):
-                    # Percentage değişimi al
-                    change_24h = ticker.get('percentage', 0)
-                    if change_24h is not None:
-                        coin_name = symbol.replace('/USDT', 'USDT')
-                        usdt_tickers.append({
-                            'symbol': coin_name,
-                            'change_24h': float(change_24h),
-                            'volume': ticker.get('quoteVolume', 0)  # USDT cinsinden hacim
-                        })
-            
-            # En çok yükselenleri sırala
-            gainers = sorted(usdt_tickers, key=lambda x: x['change_24h'], reverse=True)[:100]
-            
-            # En çok düşenleri sırala
-            losers = sorted(usdt_tickers, key=lambda x: x['change_24h'])[:100]
-            
-            # Cache'e kaydet
-            self.market_performance_cache = {
-                'gainers': gainers,
-                'losers': losers,
-                'all_tickers': usdt_tickers
-            }
-            self.market_performance_last_update = current_time
-            
-            print(f"Toplam {len(usdt_tickers)} USDT çifti işlendi")
-            return self.market_performance_cache
-            
-        except Exception as e:
-            print(f"Market performans verisi çekilirken hata: {str(e)}")
-            return None
+        return self.market_ranking.performance()
     
     def get_coin_market_position(self, coin):
         """
@@ -1223,43 +1542,10 @@ class MainWindow(QMainWindow):
         }
         """
         try:
-            performance_data = self.get_market_performance()
-            if not performance_data:
-                return None
-            
-            # Coin'i bul
-            coin_data = None
-            for ticker in performance_data['all_tickers']:
-                if ticker['symbol'] == coin:
-                    coin_data = ticker
-                    break
-            
-            if not coin_data:
+            position = self.market_ranking.position(coin)
+            if not position:
                 print(f"{coin} için performans verisi bulunamadı")
-                return None
-            
-            change_24h = coin_data['change_24h']
-            
-            # En çok yükselenler listesinde mi?
-            gainer_rank = None
-            for idx, gainer in enumerate(performance_data['gainers'], 1):
-                if gainer['symbol'] == coin:
-                    gainer_rank = idx
-                    break
-            
-            # En çok düşenler listesinde mi?
-            loser_rank = None
-            for idx, loser in enumerate(performance_data['losers'], 1):
-                if loser['symbol'] == coin:
-                    loser_rank = idx
-                    break
-            
-            return {
-                'change_24h': change_24h,
-                'gainer_rank': gainer_rank,
-                'loser_rank': loser_rank,
-                'total_coins': len(performance_data['all_tickers'])
-            }
+            return position
             
         except Exception as e:
             print(f"Coin market pozisyonu hesaplanırken hata: {str(e)}")
@@ -1270,43 +1556,7 @@ class MainWindow(QMainWindow):
         Coin'in piyasa pozisyonunu formatlanmış metin olarak döndürür
         """
         try:
-            position = self.get_coin_market_position(coin)
-            if not position:
-                return ""
-            
-            change_24h = position['change_24h']
-            gainer_rank = position['gainer_rank']
-            loser_rank = position['loser_rank']
-            
-            # Değişim yönü emoji
-            if change_24h > 0:
-                change_emoji = "📈"
-                change_text = f"+{change_24h:.2f}%"
-            elif change_24h < 0:
-                change_emoji = "📉"
-                change_text = f"{change_24h:.2f}%"
-            else:
-                change_emoji = "➡️"
-                change_text = "0.00%"
-            
-            # Metin oluştur
-            text = f"📊 24 Saatlik Performans:\n"
-            text += f"{change_emoji} Değişim: {change_text}\n"
-            
-            # Eğer en çok yükselenler listesindeyse
-            if gainer_rank and gainer_rank <= 50:
-                text += f"🏆 En Çok Yükselenler: {gainer_rank}. sırada\n"
-            
-            # Eğer en çok düşenler listesindeyse
-            if loser_rank and loser_rank <= 50:
-                text += f"📉 En Çok Düşenler: {loser_rank}. sırada\n"
-            
-            # Orta bölgedeyse
-            if (not gainer_rank or gainer_rank > 50) and (not loser_rank or loser_rank > 50):
-                text += f"⚖️ Dengeli bölgede (Normal performans)\n"
-            
-            return text
-            
+            return format_market_position(self.get_coin_market_position(coin))
         except Exception as e:
             print(f"Market pozisyon metni oluştururken hata: {str(e)}")
             return ""
@@ -1318,17 +1568,18 @@ class MainWindow(QMainWindow):
         Returns: (bool, str) - (geçti_mi, açıklama_mesajı)
         """
         try:
-            # 5m ve 1m verilerini al
-            df_5m = self.get_coin_data(coin, "5m")
-            df_1m = self.get_coin_data(coin, "1m")
+            # 5m ve 1m verilerini al (bu döngüde hesaplandıysa paylaşılan sonuç kullanılır)
+            with self.request_scheduler.priority(PRIORITY_CONFIRM):
+                df_5m, indicators_5m = self.get_timeframe_indicators(coin, "5m")
+                df_1m, indicators_1m = self.get_timeframe_indicators(coin, "1m")
             
             if df_5m is None or df_1m is None:
                 print("⚠️ 5m veya 1m verisi alınamadı, güvenlik kontrolü atlanıyor")
                 return True, "Veri alınamadı"
             
             # İndikatör değerlerini hesapla
-            wt1_5m = self.calculate_indicator_value(alarm, df_5m)
-            wt1_1m = self.calculate_indicator_value(alarm, df_1m)
+            wt1_5m = self.indicator_detail_value(alarm, indicators_5m) if indicators_5m else None
+            wt1_1m = self.indicator_detail_value(alarm, indicators_1m) if indicators_1m else None
             
             if wt1_5m is None or wt1_1m is None:
                 print("⚠️ İndikatör hesaplanamadı, güvenlik kontrolü atlanıyor")
@@ -1339,8 +1590,7 @@ class MainWindow(QMainWindow):
             print(f"1m WT1: {wt1_1m:.2f}")
             
             # Ana sinyalin yönünü belirle (LONG mu SHORT mu)
-            main_df = self.get_coin_data(coin, alarm['timeframe'])
-            main_wt1 = self.calculate_indicator_value(alarm, main_df)
+            main_wt1 = self.alarm_indicator_value(alarm, coin, alarm['timeframe'])
             
             if main_wt1 is None:
                 return True, "Ana sinyal hesaplanamadı"
@@ -1501,21 +1751,8 @@ class MainWindow(QMainWindow):
             if df is None or df.empty:
                 return
                 
-            current_time = datetime.now()
-            current_price = df['close'].iloc[-1]
-            
-            # Şu anki zamanı dakika başına yuvarla
-            rounded_time = current_time.replace(second=0, microsecond=0)
-            
-            # Fiyatı kaydet
-            self.btc_prices[rounded_time] = current_price
-            
-            # 1 saatten eski verileri temizle
-            cutoff_time = rounded_time - timedelta(hours=1)
-            self.btc_prices = {k: v for k, v in self.btc_prices.items() if k >= cutoff_time}
-            
-            # Fiyatları dosyaya kaydet
-            self.save_btc_prices()
+            # Şu anki dakikanın fiyatını kaydet (dakika kapanınca dosyaya tek kayıt eklenir)
+            self.btc_price_history.record(float(df['close'].iloc[-1]))
             
         except Exception as e:
             print(f"BTC fiyat güncelleme hatası: {str(e)}")
@@ -1737,17 +1974,7 @@ class MainWindow(QMainWindow):
         
         try:
             # Önce lokalde kaydet
-            alarms = []
-            if os.path.exists("alarms.json"):
-                with open("alarms.json", "r") as f:
-                    alarms = json.load(f)
-
-            
-            alarms.append(alarm_data)
-            
-
-            with open("alarms.json", "w") as f:
-                json.dump(alarms, f)
+            self.alarm_store.add(alarm_data)
             
             # Eğer kullanıcı giriş yapmışsa backend'e de kaydet
             if self.token and self.user:
@@ -1772,13 +1999,8 @@ class MainWindow(QMainWindow):
             QMessageBox.warning(dialog, "Hata", f"Alarm kaydedilirken hata oluştu: {str(e)}")
             
     def show_alarms(self):
-        if not os.path.exists("alarms.json"):
-            QMessageBox.information(self, "Bilgi", "Henüz kayıtlı alarm bulunmuyor!")
-            return
-            
         try:
-            with open("alarms.json", "r") as f:
-                alarms = json.load(f)
+            alarms = self.alarm_store.all()
                 
             if not alarms:  # Alarm yoksa
                 QMessageBox.information(self, "Bilgi", "Henüz kayıtlı alarm bulunmuyor!")
@@ -1958,8 +2180,7 @@ class MainWindow(QMainWindow):
                 if reply == QMessageBox.Yes:
                     try:
                         # Tüm alarmları sil
-                        with open("alarms.json", "w") as f:
-                            json.dump([], f)
+                        self.alarm_store.delete_all()
                         
                         # UI'dan kaldır
                         dialog.close()
@@ -2009,24 +2230,14 @@ class MainWindow(QMainWindow):
         
         if reply == QMessageBox.StandardButton.Yes:
             try:
-                # JSON dosyasından sil
-                alarms = []
-                if os.path.exists("alarms.json"):
-                    with open("alarms.json", "r") as f:
-                        alarms = json.load(f)
-
-                
-                alarms = [a for a in alarms if a.get('id', '') != alarm.get('id', '')]
-                
-
-                with open("alarms.json", "w") as f:
-                    json.dump(alarms, f)
+                # Alarm deposundan sil
+                self.alarm_store.delete(alarm)
                 
                 # Kartı arayüzden kaldır
                 card.deleteLater()
                 
                 # Eğer hiç alarm kalmadıysa pencereyi kapat
-                if not alarms:
+                if self.alarm_store.count() == 0:
                     parent_widget.window().close()
                 
                 QMessageBox.information(self, "Başarılı", "Alarm başarıyla silindi!")
@@ -2065,380 +2276,6 @@ class MainWindow(QMainWindow):
                 
         return None
 
-    def check_all_alarms(self):
-        """Tüm kayıtlı alarmları kontrol et"""
-        if not os.path.exists("alarms.json"):
-            return
-            
-        try:
-            with open("alarms.json", "r") as f:
-                alarms = json.load(f)
-                
-            if not alarms:  # Alarm yoksa
-                return
-                
-            print(f"\n{'='*50}")
-            print(f"Toplam {len(alarms)} alarm kontrol ediliyor")
-            print(f"{'='*50}\n")
-            
-            # Her alarm için ayrı kontrol yap
-            for alarm in alarms:
-                try:
-                    # Eğer alarm zaten tetiklendiyse ve tek seferlik ise atla
-                    if alarm.get('triggered', False) and alarm.get('is_once', True):
-                        print(f"Alarm '{alarm['name']}' zaten tetiklenmiş ve tek seferlik, atlanıyor.")
-                        continue
-                    
-                    coin = alarm['coin']
-                    timeframe = alarm['timeframe']
-                    
-                    print(f"\n{'*'*30}")
-                    print(f"Alarm Kontrol: {alarm['name']}")
-                    print(f"Coin: {coin}, Timeframe: {timeframe}")
-                    print(f"İndikatör: {alarm['indicator']} ({alarm['detail']})")
-                    print(f"Koşul: {alarm['condition']}, Hedef: {alarm['value']}")
-                    print(f"{'*'*30}\n")
-                    
-                    # Coin verilerini al
-                    df = self.get_coin_data(coin, timeframe)
-                    if df is None:
-                        print(f"Coin verisi alınamadı: {coin}")
-                        continue
-                        
-                    # Her alarm için benzersiz bir anahtar oluştur
-                    alarm_key = f"{alarm['name']}_{alarm['coin']}_{alarm['timeframe']}_{alarm['indicator']}_{alarm['detail']}_{alarm['condition']}_{alarm['value']}"
-                    triggered = False
-                    current_value = None
-                    previous_value = self.previous_values.get(alarm_key, None)
-                    
-                    print(f"Alarm anahtarı: {alarm_key}")
-                    print(f"Önceki değer: {previous_value}")
-                    
-                    # İndikatör değerlerini al
-                    if alarm["indicator"] == "İndicPro":
-                        wt_result = calculate_wavetrend(df)
-                        wt1, wt2 = wt_result['wt1'], wt_result['wt2']
-                        print(f"İndicPro değerleri - WT1: {wt1:.2f}, WT2: {wt2:.2f}")
-                        
-                        if alarm["detail"] == "Ana Çizgi":
-                            current_value = wt1
-                            target = float(alarm["value"])
-                            if alarm["condition"] == "Üstüne Çıktığında":
-                                triggered = current_value > target and (previous_value is None or previous_value <= target)
-                                print(f"Üstüne Çıktığında kontrolü:")
-                                print(f"Current > Target: {current_value} > {target} = {current_value > target}")
-                                print(f"Previous <= Target: {previous_value} <= {target} = {previous_value is None or previous_value <= target}")
-                            elif alarm["condition"] == "Altına Düştüğünde":
-                                triggered = current_value < target and (previous_value is None or previous_value >= target)
-                                print(f"Altına Düştüğünde kontrolü:")
-                                print(f"Current < Target: {current_value} < {target} = {current_value < target}")
-                                print(f"Previous >= Target: {previous_value} >= {target} = {previous_value is None or previous_value >= target}")
-                        elif alarm["detail"] == "Sinyal Çizgisi":
-                            current_value = wt2
-                            target = float(alarm["value"])
-                            if alarm["condition"] == "Üstüne Çıktığında":
-                                triggered = current_value > target and (previous_value is None or previous_value <= target)
-                                print(f"Üstüne Çıktığında kontrolü:")
-                                print(f"Current > Target: {current_value} > {target} = {current_value > target}")
-                                print(f"Previous <= Target: {previous_value} <= {target} = {previous_value is None or previous_value <= target}")
-                            elif alarm["condition"] == "Altına Düştüğünde":
-                                triggered = current_value < target and (previous_value is None or previous_value >= target)
-                                print(f"Altına Düştüğünde kontrolü:")
-                                print(f"Current < Target: {current_value} < {target} = {current_value < target}")
-                                print(f"Previous >= Target: {previous_value} >= {target} = {previous_value is None or previous_value >= target}")
-                        elif alarm["detail"] == "Kesişim":
-                            if alarm["condition"] == "Yukarı Kesişim":
-                                triggered = wt1 > wt2 and (previous_value is None or wt1 <= wt2)
-                                print(f"Yukarı Kesişim kontrolü:")
-                                print(f"WT1 > WT2: {wt1} > {wt2} = {wt1 > wt2}")
-                            elif alarm["condition"] == "Aşağı Kesişim":
-                                triggered = wt1 < wt2 and (previous_value is None or wt1 >= wt2)
-                                print(f"Aşağı Kesişim kontrolü:")
-                                print(f"WT1 < WT2: {wt1} < {wt2} = {wt1 < wt2}")
-                    
-                    elif alarm["indicator"] == "MACD":
-                        macd_result = calculate_macd_dema(df)
-                        macd_line, signal_line, hist = macd_result['MACD_DEMA'], macd_result['Signal_DEMA'], macd_result['MACD_Hist_DEMA']
-                        print(f"MACD değerleri - MACD: {macd_line:.2f}, Signal: {signal_line:.2f}, Hist: {hist:.2f}")
-                        
-                        if alarm["detail"] == "MACD Çizgisi":
-                            current_value = macd_line
-                        elif alarm["detail"] == "Sinyal Çizgisi":
-                            current_value = signal_line
-                        elif alarm["detail"] == "Histogram":
-                            current_value = hist
-                        elif alarm["detail"] == "Kesişim":
-                            if alarm["condition"] == "Yukarı Kesişim":
-                                triggered = macd_line > signal_line and (previous_value is None or macd_line <= signal_line)
-                                print(f"MACD Yukarı Kesişim kontrolü:")
-                                print(f"MACD > Signal: {macd_line} > {signal_line} = {macd_line > signal_line}")
-                            elif alarm["condition"] == "Aşağı Kesişim":
-                                triggered = macd_line < signal_line and (previous_value is None or macd_line >= signal_line)
-                                print(f"MACD Aşağı Kesişim kontrolü:")
-                                print(f"MACD < Signal: {macd_line} < {signal_line} = {macd_line < signal_line}")
-                                
-                        if not triggered and alarm["detail"] != "Kesişim":
-                            target = float(alarm["value"])
-                            if alarm["condition"] == "Üstüne Çıktığında":
-                                triggered = current_value > target and (previous_value is None or previous_value <= target)
-                                print(f"Üstüne Çıktığında kontrolü:")
-                                print(f"Current > Target: {current_value} > {target} = {current_value > target}")
-                                print(f"Previous <= Target: {previous_value} <= {target} = {previous_value is None or previous_value <= target}")
-                            elif alarm["condition"] == "Altına Düştüğünde":
-                                triggered = current_value < target and (previous_value is None or previous_value >= target)
-                                print(f"Altına Düştüğünde kontrolü:")
-                                print(f"Current < Target: {current_value} < {target} = {current_value < target}")
-                                print(f"Previous >= Target: {previous_value} >= {target} = {previous_value is None or previous_value >= target}")
-                    
-                    elif alarm["indicator"] == "Bollinger":
-                        try:
-                            bb_data = calculate_bollinger_bands(df)
-                            current_price = df['close'].iloc[-1]
-                            
-                            # Seçilen banda göre değeri al
-                            if alarm["detail"] == "Üst Bant":
-                                band_value = bb_data['BB_upper']
-                            elif alarm["detail"] == "Orta Bant":
-                                band_value = bb_data['BB_middle']
-                            elif alarm["detail"] == "Alt Bant":
-                                band_value = bb_data['BB_lower']
-                            else:
-                                print(f"Geçersiz Bollinger bandı detayı: {alarm['detail']}")
-                                continue
-                            
-                            print(f"Bollinger {alarm['detail']} kontrolü:")
-                            print(f"Mevcut Fiyat: {current_price:.8f}")
-                            print(f"Bant Değeri: {band_value:.8f}")
-                            
-                            # Koşula göre kontrol et
-                            if alarm["condition"] == "Üstüne Çıktığında":
-                                triggered = current_price > band_value and (previous_value is None or previous_value <= band_value)
-                                print(f"Üstüne Çıktığında kontrolü: {current_price:.2f} > {band_value:.2f} = {triggered}")
-                            elif alarm["condition"] == "Altına Düştüğünde":
-                                triggered = current_price < band_value and (previous_value is None or previous_value >= band_value)
-                                print(f"Altına Düştüğünde kontrolü: {current_price:.2f} < {band_value:.2f} = {triggered}")
-                            elif alarm["condition"] == "Eşit Olduğunda":
-                                # Eşitlik için küçük bir tolerans kullan
-                                tolerance = band_value * 0.0001  # %0.01 tolerans
-                                triggered = abs(current_price - band_value) <= tolerance
-                                print(f"Eşit Olduğunda kontrolü: |{current_price:.2f} - {band_value:.2f}| <= {tolerance:.2f} = {triggered}")
-                            
-                            current_value = current_price
-                            
-                        except Exception as e:
-                            print(f"Bollinger alarm kontrolünde hata: {str(e)}")
-                            traceback.print_exc()
-                            continue
-                    elif alarm["indicator"] == "Volume Weighted MACD":
-                        vwmacd_result = {
-                            'macd': (df['volume'] * df['close']).ewm(span=12, adjust=False).mean() / df['volume'].ewm(span=12, adjust=False).mean() - \
-                                   (df['volume'] * df['close']).ewm(span=26, adjust=False).mean() / df['volume'].ewm(span=26, adjust=False).mean(),
-                            'signal': None,
-                            'histogram': None
-                        }
-                        
-                        # Sinyal ve histogram hesapla
-                        vwmacd_result['signal'] = vwmacd_result['macd'].ewm(span=9, adjust=False).mean()
-                        vwmacd_result['histogram'] = vwmacd_result['macd'] - vwmacd_result['signal']
-                        
-                        if alarm["detail"] == "VW MACD":
-                            current_value = vwmacd_result['macd'].iloc[-1]
-                        elif alarm["detail"] == "VW Signal":
-                            current_value = vwmacd_result['signal'].iloc[-1]
-                        elif alarm["detail"] == "VW Histogram":
-                            current_value = vwmacd_result['histogram'].iloc[-1]
-                            
-                        target = float(alarm["value"])
-                        if alarm["condition"] == "Üstüne Çıktığında":
-                            triggered = current_value > target and (previous_value is None or previous_value <= target)
-                            print(f"Üstüne Çıktığında kontrolü:")
-                            print(f"Current > Target: {current_value} > {target} = {current_value > target}")
-                            print(f"Previous <= Target: {previous_value} <= {target} = {previous_value is None or previous_value <= target}")
-                        elif alarm["condition"] == "Altına Düştüğünde":
-                            triggered = current_value < target and (previous_value is None or previous_value >= target)
-                            print(f"Altına Düştüğünde kontrolü:")
-                            print(f"Current < Target: {current_value} < {target} = {current_value < target}")
-                            print(f"Previous >= Target: {previous_value} >= {target} = {previous_value is None or previous_value >= target}")
-                    
-                    # Mevcut değeri kaydet
-                    if current_value is not None:
-                        self.previous_values[alarm_key] = current_value
-                    
-                    print(f"\nAlarm durumu: {'Tetiklendi' if triggered else 'Tetiklenmedi'}\n")
-                    
-                    # Alarm tetiklendiyse
-                    if triggered:
-                        # Ana sinyalin yönünü belirle (LONG mu SHORT mu)
-                        main_df = self.get_coin_data(coin, alarm['timeframe'])
-                        main_wt1 = self.calculate_indicator_value(alarm, main_df)
-                        
-                        if main_wt1 is None:
-                            print("⚠️ Ana sinyal hesaplanamadı, atlanıyor")
-                            self.previous_values[alarm_key] = current_value
-                            continue
-                        
-                        # Sinyal yönünü belirle
-                        if main_wt1 <= -60:
-                            signal_direction = "LONG"
-                        elif main_wt1 >= 60:
-                            signal_direction = "SHORT"
-                        else:
-                            signal_direction = "NÖTR"
-                        
-                        print(f"\n{'='*60}")
-                        print(f"SİNYAL TETİKLENDİ: {coin} - {signal_direction}")
-                        print(f"{'='*60}")
-                        
-                        # 🛡️ KONTROL 1: 5m ve 1m timeframe'leri kontrol et
-                        security_passed, security_message = self.check_signal_strength(coin, alarm)
-                        
-                        if not security_passed:
-                            print(f"\n⛔ SİNYAL İPTAL EDİLDİ (Güvenlik): {security_message}")
-                            print(f"Alarm: {alarm['name']}, Coin: {coin}")
-                            self.previous_values[alarm_key] = current_value
-                            continue
-                        
-                        print(f"✅ KONTROL 1 GEÇTİ: {security_message}")
-                        
-                        # 📊 KONTROL 2: Volatilite riski kontrol et
-                        volatility_passed, volatility_message = self.check_volatility_risk(coin, signal_direction)
-                        
-                        if not volatility_passed:
-                            print(f"\n⛔ SİNYAL İPTAL EDİLDİ (Volatilite): {volatility_message}")
-                            print(f"Alarm: {alarm['name']}, Coin: {coin}")
-                            self.previous_values[alarm_key] = current_value
-                            continue
-                        
-                        print(f"✅ KONTROL 2 GEÇTİ: {volatility_message}")
-                        
-                        # 🚫 KONTROL 3: Spam kontrolü
-                        spam_passed, spam_message = self.check_spam_prevention(coin)
-                        
-                        if not spam_passed:
-                            print(f"\n⛔ SİNYAL İPTAL EDİLDİ (Spam): {spam_message}")
-                            print(f"Alarm: {alarm['name']}, Coin: {coin}")
-                            self.previous_values[alarm_key] = current_value
-                            continue
-                        
-                        print(f"✅ KONTROL 3 GEÇTİ: {spam_message}")
-                        
-                        print(f"\n{'='*60}")
-                        print(f"🎯 TÜM KONTROLLER GEÇİLDİ - SİNYAL GÖNDERİLİYOR!")
-                        print(f"{'='*60}\n")
-                        
-                        # Windows alarm sesi çal (4 saniye)
-                        try:
-                            winsound.Beep(1000, 4000)  # 1000 Hz, 4000 ms (4 saniye)
-                        except:
-                            print("Ses çalınamadı")
-                        
-                        # Fiyat için ondalık basamak sayısını dinamik olarak hesapla
-                        current_price = df['close'].iloc[-1]
-                        decimal_count = len(str(current_price).split('.')[-1]) + 1
-                        
-                        # Fiyatı %0.05 düşür
-                        discounted_price = current_price * (1 - 0.0005)  # %0.05 düşük
-                        
-                        # Bildirim mesajını hazırla
-                        notification_message = f"🚨 {alarm['name']}\n\n"
-                        notification_message += f"💰 Coin: {coin}\n"
-                        notification_message += f"💵 Fiyat: {discounted_price:.{decimal_count}f} USDT\n"  # %0.05 düşük fiyat
-                        notification_message += f"📊 İndikatör: {alarm['indicator']} ({alarm['detail']})\n"
-                        notification_message += f"📈 Koşul: {alarm['condition']}\n"
-                        notification_message += f"🎯 Hedef: {alarm['value']}\n\n"
-                        
-                        # 24 saatlik performans bilgisi ekle
-                        market_position_text = self.format_market_position_text(coin)
-                        if market_position_text:
-                            notification_message += market_position_text + "\n"
-                        
-                        notification_message += f"⏱ Zaman Dilimleri:\n"                                                                        
-
-                        # Ana zaman dilimi (15m)
-                        main_timeframe_data = self.get_coin_data(coin, timeframe)
-                        main_result = self.calculate_indicator_value(alarm, main_timeframe_data)
-                        if main_result is not None:
-                            if main_result <= -80:
-                                signal = " 🟢 🟢 🟢 - - 3 LONG"
-                            elif main_result <= -70:
-                                signal = " 🟢 🟢 - - 2 LONG"
-                            elif main_result <= -60:
-                                signal = " 🟢 - - 1 LONG"
-                            elif main_result >= 80:
-                                signal = " 🔴 🔴 🔴 - - 3 SHORT"
-                            elif main_result >= 70:
-                                signal = " 🔴 🔴 - - 2 SHORT"
-                            elif main_result >= 60:
-                                signal = " 🔴 - - 1 SHORT"
-                            else:
-                                signal = ""
-                            notification_message += f"   • {timeframe}: {main_result:.2f}{signal}\n"
-
-                        # 5 dakikalık veri
-                        five_min_data = self.get_coin_data(coin, "5m")
-                        if five_min_data is not None:
-                            five_min_result = self.calculate_indicator_value(alarm, five_min_data)
-                            if five_min_result <= -80:
-                                signal = " 🟢 🟢 🟢 - - 3 LONG"
-                            elif five_min_result <= -70:
-                                signal = " 🟢 🟢 - - 2 LONG"
-                            elif five_min_result <= -60:
-                                signal = " 🟢 - - 1 LONG"
-                            elif five_min_result >= 80:
-                                signal = " 🔴 🔴 🔴 - - 3 SHORT"
-                            elif five_min_result >= 70:
-                                signal = " 🔴 🔴 - - 2 SHORT"
-                            elif five_min_result >= 60:
-                                signal = " 🔴 - - 1 SHORT"
-                            else:
-                                signal = ""
-                            notification_message += f"   • 5m: {five_min_result:.2f}{signal}\n"
-
-                        # 1 dakikalık veri
-                        one_min_data = self.get_coin_data(coin, "1m")
-                        if one_min_data is not None:
-                            one_min_result = self.calculate_indicator_value(alarm, one_min_data)
-                            if one_min_result <= -80:
-                                signal = " 🟢 🟢 🟢 - - 3 LONG"
-                            elif one_min_result <= -70:
-                                signal = " 🟢 🟢 - - 2 LONG"
-                            elif one_min_result <= -60:
-                                signal = " 🟢 - - 1 LONG"
-                            elif one_min_result >= 80:
-                                signal = " 🔴 🔴 🔴 - - 3 SHORT"
-                            elif one_min_result >= 70:
-                                signal = " 🔴 🔴 - - 2 SHORT"
-                            elif one_min_result >= 60:
-                                signal = " 🔴 - - 1 SHORT"
-                            else:
-                                signal = ""
-                            notification_message += f"   • 1m: {one_min_result:.2f}{signal}\n"
-
-                        if 'message' in alarm and alarm['message']:
-                            notification_message += f"\n📝 Not: {alarm['message']}"                            
-
-                        # Bildirim ekle
-                        self.add_notification(notification_message)
-                        
-                        # Telegram'a gönder
-                        self.send_notification(notification_message)
-                        
-                        # Son sinyal zamanını kaydet (spam önleme için)
-                        self.update_last_signal_time(coin)
-                        
-                        # Alarm durumunu güncelle
-                        if alarm.get('is_once', True):
-                            alarm['triggered'] = True
-                            with open("alarms.json", "w") as f:
-                                json.dump(alarms, f)
-                
-                except Exception as e:
-                    print(f"Alarm kontrolünde hata: {e}")
-                    continue
-                    
-        except Exception as e:
-            print(f"Alarm kontrolünde genel hata: {e}")
-    
     def update_alarm_status(self, alarm_name, triggered):
         """Alarm durumunu güncelle"""
         if alarm_name in self.alarm_cards:
@@ -2856,15 +2693,7 @@ class MainWindow(QMainWindow):
                     }
                     
                     # Lokalde kaydet
-                    alarms = []
-                    if os.path.exists("alarms.json"):
-                        with open("alarms.json", "r") as f:
-                            alarms = json.load(f)
-                    
-                    alarms.append(alarm_data)
-                    
-                    with open("alarms.json", "w") as f:
-                        json.dump(alarms, f)
+                    self.alarm_store.add(alarm_data)
                     
                     success_count += 1
                 except Exception as e:
@@ -2927,88 +2756,18 @@ class MainWindow(QMainWindow):
         
         dialog.exec_()
     
-    def get_btc_analysis(self, timeframes=['1m', '3m', '5m', '15m', '30m', '45m', '1h']):
-        """BTC analizi yapar ve rapor formatında döndürür"""
+    def get_btc_analysis(self):
+        """BTC analizi yapar ve rapor formatında döndürür (dakikada bir hesaplanır)"""
         try:
-            current_time = datetime.now().strftime('%H:%M')
-            report_lines = []
-            
-            # Anlık BTC fiyatı
-            df = self.get_coin_data('BTCUSDT', '1m')
-            if df is not None and not df.empty:
-                price = df['close'].iloc[-1]
-                report_lines.append(f"💲 Fiyat: {price:,.2f} USDT")
-            
-            # Her timeframe için değişim hesapla
-            thresholds = {
-                '1m': 0.30, '3m': 0.40, '5m': 0.50,
-                '15m': 1.00, '30m': 1.25, '45m': 1.25, '1h': 1.50
-            }
-            
-            # Anlık değişim
-            current_change = self.calculate_btc_change('1m')
-            if current_change is not None:
-                direction = "📈" if current_change > 0 else "📉"
-                report_lines.append(f"⚡ Anlık ({current_time}): ({current_change:+.2f}%) {direction}")
-            
-            # Diğer timeframe'ler için
-            for tf in timeframes:
-                change = self.calculate_btc_change(tf)
-                if change is not None:
-                    direction = "📈" if change > 0 else "📉"
-                    line = f"⏱️ {tf}: ({change:+.2f}%) {direction}"
-                    
-                    # Eşik kontrolü
-                    if abs(change) > thresholds.get(tf, 1.0):
-                        movement_emoji = "🟢" if change > 0 else "🔴"
-                        line += f" Sert Hareket {movement_emoji}"
-                        
-                    report_lines.append(line)
-            
-            return "\n".join(report_lines)
+            return self.btc_context.report()
         except Exception as e:
             print(f"BTC analiz hatası: {str(e)}")
             return ""
 
     def calculate_btc_change(self, timeframe):
-        """Belirli bir timeframe için BTC değişimini hesaplar"""
+        """Belirli bir timeframe için BTC değişimini hesaplar (son kapanmış 1m mumuna göre)"""
         try:
-            current_time = datetime.now().replace(second=0, microsecond=0)
-            
-            # Şu anki fiyatı al
-            df = self.get_coin_data('BTCUSDT', '1m')
-            if df is None or df.empty:
-                return None
-            current_price = df['close'].iloc[-1]
-            
-            # Timeframe'e göre geçmiş zamanı hesapla
-            if timeframe.endswith('m'):
-                minutes = int(timeframe[:-1])
-                past_time = current_time - timedelta(minutes=minutes)
-            elif timeframe.endswith('h'):
-                hours = int(timeframe[:-1])
-                past_time = current_time - timedelta(hours=hours)
-            else:
-                return None
-            
-            # Geçmiş zamanın en yakın fiyatını bul
-            past_prices = [(t, p) for t, p in self.btc_prices.items() if t <= past_time]
-            if not past_prices:
-                return None
-                
-            # En yakın zamandaki fiyatı al
-            past_time, past_price = max(past_prices, key=lambda x: x[0])
-            
-            # Yüzde değişimi hesapla
-            change = ((current_price - past_price) / past_price) * 100
-            
-            print(f"Timeframe: {timeframe}")
-            print(f"Current time: {current_time}, price: {current_price}")
-            print(f"Past time: {past_time}, price: {past_price}")
-            print(f"Change: {change}%")
-            
-            return change
-            
+            return self.btc_context.change(timeframe)
         except Exception as e:
             print(f"BTC değişim hesaplama hatası ({timeframe}): {str(e)}")
             return None
@@ -3021,398 +2780,422 @@ class MainWindow(QMainWindow):
             if df is None or df.empty:
                 return
                 
-            current_time = datetime.now()
-            current_price = df['close'].iloc[-1]
-            
-            # Şu anki zamanı dakika başına yuvarla
-            rounded_time = current_time.replace(second=0, microsecond=0)
-            
-            # Fiyatı kaydet
-            self.btc_prices[rounded_time] = current_price
-            
-            # 1 saatten eski verileri temizle
-            cutoff_time = rounded_time - timedelta(hours=1)
-            self.btc_prices = {k: v for k, v in self.btc_prices.items() if k >= cutoff_time}
-            
-            # Fiyatları dosyaya kaydet
-            self.save_btc_prices()
+            # Şu anki dakikanın fiyatını kaydet (dakika kapanınca dosyaya tek kayıt eklenir)
+            self.btc_price_history.record(float(df['close'].iloc[-1]))
             
         except Exception as e:
             print(f"BTC fiyat güncelleme hatası: {str(e)}")
 
-    def check_all_alarms(self):
-        """Tüm kayıtlı alarmları kontrol et"""
-        if not os.path.exists("alarms.json"):
+    def plan_alarm_evaluation(self, alarms):
+        """
+        Alarmları (coin, timeframe) çiftlerine göre grupla.
+        Aynı çifte ait alarmlar tek veri çekimi ve tek indikatör hesabını paylaşır.
+        Tetiklenmiş tek seferlik alarmlar plana alınmaz.
+        Dönüş: {(coin, timeframe): [alarm, ...]} (depodaki sıra korunur)
+        """
+        plan = {}
+        for alarm in alarms:
+            if alarm.get('triggered', False) and alarm.get('is_once', True):
+                print(f"Alarm '{alarm['name']}' zaten tetiklenmiş ve tek seferlik, atlanıyor.")
+                continue
+            plan.setdefault((alarm['coin'], alarm['timeframe']), []).append(alarm)
+        return plan
+
+    def load_alarms_for_check(self):
+        """
+        Aktif alarmları depodan oku. Depo değişmediyse önceki liste, plan ve eşik
+        indeksi yeniden kullanılır. Dönüş: (alarms, plan)
+        """
+        version = self.alarm_store.version
+        if self.alarms_cache is None or self.alarms_cache[0] != version:
+            alarms = self.alarm_store.active()
+            plan = self.plan_alarm_evaluation(alarms)
+            self.threshold_index.rebuild([alarm for group in plan.values() for alarm in group])
+            self.alarms_cache = (version, alarms, plan)
+        return self.alarms_cache[1], self.alarms_cache[2]
+
+    def get_timeframe_indicators(self, coin, timeframe):
+        """
+        (coin, timeframe) için veri ve indikatör sonuçları.
+        Aynı kontrol döngüsünde tekrar istenirse hesaplanmış sonuç döner.
+        Dönüş: (DataFrame, indikatör sonuçları) veya (None, None)
+        """
+        key = (coin, timeframe)
+        if key not in self.cycle_indicators:
+            self.compute_indicator_snapshot([key])
+        return self.cycle_indicators.get(key, (None, None))
+
+    def indicator_detail_value(self, alarm, indicators):
+        """Alarmın indikatör/detay seçimine karşılık gelen değer (calculate_indicator_value ile aynı eşleme)"""
+        if alarm["indicator"] == "İndicPro":
+            if alarm["detail"] == "Ana Çizgi":
+                return indicators['wavetrend']['wt1']
+            elif alarm["detail"] == "Sinyal Çizgisi":
+                return indicators['wavetrend']['wt2']
+                
+        elif alarm["indicator"] == "MACD":
+            if alarm["detail"] == "MACD Çizgisi":
+                return indicators['macd']['MACD_DEMA']
+            elif alarm["detail"] == "Sinyal Çizgisi":
+                return indicators['macd']['Signal_DEMA']
+            elif alarm["detail"] == "Histogram":
+                return indicators['macd']['MACD_Hist_DEMA']
+                
+        elif alarm["indicator"] == "Bollinger":
+            if alarm["detail"] == "Üst Bant":
+                return indicators['bollinger']['BB_upper']
+            elif alarm["detail"] == "Orta Bant":
+                return indicators['bollinger']['BB_middle']
+            elif alarm["detail"] == "Alt Bant":
+                return indicators['bollinger']['BB_lower']
+                
+        return None
+
+    def alarm_indicator_value(self, alarm, coin, timeframe):
+        """Alarmın indikatör değerini verilen zaman diliminde, paylaşılan sonuçlardan al"""
+        df, indicators = self.get_timeframe_indicators(coin, timeframe)
+        if indicators is None:
+            return None
+        return self.indicator_detail_value(alarm, indicators)
+
+    def evaluate_alarm_condition(self, alarm, indicators, previous_value):
+        """
+        Alarm koşulunu paylaşılan indikatör sonuçlarına göre değerlendir.
+        Dönüş: (tetiklendi_mi, mevcut_değer)
+        """
+        triggered = False
+        current_value = None
+        
+        if alarm["indicator"] == "İndicPro":
+            wt_result = indicators['wavetrend']
+            wt1, wt2 = wt_result['wt1'], wt_result['wt2']
+            print(f"İndicPro değerleri - WT1: {wt1:.2f}, WT2: {wt2:.2f}")
+
+            if alarm["detail"] == "Ana Çizgi":
+                current_value = wt1
+                target = float(alarm["value"])
+                if alarm["condition"] == "Üstüne Çıktığında":
+                    triggered = current_value > target and (previous_value is None or previous_value <= target)
+                    print(f"Üstüne Çıktığında kontrolü:")
+                    print(f"Current > Target: {current_value} > {target} = {current_value > target}")
+                    print(f"Previous <= Target: {previous_value} <= {target} = {previous_value is None or previous_value <= target}")
+                elif alarm["condition"] == "Altına Düştüğünde":
+                    triggered = current_value < target and (previous_value is None or previous_value >= target)
+                    print(f"Altına Düştüğünde kontrolü:")
+                    print(f"Current < Target: {current_value} < {target} = {current_value < target}")
+                    print(f"Previous >= Target: {previous_value} >= {target} = {previous_value is None or previous_value >= target}")
+            elif alarm["detail"] == "Sinyal Çizgisi":
+                current_value = wt2
+                target = float(alarm["value"])
+                if alarm["condition"] == "Üstüne Çıktığında":
+                    triggered = current_value > target and (previous_value is None or previous_value <= target)
+                    print(f"Üstüne Çıktığında kontrolü:")
+                    print(f"Current > Target: {current_value} > {target} = {current_value > target}")
+                    print(f"Previous <= Target: {previous_value} <= {target} = {previous_value is None or previous_value <= target}")
+                elif alarm["condition"] == "Altına Düştüğünde":
+                    triggered = current_value < target and (previous_value is None or previous_value >= target)
+                    print(f"Altına Düştüğünde kontrolü:")
+                    print(f"Current < Target: {current_value} < {target} = {current_value < target}")
+                    print(f"Previous >= Target: {previous_value} >= {target} = {previous_value is None or previous_value >= target}")
+            elif alarm["detail"] == "Kesişim":
+                if alarm["condition"] == "Yukarı Kesişim":
+                    triggered = wt1 > wt2 and (previous_value is None or wt1 <= wt2)
+                    print(f"Yukarı Kesişim kontrolü:")
+                    print(f"WT1 > WT2: {wt1} > {wt2} = {wt1 > wt2}")
+                elif alarm["condition"] == "Aşağı Kesişim":
+                    triggered = wt1 < wt2 and (previous_value is None or wt1 >= wt2)
+                    print(f"Aşağı Kesişim kontrolü:")
+                    print(f"WT1 < WT2: {wt1} < {wt2} = {wt1 < wt2}")
+
+        elif alarm["indicator"] == "MACD":
+            macd_result = indicators['macd']
+            macd_line, signal_line, hist = macd_result['MACD_DEMA'], macd_result['Signal_DEMA'], macd_result['MACD_Hist_DEMA']
+            print(f"MACD değerleri - MACD: {macd_line:.2f}, Signal: {signal_line:.2f}, Hist: {hist:.2f}")
+
+            if alarm["detail"] == "MACD Çizgisi":
+                current_value = macd_line
+            elif alarm["detail"] == "Sinyal Çizgisi":
+                current_value = signal_line
+            elif alarm["detail"] == "Histogram":
+                current_value = hist
+            elif alarm["detail"] == "Kesişim":
+                if alarm["condition"] == "Yukarı Kesişim":
+                    triggered = macd_line > signal_line and (previous_value is None or macd_line <= signal_line)
+                    print(f"MACD Yukarı Kesişim kontrolü:")
+                    print(f"MACD > Signal: {macd_line} > {signal_line} = {macd_line > signal_line}")
+                elif alarm["condition"] == "Aşağı Kesişim":
+                    triggered = macd_line < signal_line and (previous_value is None or macd_line >= signal_line)
+                    print(f"MACD Aşağı Kesişim kontrolü:")
+                    print(f"MACD < Signal: {macd_line} < {signal_line} = {macd_line < signal_line}")
+
+            if not triggered and alarm["detail"] != "Kesişim":
+                target = float(alarm["value"])
+                if alarm["condition"] == "Üstüne Çıktığında":
+                    triggered = current_value > target and (previous_value is None or previous_value <= target)
+                    print(f"Üstüne Çıktığında kontrolü:")
+                    print(f"Current > Target: {current_value} > {target} = {current_value > target}")
+                    print(f"Previous <= Target: {previous_value} <= {target} = {previous_value is None or previous_value <= target}")
+                elif alarm["condition"] == "Altına Düştüğünde":
+                    triggered = current_value < target and (previous_value is None or previous_value >= target)
+                    print(f"Altına Düştüğünde kontrolü:")
+                    print(f"Current < Target: {current_value} < {target} = {current_value < target}")
+                    print(f"Previous >= Target: {previous_value} >= {target} = {previous_value is None or previous_value >= target}")
+
+        elif alarm["indicator"] == "Bollinger":
+            try:
+                bb_data = indicators['bollinger']
+                current_price = indicators['close']
+
+                # Seçilen banda göre değeri al
+                if alarm["detail"] == "Üst Bant":
+                    band_value = bb_data['BB_upper']
+                elif alarm["detail"] == "Orta Bant":
+                    band_value = bb_data['BB_middle']
+                elif alarm["detail"] == "Alt Bant":
+                    band_value = bb_data['BB_lower']
+                else:
+                    print(f"Geçersiz Bollinger bandı detayı: {alarm['detail']}")
+                    return False, None
+
+                print(f"Bollinger {alarm['detail']} kontrolü:")
+                print(f"Mevcut Fiyat: {current_price:.8f}")
+                print(f"Bant Değeri: {band_value:.8f}")
+
+                # Koşula göre kontrol et
+                if alarm["condition"] == "Üstüne Çıktığında":
+                    triggered = current_price > band_value and (previous_value is None or previous_value <= band_value)
+                    print(f"Üstüne Çıktığında kontrolü: {current_price:.2f} > {band_value:.2f} = {triggered}")
+                elif alarm["condition"] == "Altına Düştüğünde":
+                    triggered = current_price < band_value and (previous_value is None or previous_value >= band_value)
+                    print(f"Altına Düştüğünde kontrolü: {current_price:.2f} < {band_value:.2f} = {triggered}")
+                elif alarm["condition"] == "Eşit Olduğunda":
+                    # Eşitlik için küçük bir tolerans kullan
+                    tolerance = band_value * 0.0001  # %0.01 tolerans
+                    triggered = abs(current_price - band_value) <= tolerance
+                    print(f"Eşit Olduğunda kontrolü: |{current_price:.2f} - {band_value:.2f}| <= {tolerance:.2f} = {triggered}")
+
+                current_value = current_price
+
+            except Exception as e:
+                print(f"Bollinger alarm kontrolünde hata: {str(e)}")
+                traceback.print_exc()
+                return False, None
+        elif alarm["indicator"] == "Volume Weighted MACD":
+            vwmacd_result = indicators['vwmacd']
+
+            if alarm["detail"] == "VW MACD":
+                current_value = vwmacd_result['macd']
+            elif alarm["detail"] == "VW Signal":
+                current_value = vwmacd_result['signal']
+            elif alarm["detail"] == "VW Histogram":
+                current_value = vwmacd_result['histogram']
+
+            target = float(alarm["value"])
+            if alarm["condition"] == "Üstüne Çıktığında":
+                triggered = current_value > target and (previous_value is None or previous_value <= target)
+                print(f"Üstüne Çıktığında kontrolü:")
+                print(f"Current > Target: {current_value} > {target} = {current_value > target}")
+                print(f"Previous <= Target: {previous_value} <= {target} = {previous_value is None or previous_value <= target}")
+            elif alarm["condition"] == "Altına Düştüğünde":
+                triggered = current_value < target and (previous_value is None or previous_value >= target)
+                print(f"Altına Düştüğünde kontrolü:")
+                print(f"Current < Target: {current_value} < {target} = {current_value < target}")
+                print(f"Previous >= Target: {previous_value} >= {target} = {previous_value is None or previous_value >= target}")
+        
+        return triggered, current_value
+
+    def handle_triggered_alarm(self, alarm, alarm_key, current_value, df):
+        """Tetiklenen alarm için güvenlik kontrollerini yap ve bildirimleri gönder"""
+        coin = alarm['coin']
+        timeframe = alarm['timeframe']
+        
+        # Ana sinyalin yönünü belirle (LONG mu SHORT mu)
+        main_wt1 = self.alarm_indicator_value(alarm, coin, timeframe)
+
+        if main_wt1 is None:
+            print("⚠️ Ana sinyal hesaplanamadı, atlanıyor")
+            self.previous_values[alarm_key] = current_value
             return
-            
+
+        # Sinyal yönünü belirle
+        if main_wt1 <= -60:
+            signal_direction = "LONG"
+        elif main_wt1 >= 60:
+            signal_direction = "SHORT"
+        else:
+            signal_direction = "NÖTR"
+
+        print(f"\n{'='*60}")
+        print(f"SİNYAL TETİKLENDİ: {coin} - {signal_direction}")
+        print(f"{'='*60}")
+
+        # 🛡️ KONTROL 1: 5m ve 1m timeframe'leri kontrol et
+        security_passed, security_message = self.check_signal_strength(coin, alarm)
+
+        if not security_passed:
+            print(f"\n⛔ SİNYAL İPTAL EDİLDİ (Güvenlik): {security_message}")
+            print(f"Alarm: {alarm['name']}, Coin: {coin}")
+            self.previous_values[alarm_key] = current_value
+            return
+
+        print(f"✅ KONTROL 1 GEÇTİ: {security_message}")
+
+        # 📊 KONTROL 2: Volatilite riski kontrol et
+        volatility_passed, volatility_message = self.check_volatility_risk(coin, signal_direction)
+
+        if not volatility_passed:
+            print(f"\n⛔ SİNYAL İPTAL EDİLDİ (Volatilite): {volatility_message}")
+            print(f"Alarm: {alarm['name']}, Coin: {coin}")
+            self.previous_values[alarm_key] = current_value
+            return
+
+        print(f"✅ KONTROL 2 GEÇTİ: {volatility_message}")
+
+        # 🚫 KONTROL 3: Spam kontrolü
+        spam_passed, spam_message = self.check_spam_prevention(coin)
+
+        if not spam_passed:
+            print(f"\n⛔ SİNYAL İPTAL EDİLDİ (Spam): {spam_message}")
+            print(f"Alarm: {alarm['name']}, Coin: {coin}")
+            self.previous_values[alarm_key] = current_value
+            return
+
+        print(f"✅ KONTROL 3 GEÇTİ: {spam_message}")
+
+        print(f"\n{'='*60}")
+        print(f"🎯 TÜM KONTROLLER GEÇİLDİ - SİNYAL GÖNDERİLİYOR!")
+        print(f"{'='*60}\n")
+
+        # Alarm sesini arka planda çal (ses bitene kadar beklenmez)
+        self.alert_sound.play()
+
+        # Fiyat için ondalık basamak sayısını dinamik olarak hesapla
+        current_price = df['close'].iloc[-1]
+        decimal_count = len(str(current_price).split('.')[-1]) + 1
+
+        # Fiyatı %0.05 düşür
+        discounted_price = current_price * (1 - 0.0005)  # %0.05 düşük
+
+        # Zaman dilimi değerleri: ana zaman dilimi, 5m ve 1m
+        timeframe_values = [(timeframe, main_wt1)]
+        with self.request_scheduler.priority(PRIORITY_CONFIRM):
+            for extra_timeframe in ("5m", "1m"):
+                value = self.alarm_indicator_value(alarm, coin, extra_timeframe)
+                if value is not None:
+                    timeframe_values.append((extra_timeframe, value))
+
+        # Sinyal bir kez oluşturulur, her hedef kendi formatını bundan üretir
+        try:
+            market_position = self.get_coin_market_position(coin)
+        except Exception as e:
+            print(f"Market pozisyonu alınamadı: {str(e)}")
+            market_position = None
+
+        signal = Signal.from_alarm(
+            alarm, discounted_price, decimal_count,  # %0.05 düşük fiyat
+            direction=signal_direction,
+            timeframes=timeframe_values,
+            market_position=market_position,
+            candle_time=int(df.index[-1].timestamp() * 1000) if isinstance(df.index, pd.DatetimeIndex) else None
+        )
+
+        # Bildirim ekle (alarm kontrolü arka planda çalışır, liste ana thread'de güncellenir)
+        self.notification_received.emit(signal.to_telegram_text())
+
+        # Telegram, backend ve Next.js'e gönder
+        self.send_notification(signal)
+
+        # Son sinyal zamanını kaydet (spam önleme için)
+        self.update_last_signal_time(coin)
+
+        # Alarm durumunu güncelle
+        if alarm.get('is_once', True):
+            alarm['triggered'] = True
+            self.alarm_store.mark_triggered(alarm)
+
+    def check_all_alarms(self, cards=([], None)):
+        """
+        Tüm kayıtlı alarmları kontrol et (döngü havuzunda çalışır).
+        cards: Ana thread'de alınan card_subscriptions() sonucu
+        """
         try:
             # BTC fiyatlarını güncelle
             self.update_btc_prices()
             
-            with open("alarms.json", "r") as f:
-                alarms = json.load(f)
+            # Alarmlar (coin, timeframe) çiftlerine göre gruplanmış olarak gelir
+            alarms, plan = self.load_alarms_for_check()
                 
             if not alarms:  # Alarm yoksa
                 return
+            
+            # Yeni eklenen/tetiklenen alarmlara göre akış aboneliklerini güncelle
+            self.update_stream_subscriptions(alarms, cards)
                 
             print(f"\n{'='*50}")
-            print(f"Toplam {len(alarms)} alarm kontrol ediliyor")
+            print(f"Toplam {len(alarms)} alarm, {len(plan)} coin/zaman dilimi grubunda kontrol ediliyor")
+            memory = self.candle_store.memory_report()
+            cache = self.candle_cache.stats()
+            print(f"Mum önbelleği: {memory['series']} seri, {memory['total'] / 1024:.0f} KB "
+                  f"(seri başına {memory['per_series'] / 1024:.1f} KB) - "
+                  f"isabet {cache['hits']}, ıskalama {cache['misses']}, atılan {cache['evictions']}")
+            weight = self.request_scheduler.metrics()
+            print(f"İstek ağırlığı: {weight['used_weight']}/{weight['weight_limit']} - "
+                  f"kuyruk {weight['queue_depth']}, ertelenen {weight['deferred']}, "
+                  f"429/418 {weight['rate_limited']}")
             print(f"{'='*50}\n")
             
-            # Her alarm için ayrı kontrol yap
-            for alarm in alarms:
-                try:
-                    # Eğer alarm zaten tetiklendiyse ve tek seferlik ise atla
-                    if alarm.get('triggered', False) and alarm.get('is_once', True):
-                        print(f"Alarm '{alarm['name']}' zaten tetiklenmiş ve tek seferlik, atlanıyor.")
-                        continue
-                    
-                    coin = alarm['coin']
-                    timeframe = alarm['timeframe']
-                    
-                    print(f"\n{'*'*30}")
-                    print(f"Alarm Kontrol: {alarm['name']}")
-                    print(f"Coin: {coin}, Timeframe: {timeframe}")
-                    print(f"İndikatör: {alarm['indicator']} ({alarm['detail']})")
-                    print(f"Koşul: {alarm['condition']}, Hedef: {alarm['value']}")
-                    print(f"{'*'*30}\n")
-                    
-                    # Coin verilerini al
-                    df = self.get_coin_data(coin, timeframe)
-                    if df is None:
-                        print(f"Coin verisi alınamadı: {coin}")
-                        continue
-                        
-                    # Her alarm için benzersiz bir anahtar oluştur
-                    alarm_key = f"{alarm['name']}_{alarm['coin']}_{alarm['timeframe']}_{alarm['indicator']}_{alarm['detail']}_{alarm['condition']}_{alarm['value']}"
-                    triggered = False
-                    current_value = None
-                    previous_value = self.previous_values.get(alarm_key, None)
-                    
-                    print(f"Alarm anahtarı: {alarm_key}")
-                    print(f"Önceki değer: {previous_value}")
-                    
-                    # İndikatör değerlerini al
-                    if alarm["indicator"] == "İndicPro":
-                        wt_result = calculate_wavetrend(df)
-                        wt1, wt2 = wt_result['wt1'], wt_result['wt2']
-                        print(f"İndicPro değerleri - WT1: {wt1:.2f}, WT2: {wt2:.2f}")
-                        
-                        if alarm["detail"] == "Ana Çizgi":
-                            current_value = wt1
-                            target = float(alarm["value"])
-                            if alarm["condition"] == "Üstüne Çıktığında":
-                                triggered = current_value > target and (previous_value is None or previous_value <= target)
-                                print(f"Üstüne Çıktığında kontrolü:")
-                                print(f"Current > Target: {current_value} > {target} = {current_value > target}")
-                                print(f"Previous <= Target: {previous_value} <= {target} = {previous_value is None or previous_value <= target}")
-                            elif alarm["condition"] == "Altına Düştüğünde":
-                                triggered = current_value < target and (previous_value is None or previous_value >= target)
-                                print(f"Altına Düştüğünde kontrolü:")
-                                print(f"Current < Target: {current_value} < {target} = {current_value < target}")
-                                print(f"Previous >= Target: {previous_value} >= {target} = {previous_value is None or previous_value >= target}")
-                        elif alarm["detail"] == "Sinyal Çizgisi":
-                            current_value = wt2
-                            target = float(alarm["value"])
-                            if alarm["condition"] == "Üstüne Çıktığında":
-                                triggered = current_value > target and (previous_value is None or previous_value <= target)
-                                print(f"Üstüne Çıktığında kontrolü:")
-                                print(f"Current > Target: {current_value} > {target} = {current_value > target}")
-                                print(f"Previous <= Target: {previous_value} <= {target} = {previous_value is None or previous_value <= target}")
-                            elif alarm["condition"] == "Altına Düştüğünde":
-                                triggered = current_value < target and (previous_value is None or previous_value >= target)
-                                print(f"Altına Düştüğünde kontrolü:")
-                                print(f"Current < Target: {current_value} < {target} = {current_value < target}")
-                                print(f"Previous >= Target: {previous_value} >= {target} = {previous_value is None or previous_value >= target}")
-                        elif alarm["detail"] == "Kesişim":
-                            if alarm["condition"] == "Yukarı Kesişim":
-                                triggered = wt1 > wt2 and (previous_value is None or wt1 <= wt2)
-                                print(f"Yukarı Kesişim kontrolü:")
-                                print(f"WT1 > WT2: {wt1} > {wt2} = {wt1 > wt2}")
-                            elif alarm["condition"] == "Aşağı Kesişim":
-                                triggered = wt1 < wt2 and (previous_value is None or wt1 >= wt2)
-                                print(f"Aşağı Kesişim kontrolü:")
-                                print(f"WT1 < WT2: {wt1} < {wt2} = {wt1 < wt2}")
-                    
-                    elif alarm["indicator"] == "MACD":
-                        macd_result = calculate_macd_dema(df)
-                        macd_line, signal_line, hist = macd_result['MACD_DEMA'], macd_result['Signal_DEMA'], macd_result['MACD_Hist_DEMA']
-                        print(f"MACD değerleri - MACD: {macd_line:.2f}, Signal: {signal_line:.2f}, Hist: {hist:.2f}")
-                        
-                        if alarm["detail"] == "MACD Çizgisi":
-                            current_value = macd_line
-                        elif alarm["detail"] == "Sinyal Çizgisi":
-                            current_value = signal_line
-                        elif alarm["detail"] == "Histogram":
-                            current_value = hist
-                        elif alarm["detail"] == "Kesişim":
-                            if alarm["condition"] == "Yukarı Kesişim":
-                                triggered = macd_line > signal_line and (previous_value is None or macd_line <= signal_line)
-                                print(f"MACD Yukarı Kesişim kontrolü:")
-                                print(f"MACD > Signal: {macd_line} > {signal_line} = {macd_line > signal_line}")
-                            elif alarm["condition"] == "Aşağı Kesişim":
-                                triggered = macd_line < signal_line and (previous_value is None or macd_line >= signal_line)
-                                print(f"MACD Aşağı Kesişim kontrolü:")
-                                print(f"MACD < Signal: {macd_line} < {signal_line} = {macd_line < signal_line}")
-                                
-                        if not triggered and alarm["detail"] != "Kesişim":
-                            target = float(alarm["value"])
-                            if alarm["condition"] == "Üstüne Çıktığında":
-                                triggered = current_value > target and (previous_value is None or previous_value <= target)
-                                print(f"Üstüne Çıktığında kontrolü:")
-                                print(f"Current > Target: {current_value} > {target} = {current_value > target}")
-                                print(f"Previous <= Target: {previous_value} <= {target} = {previous_value is None or previous_value <= target}")
-                            elif alarm["condition"] == "Altına Düştüğünde":
-                                triggered = current_value < target and (previous_value is None or previous_value >= target)
-                                print(f"Altına Düştüğünde kontrolü:")
-                                print(f"Current < Target: {current_value} < {target} = {current_value < target}")
-                                print(f"Previous >= Target: {previous_value} >= {target} = {previous_value is None or previous_value >= target}")
-                    
-                    elif alarm["indicator"] == "Bollinger":
-                        try:
-                            bb_data = calculate_bollinger_bands(df)
-                            current_price = df['close'].iloc[-1]
-                            
-                            # Seçilen banda göre değeri al
-                            if alarm["detail"] == "Üst Bant":
-                                band_value = bb_data['BB_upper']
-                            elif alarm["detail"] == "Orta Bant":
-                                band_value = bb_data['BB_middle']
-                            elif alarm["detail"] == "Alt Bant":
-                                band_value = bb_data['BB_lower']
-                            else:
-                                print(f"Geçersiz Bollinger bandı detayı: {alarm['detail']}")
-                                continue
-                            
-                            print(f"Bollinger {alarm['detail']} kontrolü:")
-                            print(f"Mevcut Fiyat: {current_price:.8f}")
-                            print(f"Bant Değeri: {band_value:.8f}")
-                            
-                            # Koşula göre kontrol et
-                            if alarm["condition"] == "Üstüne Çıktığında":
-                                triggered = current_price > band_value and (previous_value is None or previous_value <= band_value)
-                                print(f"Üstüne Çıktığında kontrolü: {current_price:.2f} > {band_value:.2f} = {triggered}")
-                            elif alarm["condition"] == "Altına Düştüğünde":
-                                triggered = current_price < band_value and (previous_value is None or previous_value >= band_value)
-                                print(f"Altına Düştüğünde kontrolü: {current_price:.2f} < {band_value:.2f} = {triggered}")
-                            elif alarm["condition"] == "Eşit Olduğunda":
-                                # Eşitlik için küçük bir tolerans kullan
-                                tolerance = band_value * 0.0001  # %0.01 tolerans
-                                triggered = abs(current_price - band_value) <= tolerance
-                                print(f"Eşit Olduğunda kontrolü: |{current_price:.2f} - {band_value:.2f}| <= {tolerance:.2f} = {triggered}")
-                            
-                            current_value = current_price
-                            
-                        except Exception as e:
-                            print(f"Bollinger alarm kontrolünde hata: {str(e)}")
-                            traceback.print_exc()
-                            continue
-                    elif alarm["indicator"] == "Volume Weighted MACD":
-                        vwmacd_result = {
-                            'macd': (df['volume'] * df['close']).ewm(span=12, adjust=False).mean() / df['volume'].ewm(span=12, adjust=False).mean() - \
-                                   (df['volume'] * df['close']).ewm(span=26, adjust=False).mean() / df['volume'].ewm(span=26, adjust=False).mean(),
-                            'signal': None,
-                            'histogram': None
-                        }
-                        
-                        # Sinyal ve histogram hesapla
-                        vwmacd_result['signal'] = vwmacd_result['macd'].ewm(span=9, adjust=False).mean()
-                        vwmacd_result['histogram'] = vwmacd_result['macd'] - vwmacd_result['signal']
-                        
-                        if alarm["detail"] == "VW MACD":
-                            current_value = vwmacd_result['macd'].iloc[-1]
-                        elif alarm["detail"] == "VW Signal":
-                            current_value = vwmacd_result['signal'].iloc[-1]
-                        elif alarm["detail"] == "VW Histogram":
-                            current_value = vwmacd_result['histogram'].iloc[-1]
-                            
-                        target = float(alarm["value"])
-                        if alarm["condition"] == "Üstüne Çıktığında":
-                            triggered = current_value > target and (previous_value is None or previous_value <= target)
-                            print(f"Üstüne Çıktığında kontrolü:")
-                            print(f"Current > Target: {current_value} > {target} = {current_value > target}")
-                            print(f"Previous <= Target: {previous_value} <= {target} = {previous_value is None or previous_value <= target}")
-                        elif alarm["condition"] == "Altına Düştüğünde":
-                            triggered = current_value < target and (previous_value is None or previous_value >= target)
-                            print(f"Altına Düştüğünde kontrolü:")
-                            print(f"Current < Target: {current_value} < {target} = {current_value < target}")
-                            print(f"Previous >= Target: {previous_value} >= {target} = {previous_value is None or previous_value >= target}")
-                    
-                    # Mevcut değeri kaydet
-                    if current_value is not None:
-                        self.previous_values[alarm_key] = current_value
-                    
-                    print(f"\nAlarm durumu: {'Tetiklendi' if triggered else 'Tetiklenmedi'}\n")
-                    
-                    # Alarm tetiklendiyse
-                    if triggered:
-                        # Ana sinyalin yönünü belirle (LONG mu SHORT mu)
-                        main_df = self.get_coin_data(coin, alarm['timeframe'])
-                        main_wt1 = self.calculate_indicator_value(alarm, main_df)
-                        
-                        if main_wt1 is None:
-                            print("⚠️ Ana sinyal hesaplanamadı, atlanıyor")
-                            self.previous_values[alarm_key] = current_value
-                            continue
-                        
-                        # Sinyal yönünü belirle
-                        if main_wt1 <= -60:
-                            signal_direction = "LONG"
-                        elif main_wt1 >= 60:
-                            signal_direction = "SHORT"
-                        else:
-                            signal_direction = "NÖTR"
-                        
-                        print(f"\n{'='*60}")
-                        print(f"SİNYAL TETİKLENDİ: {coin} - {signal_direction}")
-                        print(f"{'='*60}")
-                        
-                        # 🛡️ KONTROL 1: 5m ve 1m timeframe'leri kontrol et
-                        security_passed, security_message = self.check_signal_strength(coin, alarm)
-                        
-                        if not security_passed:
-                            print(f"\n⛔ SİNYAL İPTAL EDİLDİ (Güvenlik): {security_message}")
-                            print(f"Alarm: {alarm['name']}, Coin: {coin}")
-                            self.previous_values[alarm_key] = current_value
-                            continue
-                        
-                        print(f"✅ KONTROL 1 GEÇTİ: {security_message}")
-                        
-                        # 📊 KONTROL 2: Volatilite riski kontrol et
-                        volatility_passed, volatility_message = self.check_volatility_risk(coin, signal_direction)
-                        
-                        if not volatility_passed:
-                            print(f"\n⛔ SİNYAL İPTAL EDİLDİ (Volatilite): {volatility_message}")
-                            print(f"Alarm: {alarm['name']}, Coin: {coin}")
-                            self.previous_values[alarm_key] = current_value
-                            continue
-                        
-                        print(f"✅ KONTROL 2 GEÇTİ: {volatility_message}")
-                        
-                        # 🚫 KONTROL 3: Spam kontrolü
-                        spam_passed, spam_message = self.check_spam_prevention(coin)
-                        
-                        if not spam_passed:
-                            print(f"\n⛔ SİNYAL İPTAL EDİLDİ (Spam): {spam_message}")
-                            print(f"Alarm: {alarm['name']}, Coin: {coin}")
-                            self.previous_values[alarm_key] = current_value
-                            continue
-                        
-                        print(f"✅ KONTROL 3 GEÇTİ: {spam_message}")
-                        
-                        print(f"\n{'='*60}")
-                        print(f"🎯 TÜM KONTROLLER GEÇİLDİ - SİNYAL GÖNDERİLİYOR!")
-                        print(f"{'='*60}\n")
-                        
-                        # Windows alarm sesi çal (4 saniye)
-                        try:
-                            winsound.Beep(1000, 4000)  # 1000 Hz, 4000 ms (4 saniye)
-                        except:
-                            print("Ses çalınamadı")
-                        
-                        # Fiyat için ondalık basamak sayısını dinamik olarak hesapla
-                        current_price = df['close'].iloc[-1]
-                        decimal_count = len(str(current_price).split('.')[-1]) + 1
-                        
-                        # Fiyatı %0.05 düşür
-                        discounted_price = current_price * (1 - 0.0005)  # %0.05 düşük
+            # Her çift için veriyi bir kez çek, indikatörleri bir kez hesapla
+            self.cycle_indicators = {}
+            self.compute_indicator_snapshot(plan.keys())
+            
+            for coin, timeframe in plan:
+                df, indicators = self.get_timeframe_indicators(coin, timeframe)
+                if df is None or indicators is None:
+                    print(f"Coin verisi alınamadı: {coin}")
+                    continue
+                
+                # Eşik alarmları: sıralı eşik listelerinde ikili arama ile bulunur
+                for alarm, current_value in self.threshold_index.evaluate(coin, timeframe, indicators):
+                    try:
+                        print(f"\nEşik kesildi: {alarm['name']} ({coin} {timeframe}) - "
+                              f"{alarm['indicator']} ({alarm['detail']}) {alarm['condition']} {alarm['value']}, "
+                              f"Mevcut değer: {current_value}")
+                        self.handle_triggered_alarm(alarm, alarm_key(alarm), current_value, df)
+                    except Exception as e:
+                        print(f"Alarm kontrolünde hata: {e}")
+                
+                # Kesişim ve Bollinger alarmları tek tek kontrol edilir
+                for alarm in self.threshold_index.individual_alarms(coin, timeframe):
+                    try:
+                        print(f"\n{'*'*30}")
+                        print(f"Alarm Kontrol: {alarm['name']}")
+                        print(f"Coin: {coin}, Timeframe: {timeframe}")
+                        print(f"İndikatör: {alarm['indicator']} ({alarm['detail']})")
+                        print(f"Koşul: {alarm['condition']}, Hedef: {alarm['value']}")
+                        print(f"{'*'*30}\n")
                         
-                        # Bildirim mesajını hazırla
-                        notification_message = f"🚨 {alarm['name']}\n\n"
-                        notification_message += f"💰 Coin: {coin}\n"
-                        notification_message += f"💵 Fiyat: {discounted_price:.{decimal_count}f} USDT\n"  # %0.05 düşük fiyat
-                        notification_message += f"📊 İndikatör: {alarm['indicator']} ({alarm['detail']})\n"
-                        notification_message += f"📈 Koşul: {alarm['condition']}\n"
-                        notification_message += f"🎯 Hedef: {alarm['value']}\n\n"
+                        # Her alarm için benzersiz bir anahtar oluştur
+                        key = alarm_key(alarm)
+                        previous_value = self.previous_values.get(key, None)
                         
-                        # 24 saatlik performans bilgisi ekle
-                        market_position_text = self.format_market_position_text(coin)
-                        if market_position_text:
-                            notification_message += market_position_text + "\n"
+                        print(f"Alarm anahtarı: {key}")
+                        print(f"Önceki değer: {previous_value}")
                         
-                        notification_message += f"⏱ Zaman Dilimleri:\n"                                                                        
-
-                        # Ana zaman dilimi (15m)
-                        main_timeframe_data = self.get_coin_data(coin, timeframe)
-                        main_result = self.calculate_indicator_value(alarm, main_timeframe_data)
-                        if main_result is not None:
-                            if main_result <= -80:
-                                signal = " 🟢 🟢 🟢 - - 3 LONG"
-                            elif main_result <= -70:
-                                signal = " 🟢 🟢 - - 2 LONG"
-                            elif main_result <= -60:
-                                signal = " 🟢 - - 1 LONG"
-                            elif main_result >= 80:
-                                signal = " 🔴 🔴 🔴 - - 3 SHORT"
-                            elif main_result >= 70:
-                                signal = " 🔴 🔴 - - 2 SHORT"
-                            elif main_result >= 60:
-                                signal = " 🔴 - - 1 SHORT"
-                            else:
-                                signal = ""
-                            notification_message += f"   • {timeframe}: {main_result:.2f}{signal}\n"
-
-                        # 5 dakikalık veri
-                        five_min_data = self.get_coin_data(coin, "5m")
-                        if five_min_data is not None:
-                            five_min_result = self.calculate_indicator_value(alarm, five_min_data)
-                            if five_min_result <= -80:
-                                signal = " 🟢 🟢 🟢 - - 3 LONG"
-                            elif five_min_result <= -70:
-                                signal = " 🟢 🟢 - - 2 LONG"
-                            elif five_min_result <= -60:
-                                signal = " 🟢 - - 1 LONG"
-                            elif five_min_result >= 80:
-                                signal = " 🔴 🔴 🔴 - - 3 SHORT"
-                            elif five_min_result >= 70:
-                                signal = " 🔴 🔴 - - 2 SHORT"
-                            elif five_min_result >= 60:
-                                signal = " 🔴 - - 1 SHORT"
-                            else:
-                                signal = ""
-                            notification_message += f"   • 5m: {five_min_result:.2f}{signal}\n"
-
-                        # 1 dakikalık veri
-                        one_min_data = self.get_coin_data(coin, "1m")
-                        if one_min_data is not None:
-                            one_min_result = self.calculate_indicator_value(alarm, one_min_data)
-                            if one_min_result <= -80:
-                                signal = " 🟢 🟢 🟢 - - 3 LONG"
-                            elif one_min_result <= -70:
-                                signal = " 🟢 🟢 - - 2 LONG"
-                            elif one_min_result <= -60:
-                                signal = " 🟢 - - 1 LONG"
-                            elif one_min_result >= 80:
-                                signal = " 🔴 🔴 🔴 - - 3 SHORT"
-                            elif one_min_result >= 70:
-                                signal = " 🔴 🔴 - - 2 SHORT"
-                            elif one_min_result >= 60:
-                                signal = " 🔴 - - 1 SHORT"
-                            else:
-                                signal = ""
-                            notification_message += f"   • 1m: {one_min_result:.2f}{signal}\n"
-
-                        if 'message' in alarm and alarm['message']:
-                            notification_message += f"\n📝 Not: {alarm['message']}"                            
-
-                        # Bildirim ekle
-                        self.add_notification(notification_message)
+                        triggered, current_value = self.evaluate_alarm_condition(alarm, indicators, previous_value)
                         
-                        # Telegram'a gönder
-                        self.send_notification(notification_message)
+                        # Mevcut değeri kaydet
+                        if current_value is not None:
+                            self.previous_values[key] = current_value
                         
-                        # Son sinyal zamanını kaydet (spam önleme için)
-                        self.update_last_signal_time(coin)
+                        print(f"\nAlarm durumu: {'Tetiklendi' if triggered else 'Tetiklenmedi'}\n")
                         
-                        # Alarm durumunu güncelle
-                        if alarm.get('is_once', True):
-                            alarm['triggered'] = True
-                            with open("alarms.json", "w") as f:
-                                json.dump(alarms, f)
-                
-                except Exception as e:
-                    print(f"Alarm kontrolünde hata: {e}")
-                    continue
+                        # Alarm tetiklendiyse
+                        if triggered:
+                            self.handle_triggered_alarm(alarm, key, current_value, df)
+                    
+                    except Exception as e:
+                        print(f"Alarm kontrolünde hata: {e}")
+                        continue
                     
         except Exception as e:
             print(f"Alarm kontrolünde genel hata: {e}")
@@ -0,0 +1,158 @@
+"""
+Piyasa Sıralaması Modülü
+
+Tüm USDT paritelerinin 24 saatlik değişimlerini fetch_tickers() ile çeker ve
+en çok yükselen / düşen sıralamalarını bir kez (NumPy argsort ile) hesaplar.
+Sonuç {coin: {'change_24h', 'gainer_rank', 'loser_rank', 'total_coins'}}
+sözlüğünde tutulur; bir coinin sırası tek bir sözlük okumasıdır.
+
+Veri eskidiğinde (varsayılan 5 dk) yenileme arka planda yapılır ve bu sırada
+eski veri döndürülmeye devam eder (stale-while-revalidate). Sinyal tetiklenme
+yolu hiçbir zaman fetch_tickers() çağrısını beklemez; henüz hiç veri yoksa
+None döner.
+"""
+
+import threading
+import time
+
+import numpy as np
+
+# Sıralamada dikkate alınan en fazla coin (en çok yükselen/düşen ilk 100)
+RANK_LIMIT = 100
+
+
+def build_snapshot(tickers, rank_limit=RANK_LIMIT):
+    """
+    fetch_tickers() sonucundan sıralama tablosu
+    Dönüş: (pozisyonlar sözlüğü, {'gainers', 'losers', 'all_tickers'})
+    """
+    usdt_tickers = []
+    for symbol, ticker in tickers.items():
+        if symbol.endswith('/USDT'):
+            change_24h = ticker.get('percentage', 0)
+            if change_24h is not None:
+                usdt_tickers.append({
+                    'symbol': symbol.replace('/USDT', 'USDT'),
+                    'change_24h': float(change_24h),
+                    'volume': ticker.get('quoteVolume', 0)  # USDT cinsinden hacim
+                })
+
+    changes = np.array([ticker['change_24h'] for ticker in usdt_tickers], dtype=float)
+    # Kararlı sıralama: eşit değişimlerde borsa sırası korunur (sorted() ile aynı)
+    gainer_order = np.argsort(-changes, kind='stable')
+    loser_order = np.argsort(changes, kind='stable')
+
+    total = len(usdt_tickers)
+    positions = {
+        ticker['symbol']: {
+            'change_24h': ticker['change_24h'],
+            'gainer_rank': None,
+            'loser_rank': None,
+            'total_coins': total
+        }
+        for ticker in usdt_tickers
+    }
+    for rank, index in enumerate(gainer_order[:rank_limit], 1):
+        positions[usdt_tickers[index]['symbol']]['gainer_rank'] = rank
+    for rank, index in enumerate(loser_order[:rank_limit], 1):
+        positions[usdt_tickers[index]['symbol']]['loser_rank'] = rank
+
+    performance = {
+        'gainers': [usdt_tickers[i] for i in gainer_order[:rank_limit]],
+        'losers': [usdt_tickers[i] for i in loser_order[:rank_limit]],
+        'all_tickers': usdt_tickers
+    }
+    return positions, performance
+
+
+class MarketRanking:
+    def __init__(self, fetch_tickers, max_age=300):
+        """
+        fetch_tickers: Borsadan tüm ticker'ları döndüren fonksiyon (ccxt fetch_tickers)
+        max_age: Verinin yenilenmeden kullanılabileceği süre (sn)
+        """
+        self.fetch_tickers = fetch_tickers
+        self.max_age = max_age
+        self._positions = {}
+        self._performance = None
+        self._updated = None        # Son başarılı yenileme (monotonic)
+        self._refreshing = False
+        self._lock = threading.Lock()
+
+    def refresh(self):
+        """Veriyi hemen yenile (çağıran thread'de, bekler)"""
+        print("Binance'den 24 saatlik performans verileri çekiliyor...")
+        try:
+            positions, performance = build_snapshot(self.fetch_tickers())
+        except Exception as e:
+            print(f"Market performans verisi çekilirken hata: {str(e)}")
+            return False
+        with self._lock:
+            self._positions = positions
+            self._performance = performance
+            self._updated = time.monotonic()
+        print(f"Toplam {len(positions)} USDT çifti işlendi")
+        return True
+
+    def refresh_async(self):
+        """Yenileme zaten sürmüyorsa arka planda başlat"""
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        threading.Thread(target=self._refresh_worker, name="MarketRanking", daemon=True).start()
+
+    def _refresh_worker(self):
+        try:
+            self.refresh()
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+    def _revalidate(self):
+        if self._updated is None or time.monotonic() - self._updated >= self.max_age:
+            self.refresh_async()
+
+    @property
+    def age(self):
+        """Verinin yaşı (sn), hiç veri yoksa None"""
+        return None if self._updated is None else time.monotonic() - self._updated
+
+    def position(self, coin):
+        """Coinin 24 saatlik değişimi ve sıraları, veri yoksa None (beklemez)"""
+        self._revalidate()
+        with self._lock:
+            return self._positions.get(coin)
+
+    def positions(self):
+        """{coin: pozisyon} sözlüğü (beklemez)"""
+        self._revalidate()
+        with self._lock:
+            return self._positions
+
+    def performance(self):
+        """{'gainers', 'losers', 'all_tickers'} veya None (beklemez)"""
+        self._revalidate()
+        with self._lock:
+            return self._performance
+
+
+# Örnek kullanım:
+if __name__ == "__main__":
+    rng = np.random.default_rng(7)
+    fake_tickers = {f"C{i}/USDT": {'percentage': float(rng.normal(0, 5)), 'quoteVolume': 1e6} for i in range(400)}
+
+    def slow_fetch():
+        time.sleep(1)   # Borsa gecikmesi
+        return fake_tickers
+
+    ranking = MarketRanking(slow_fetch)
+    start = time.perf_counter()
+    print("İlk istek:", ranking.position("C0USDT"), f"({(time.perf_counter() - start) * 1000:.1f} ms)")
+
+    time.sleep(1.5)
+    start = time.perf_counter()
+    for i in range(400):
+        ranking.position(f"C{i}USDT")
+    print(f"400 sorgu {(time.perf_counter() - start) * 1000:.2f} ms")
+    print("C0USDT:", ranking.position("C0USDT"))
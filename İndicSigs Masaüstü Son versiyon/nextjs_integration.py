@@ -6,8 +6,10 @@ main.py dosyasındaki send_telegram_message fonksiyonuna eklenecek.
 """
 
 import requests
+import gzip
 import json
 import re
+import time
 from datetime import datetime
 
 # Next.js API URL
@@ -18,6 +20,19 @@ import os
 # Ortam değişkeninden al, yoksa production kullan
 NEXTJS_API_URL = os.getenv('NEXTJS_API_URL', 'https://indic-3m.vercel.app/api/signals')
 
+# Toplu gönderim: endpoint diziyi reddederse bu süre boyunca tekli gönderime dönülür
+BATCH_RETRY_INTERVAL = 600
+# Toplu gönderimi reddetme anlamına gelen yanıtlar (dizi veya gzip gövdeyi desteklemeyen endpoint).
+# 5xx sunucu hatasıdır: toplu gönderim kapatılmaz, sinyallerin hepsi daha sonra tekrar denenir
+BATCH_REJECTED_STATUSES = (400, 404, 405, 413, 415)
+
+# Endpoint'in toplu gönderimde geçersiz bulduğu sinyalin hatası; bu sinyal tekrar
+# gönderilse de kabul edilmez. Diğer hatalar (ör. kayıt hatası) geçicidir, tekrar denenir
+INVALID_PAYLOAD_ERROR = 'Invalid signal payload'
+
+_session = requests.Session()
+_batch_disabled_until = 0.0
+
 def parse_signal_from_message(message):
     """
     Telegram mesajından sinyal bilgilerini çıkarır
@@ -107,31 +122,45 @@ def parse_signal_from_message(message):
         return None
 
 
+def signal_payload(message):
+    """Signal nesnesinden gövdeyi üretir, metin ise parse eder"""
+    if hasattr(message, 'to_nextjs_payload'):
+        return message.to_nextjs_payload()
+    return parse_signal_from_message(message)
+
+
 def send_to_nextjs(message):
     """
-    Telegram mesajını Next.js API'ye gönderir
+    Sinyali Next.js API'ye gönderir
     
     Args:
-        message (str): Telegram mesajı
+        message (Signal | str): Signal nesnesi (signal_model) veya Telegram mesajı.
+            Signal nesnesinden gövde doğrudan üretilir, metin ise parse edilir.
         
     Returns:
         bool: Başarılı ise True
     """
     try:
-        # Mesajı parse et
-        signal_data = parse_signal_from_message(message)
-        
-        if not signal_data:
-            print("⚠️  Mesaj Next.js formatına çevrilemedi")
-            return False
-        
+        signal_data = signal_payload(message)
+    except Exception as e:
+        print(f"❌ Sinyal Next.js formatına çevrilemedi: {e}")
+        return False
+    if not signal_data:
+        print("⚠️  Mesaj Next.js formatına çevrilemedi")
+        return False
+    return _post_signal(signal_data)
+
+
+def _post_signal(signal_data):
+    """Tek sinyal gövdesini gönderir, başarılı ise True"""
+    try:
         print(f"\n📤 Next.js API'ye gönderiliyor...")
         print(f"   Symbol: {signal_data['symbol']}")
         print(f"   Type: {signal_data['signalType']}")
         print(f"   Price: {signal_data['price']}")
         
         # API'ye gönder
-        response = requests.post(
+        response = _session.post(
             NEXTJS_API_URL,
             json=signal_data,
             timeout=10
@@ -155,6 +184,93 @@ def send_to_nextjs(message):
         return False
 
 
+def send_batch_to_nextjs(messages):
+    """
+    Birden fazla sinyali tek istekte (gzip sıkıştırılmış JSON dizisi) gönderir.
+    Endpoint toplu gönderimi reddederse sinyaller tek tek gönderilir ve
+    BATCH_RETRY_INTERVAL boyunca toplu gönderim denenmez.
+    Next.js formatına çevrilemeyen mesajlar loglanıp bırakılır; tekrar
+    denense de çevrilemeyeceklerinden başarısız sayılmazlar.
+    
+    Args:
+        messages (list): Signal nesneleri veya Telegram mesajları
+        
+    Returns:
+        set: Gönderilemeyen sinyallerin listedeki sıra numaraları
+    """
+    global _batch_disabled_until
+    
+    payloads = []
+    indexes = []
+    for index, message in enumerate(messages):
+        try:
+            signal_data = signal_payload(message)
+        except Exception as e:
+            print(f"❌ Sinyal Next.js formatına çevrilemedi: {e}")
+            signal_data = None
+        if signal_data:
+            payloads.append(signal_data)
+            indexes.append(index)
+        else:
+            print("⚠️  Mesaj Next.js formatına çevrilemedi")
+    if not payloads:
+        return set()
+    
+    if len(payloads) == 1 or time.monotonic() < _batch_disabled_until:
+        return _send_each(payloads, indexes)
+    
+    body = gzip.compress(json.dumps(payloads).encode('utf-8'))
+    print(f"\n📤 Next.js API'ye {len(payloads)} sinyal toplu gönderiliyor ({len(body)} bayt)...")
+    
+    try:
+        response = _session.post(
+            NEXTJS_API_URL,
+            data=body,
+            headers={'Content-Type': 'application/json', 'Content-Encoding': 'gzip'},
+            timeout=10
+        )
+    except requests.exceptions.RequestException as e:
+        print(f"❌ Next.js toplu gönderim hatası: {e}")
+        return set(indexes)
+    
+    if response.status_code in BATCH_REJECTED_STATUSES:
+        print(f"⚠️  Next.js toplu gönderimi reddetti (HTTP {response.status_code}), tek tek gönderiliyor")
+        _batch_disabled_until = time.monotonic() + BATCH_RETRY_INTERVAL
+        return _send_each(payloads, indexes)
+    
+    if response.status_code not in [200, 201]:
+        print(f"❌ Next.js toplu gönderim hatası: HTTP {response.status_code}, sinyaller tekrar denenecek")
+        print(f"   Yanıt: {response.text[:200]}")
+        return set(indexes)
+    
+    # Endpoint her sinyal için sonuç döndürür (index: gönderilen dizideki sıra);
+    # geçersiz bulunanlar bırakılır, kaydedilemeyenler tekrar denenir
+    try:
+        results = response.json().get('results', [])
+    except ValueError:
+        results = []
+    failed = set()
+    rejected = 0
+    for result in results:
+        error = result.get('error')
+        if not error:
+            continue
+        position = result.get('index')
+        if error == INVALID_PAYLOAD_ERROR or not isinstance(position, int) or not 0 <= position < len(indexes):
+            print(f"❌ Next.js sinyali reddetti: {error}")
+            rejected += 1
+        else:
+            print(f"❌ Next.js sinyali kaydedemedi, tekrar denenecek: {error}")
+            failed.add(indexes[position])
+    print(f"✅ Next.js'e {len(payloads) - rejected - len(failed)} sinyal kaydedildi")
+    return failed
+
+
+def _send_each(payloads, indexes):
+    """Gövdeleri tek tek gönderir, gönderilemeyenlerin sıra numaralarını döndürür"""
+    return {index for index, signal_data in zip(indexes, payloads) if not _post_signal(signal_data)}
+
+
 # Test fonksiyonu
 if __name__ == "__main__":
     # Test mesajı
@@ -0,0 +1,329 @@
+"""
+Bildirim Dağıtıcı Modülü
+
+Tetiklenen sinyallerin Telegram, backend API ve Next.js'e gönderimini Qt
+thread'inden ayırır. Her hedef (sink) için ayrı bir kuyruk ve arka plan
+thread'i vardır; yavaş veya erişilemeyen bir hedef diğerlerini ve alarm
+döngüsünü bekletmez. dispatch() sadece kuyruğa ekler ve hemen döner.
+
+Hedef fonksiyonu bir iş sözlüğü alır ({'message': ..., ...}) ve True
+(teslim edildi) veya False (tekrar denenmeli) döndürür; hata fırlatması da
+başarısız deneme sayılır. İş sözlüğü her hedefe ayrı kopyalanır, hedef
+fonksiyonu tekrar denemeler arasında durum saklamak için onu değiştirebilir.
+
+Kuyruk dolarsa en eski iş atılır (en yeni sinyaller öncelikli).
+
+batch_size > 1 verilen hedefler işleri toplu alır: ilk işten sonra batch_window
+saniye boyunca (veya batch_size işe ulaşılana kadar) gelen işler birlikte
+gönderilir ve hedef fonksiyonu tek iş yerine iş listesi alır. Toplu gönderim
+kısmen başarısız olursa hedef, teslim ettiği işleri job[JOB_DELIVERED] = True
+ile işaretler; bu işler teslim edilmiş sayılır (outbox'ta deneme hakkı
+harcamaz), sadece diğerleri tekrar denenir.
+
+Dağıtıcıya bir NotificationOutbox verilirse her iş gönderilmeden önce diske
+yazılır; teslim edilemeyen veya kuyruktan atılan işler kaybolmaz, resume()
+ile başlayan arka plan thread'i bekleyenleri düzenli aralıklarla (ve
+uygulama açılışında) tekrar kuyruğa alır.
+"""
+
+import queue
+import threading
+import time
+import uuid
+
+from notification_outbox import OUTBOX_ID
+
+# Toplu hedefin teslim ettiği işleri işaretlediği alan
+JOB_DELIVERED = 'delivered'
+
+
+class SinkWorker:
+    def __init__(self, name, send, max_queue=100, max_retries=3, backoff=1.0, max_backoff=30.0,
+                 batch_size=1, batch_window=0.0, on_done=None):
+        """
+        name: Hedef adı (loglar ve metrikler için)
+        send: İşi gönderen fonksiyon, başarılıysa True döner
+        max_queue: Kuyrukta bekleyebilecek en fazla iş
+        max_retries: İlk denemeden sonra en fazla tekrar sayısı
+        backoff: İlk tekrar öncesi bekleme (sn), her tekrarda iki katına çıkar
+        batch_size: 1'den büyükse send iş listesi alır (toplu gönderim)
+        batch_window: Toplu gönderimde ilk işten sonra diğer işler için bekleme (sn)
+        on_done: Her iş için sonuçta çağrılır: on_done(job, teslim_edildi_mi)
+        """
+        self.name = name
+        self.send = send
+        self.batch_size = batch_size
+        self.batch_window = batch_window
+        self.on_done = on_done
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._running = True
+        self._lock = threading.Lock()
+
+        # Metrikler
+        self.delivered = 0
+        self.failed = 0
+        self.retried = 0
+        self.dropped = 0
+        self.batches = 0
+        self.last_latency = None      # Kuyruğa eklenmeden teslimata kadar geçen süre (sn)
+        self.max_latency = 0.0
+        self.total_latency = 0.0
+
+        self._thread = threading.Thread(target=self._run, name=f"Sink-{name}", daemon=True)
+        self._thread.start()
+
+    def submit(self, job):
+        item = (time.monotonic(), job)
+        while True:
+            try:
+                self._queue.put_nowait(item)
+                return
+            except queue.Full:
+                try:
+                    _, dropped_job = self._queue.get_nowait()
+                    self._queue.task_done()
+                    with self._lock:
+                        self.dropped += 1
+                    print(f"[{self.name}] Kuyruk dolu, en eski bildirim atıldı")
+                    self._done([(None, dropped_job)], False)
+                except queue.Empty:
+                    pass
+
+    def stop(self):
+        self._running = False
+        self._queue.put((None, None))
+
+    def _run(self):
+        while self._running:
+            item = self._queue.get()
+            if item[1] is None:
+                self._queue.task_done()
+                break
+            items = [item]
+            if self.batch_size > 1:
+                items += self._collect_batch()
+            try:
+                self._deliver(items)
+            finally:
+                for _ in items:
+                    self._queue.task_done()
+
+    def _collect_batch(self):
+        """İlk işten sonra pencere dolana kadar gelen işleri topla"""
+        items = []
+        deadline = time.monotonic() + self.batch_window
+        while len(items) + 1 < self.batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item[1] is None:
+                # Durdurma isteği: toplananlar gönderildikten sonra çık
+                self._queue.task_done()
+                self._running = False
+                break
+            items.append(item)
+        return items
+
+    def _deliver(self, items):
+        if self.batch_size > 1:
+            payload = [job for _, job in items]
+        else:
+            payload = items[0][1]
+
+        for attempt in range(self.max_retries + 1):
+            try:
+                ok = self.send(payload)
+            except Exception as e:
+                print(f"[{self.name}] Gönderim hatası: {e}")
+                ok = False
+
+            if ok:
+                now = time.monotonic()
+                latency = max(now - enqueued_at for enqueued_at, _ in items)
+                with self._lock:
+                    self.delivered += len(items)
+                    self.batches += 1
+                    self.last_latency = latency
+                    self.max_latency = max(self.max_latency, latency)
+                    self.total_latency += sum(now - enqueued_at for enqueued_at, _ in items)
+                if len(items) > 1:
+                    print(f"[{self.name}] {len(items)} bildirim toplu teslim edildi ({latency * 1000:.0f} ms)")
+                else:
+                    print(f"[{self.name}] Bildirim teslim edildi ({latency * 1000:.0f} ms)")
+                self._done(items, True)
+                return
+
+            if attempt < self.max_retries and self._running:
+                delay = min(self.backoff * (2 ** attempt), self.max_backoff)
+                with self._lock:
+                    self.retried += 1
+                print(f"[{self.name}] Gönderilemedi, {delay:.1f} sn sonra tekrar denenecek ({attempt + 1}/{self.max_retries})")
+                time.sleep(delay)
+
+        # Toplu gönderimde hedefin teslim ettiği işler başarılı sayılır
+        delivered, failed = [], []
+        for item in items:
+            (delivered if item[1] is not None and item[1].get(JOB_DELIVERED) else failed).append(item)
+        with self._lock:
+            self.delivered += len(delivered)
+            self.failed += len(failed)
+        print(f"[{self.name}] {len(failed)} bildirim {self.max_retries + 1} denemede gönderilemedi, vazgeçildi")
+        self._done(delivered, True)
+        self._done(failed, False)
+
+    def _done(self, items, ok):
+        if self.on_done is None:
+            return
+        for _, job in items:
+            if job is None:
+                continue
+            try:
+                self.on_done(job, ok)
+            except Exception as e:
+                print(f"[{self.name}] Bildirim durumu kaydedilemedi: {e}")
+
+    def metrics(self):
+        with self._lock:
+            return {
+                'queued': self._queue.qsize(),
+                'delivered': self.delivered,
+                'failed': self.failed,
+                'retried': self.retried,
+                'dropped': self.dropped,
+                'batches': self.batches,
+                'last_latency_ms': round(self.last_latency * 1000, 1) if self.last_latency is not None else None,
+                'avg_latency_ms': round(self.total_latency / self.delivered * 1000, 1) if self.delivered else None,
+                'max_latency_ms': round(self.max_latency * 1000, 1)
+            }
+
+
+class NotificationDispatcher:
+    def __init__(self, outbox=None, requeue_interval=60.0):
+        """
+        outbox: NotificationOutbox verilirse işler diske yazılır (en az bir kez teslim)
+        requeue_interval: Bekleyen işlerin tekrar kuyruğa alınma aralığı (sn)
+        """
+        self.sinks = {}
+        self.outbox = outbox
+        self.requeue_interval = requeue_interval
+        self._in_flight = {}    # {hedef adı: kuyrukta/gönderimde olan outbox kayıtları}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._requeue_thread = None
+
+    def add_sink(self, name, send, **kwargs):
+        """Yeni hedef ekle (kwargs SinkWorker'a iletilir)"""
+        if self.outbox is not None:
+            kwargs['on_done'] = lambda job, ok, name=name: self._on_done(name, job, ok)
+        self._in_flight[name] = set()
+        self.sinks[name] = SinkWorker(name, send, **kwargs)
+
+    def dispatch(self, message, key=None, **extra):
+        """
+        Mesajı tüm hedeflerin kuyruğuna ekle (beklemez)
+        key: Tekil anahtar; aynı anahtarlı bildirim bir hedefe bir kez gönderilir
+        """
+        if self.outbox is not None and key is None:
+            key = uuid.uuid4().hex
+        for name, worker in self.sinks.items():
+            job = {'message': message}
+            job.update(extra)
+            if self.outbox is not None:
+                outbox_id = self.outbox.add(key, name, job)
+                if outbox_id is None:
+                    print(f"[{name}] Bildirim daha önce gönderildi, atlandı ({key})")
+                    continue
+                job[OUTBOX_ID] = outbox_id
+                with self._lock:
+                    self._in_flight[name].add(outbox_id)
+            worker.submit(job)
+
+    def resume(self):
+        """Bekleyen (önceki çalışmadan kalan dahil) işleri kuyruğa alan thread'i başlat"""
+        if self.outbox is None or self._requeue_thread is not None:
+            return
+        self._requeue_thread = threading.Thread(target=self._requeue_loop, name="OutboxRequeue", daemon=True)
+        self._requeue_thread.start()
+
+    def _requeue_loop(self):
+        while not self._stop.is_set():
+            try:
+                self.requeue_pending()
+            except Exception as e:
+                print(f"Bekleyen bildirimler kuyruğa alınamadı: {e}")
+            self._stop.wait(self.requeue_interval)
+
+    def requeue_pending(self):
+        """
+        Diskte bekleyen ve kuyrukta olmayan işleri hedeflerine tekrar ver.
+        Süresi geçmiş / deneme sınırını aşmış kayıtlar önce bırakılır (loglanır).
+        """
+        self.outbox.expire()
+        for name, worker in self.sinks.items():
+            with self._lock:
+                in_flight = set(self._in_flight[name])
+            jobs = self.outbox.pending(name, exclude=in_flight)
+            if jobs:
+                print(f"[{name}] {len(jobs)} bekleyen bildirim tekrar kuyruğa alındı")
+            for job in jobs:
+                with self._lock:
+                    self._in_flight[name].add(job[OUTBOX_ID])
+                worker.submit(job)
+
+    def _on_done(self, name, job, ok):
+        outbox_id = job.get(OUTBOX_ID)
+        if outbox_id is None:
+            return
+        if ok:
+            self.outbox.mark_delivered(outbox_id)
+        else:
+            self.outbox.mark_failed(outbox_id, job)
+        with self._lock:
+            self._in_flight[name].discard(outbox_id)
+
+    def metrics(self):
+        """{hedef adı: metrikler}"""
+        pending = self.outbox.counts() if self.outbox is not None else {}
+        metrics = {}
+        for name, worker in self.sinks.items():
+            metrics[name] = worker.metrics()
+            if self.outbox is not None:
+                metrics[name]['outbox_pending'] = pending.get(name, 0)
+        return metrics
+
+    def stop(self):
+        self._stop.set()
+        for worker in self.sinks.values():
+            worker.stop()
+
+
+# Örnek kullanım:
+if __name__ == "__main__":
+    attempts = {'count': 0}
+
+    def flaky_sink(job):
+        """İlk denemede başarısız olan örnek hedef"""
+        attempts['count'] += 1
+        return attempts['count'] > 1
+
+    def slow_sink(job):
+        time.sleep(1)
+        return True
+
+    dispatcher = NotificationDispatcher()
+    dispatcher.add_sink("Kararsız", flaky_sink, backoff=0.1)
+    dispatcher.add_sink("Yavaş", slow_sink)
+
+    start = time.perf_counter()
+    dispatcher.dispatch("🚨 Test sinyali")
+    print(f"dispatch() {(time.perf_counter() - start) * 1000:.2f} ms sürdü")
+
+    time.sleep(1.5)
+    for name, metrics in dispatcher.metrics().items():
+        print(name, metrics)
+    dispatcher.stop()
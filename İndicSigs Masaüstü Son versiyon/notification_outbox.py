@@ -0,0 +1,214 @@
+"""
+Bildirim Giden Kutusu (Outbox) Modülü
+
+Dağıtıcıya verilen her bildirim, her hedef (Telegram, Backend, Next.js) için
+gönderilmeden önce SQLite veritabanına (WAL modu) yazılır ve ancak teslim
+edildiğinde 'delivered' olarak işaretlenir. Hedef o an erişilemiyorsa bildirim
+kaybolmaz: bekleyen kayıtlar belirli aralıklarla ve uygulama yeniden
+başlatıldığında tekrar kuyruğa alınır (en az bir kez teslim).
+
+Sinyaller zamana duyarlı olduğundan bekleyen kayıtlar sonsuza kadar denenmez:
+max_attempts kez teslim edilemeyen veya max_age'den eski kayıtlar 'expired'
+durumuna alınır, loglanır ve bir daha kuyruğa girmez (hedefin kalıcı olarak
+reddettiği bir bildirim de böylece sonsuz döngüye girmez).
+
+Her kaydın tekil bir anahtarı vardır (alarm + mum zamanı). Aynı anahtar aynı
+hedefe ikinci kez eklenemez; aynı sinyal tekrar tetiklense veya yeniden
+başlatma sonrası tekrar üretilse bile iki kez gönderilmez.
+
+İş sözlüğündeki 'signal' (signal_model.Signal) kaydedilirken sözlüğe çevrilir,
+okunurken tekrar Signal nesnesi olur. Hedefin tekrar denemeler arasında iş
+sözlüğüne yazdığı durum (ör. Telegram'da kalan chat_id'ler) de saklanır.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+
+from signal_model import Signal
+
+DEFAULT_DB_PATH = "outbox.db"
+
+STATUS_PENDING = "pending"
+STATUS_DELIVERED = "delivered"
+STATUS_EXPIRED = "expired"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    key TEXT NOT NULL,
+    sink TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    delivered_at REAL,
+    job TEXT NOT NULL,
+    UNIQUE (key, sink)
+);
+CREATE INDEX IF NOT EXISTS idx_outbox_pending ON outbox (sink, status);
+"""
+
+# Dağıtıcının iş sözlüğüne eklediği, kaydedilmeyen alanlar
+OUTBOX_ID = '_outbox_id'
+
+
+def _encode(job):
+    data = {}
+    for name, value in job.items():
+        if name == OUTBOX_ID:
+            continue
+        if name == 'signal' and value is not None:
+            value = value.to_dict()
+        elif isinstance(value, (set, frozenset, tuple)):
+            value = list(value)
+        data[name] = value
+    return json.dumps(data, ensure_ascii=False)
+
+
+def _decode(row):
+    job = json.loads(row['job'])
+    if job.get('signal') is not None:
+        job['signal'] = Signal.from_dict(job['signal'])
+    job[OUTBOX_ID] = row['id']
+    return job
+
+
+class NotificationOutbox:
+    def __init__(self, db_path=DEFAULT_DB_PATH, max_attempts=10, max_age=3600):
+        """
+        max_attempts: Bu kadar başarısız denemeden sonra kayıt 'expired' olur
+        max_age: Bu süreden (sn) eski bekleyen kayıtlar 'expired' olur
+        """
+        self.db_path = db_path
+        self.max_attempts = max_attempts
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+
+    def add(self, key, sink, job):
+        """
+        Bildirimi hedef için kaydet.
+        Dönüş: Kayıt numarası, aynı anahtar bu hedefe daha önce eklendiyse None
+        """
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "INSERT OR IGNORE INTO outbox (key, sink, created_at, job) VALUES (?, ?, ?, ?)",
+                (key, sink, time.time(), _encode(job))
+            )
+            return cursor.lastrowid if cursor.rowcount else None
+
+    def mark_delivered(self, outbox_id):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE outbox SET status = ?, delivered_at = ?, attempts = attempts + 1 WHERE id = ?",
+                (STATUS_DELIVERED, time.time(), outbox_id)
+            )
+
+    def mark_failed(self, outbox_id, job):
+        """
+        Teslim edilemedi: bekleyen olarak kalır, hedefin iş durumu saklanır.
+        Deneme sınırına ulaşıldıysa kayıt 'expired' olur.
+        """
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE outbox SET attempts = attempts + 1, job = ?, "
+                "status = CASE WHEN attempts + 1 >= ? THEN ? ELSE status END WHERE id = ?",
+                (_encode(job), self.max_attempts, STATUS_EXPIRED, outbox_id)
+            )
+            row = self._conn.execute("SELECT key, sink, attempts, status FROM outbox WHERE id = ?",
+                                     (outbox_id,)).fetchone()
+        if row is not None and row['status'] == STATUS_EXPIRED:
+            print(f"[{row['sink']}] Bildirim {row['attempts']} denemede teslim edilemedi, "
+                  f"bırakıldı ({row['key']})")
+
+    def expire(self):
+        """
+        Süresi geçmiş veya deneme sınırını aşmış bekleyen kayıtları 'expired' yap
+        Dönüş: Bırakılan kayıt sayısı
+        """
+        cutoff = time.time() - self.max_age
+        with self._lock, self._conn:
+            rows = self._conn.execute(
+                "SELECT id, key, sink, attempts, created_at FROM outbox "
+                "WHERE status = ? AND (attempts >= ? OR created_at < ?)",
+                (STATUS_PENDING, self.max_attempts, cutoff)
+            ).fetchall()
+            self._conn.executemany("UPDATE outbox SET status = ? WHERE id = ?",
+                                   [(STATUS_EXPIRED, row['id']) for row in rows])
+        for row in rows:
+            age_min = (time.time() - row['created_at']) / 60
+            print(f"[{row['sink']}] Bildirim bırakıldı ({row['key']}): "
+                  f"{row['attempts']} deneme, {age_min:.0f} dk önce oluşturuldu")
+        return len(rows)
+
+    def pending(self, sink, exclude=()):
+        """
+        Hedef için bekleyen işler (eskiden yeniye), exclude: zaten kuyrukta olan kayıtlar.
+        Süresi geçmiş veya deneme sınırını aşmış kayıtlar dönmez.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, job FROM outbox WHERE sink = ? AND status = ? AND attempts < ? "
+                "AND created_at >= ? ORDER BY id",
+                (sink, STATUS_PENDING, self.max_attempts, time.time() - self.max_age)
+            ).fetchall()
+        return [_decode(row) for row in rows if row['id'] not in exclude]
+
+    def purge(self, max_age=7 * 24 * 3600):
+        """Teslim edilmiş veya bırakılmış eski kayıtları sil, silinen kayıt sayısını döndür"""
+        cutoff = time.time() - max_age
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "DELETE FROM outbox WHERE (status = ? AND delivered_at < ?) OR (status = ? AND created_at < ?)",
+                (STATUS_DELIVERED, cutoff, STATUS_EXPIRED, cutoff)
+            )
+            return cursor.rowcount
+
+    def counts(self):
+        """{hedef: bekleyen kayıt sayısı}"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT sink, COUNT(*) FROM outbox WHERE status = ? GROUP BY sink", (STATUS_PENDING,)
+            ).fetchall()
+        return {sink: count for sink, count in rows}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+# Örnek kullanım:
+if __name__ == "__main__":
+    import os
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as tmp:
+        outbox = NotificationOutbox(os.path.join(tmp, "outbox.db"))
+        signal = Signal("Test", "BTCUSDT", 97000.0, 2, "İndicPro", "Ana Çizgi", "Üstüne Çıktığında", "60",
+                        timeframes=[("15m", 65.2)], alarm_id=1, candle_time=1700000000000)
+
+        first = outbox.add(signal.key, "Telegram", {'message': "🚨 Test", 'signal': signal})
+        second = outbox.add(signal.key, "Telegram", {'message': "🚨 Test", 'signal': signal})
+        print("İlk ekleme:", first, "- aynı anahtarla ikinci ekleme:", second)
+
+        job = outbox.pending("Telegram")[0]
+        job['chat_ids'] = {"-1001"}
+        outbox.mark_failed(job[OUTBOX_ID], job)
+        print("Bekleyen:", outbox.counts(), "- kalan gruplar:", outbox.pending("Telegram")[0]['chat_ids'])
+
+        outbox.mark_delivered(job[OUTBOX_ID])
+        print("Teslim sonrası bekleyen:", outbox.counts())
+
+        # Hedefin sürekli reddettiği bildirim deneme sınırında bırakılır
+        outbox.max_attempts = 3
+        outbox.add("rejected@1", "Telegram", {'message': "🚨 Reddedilen"})
+        for _ in range(3):
+            job = outbox.pending("Telegram")[0]
+            outbox.mark_failed(job[OUTBOX_ID], job)
+        print("Bırakılan kayıttan sonra bekleyen:", outbox.counts(), outbox.pending("Telegram"))
+        outbox.close()
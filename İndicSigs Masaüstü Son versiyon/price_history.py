@@ -0,0 +1,209 @@
+"""
+Fiyat Geçmişi Modülü
+
+Bir sembolün dakikalık fiyatlarını sabit boyutlu bir halka tamponda (NumPy)
+tutar. Her dakika, dakika numarasına (epoch dakikası) göre tek bir hücreye
+yazılır; bir dakikanın fiyatına erişmek dizide tek bir okumadır (O(1)) ve
+eskiyen kayıtlar ayrıca temizlenmez, yeni dakikalar üzerine yazar.
+
+Kalıcılık için ikili bir dosyaya sadece ekleme yapılır: her dakika kapandığında
+(dakika numarası, fiyat) çifti 16 bayt olarak yazılır. Dosya tampon boyutunun
+iki katını aşınca son kayıtlarla yeniden yazılır. Eski btc_prices.json dosyası
+varsa ilk açılışta bir kez içe aktarılır.
+"""
+
+import json
+import os
+import threading
+import time
+from datetime import datetime
+
+import numpy as np
+
+MINUTE_MS = 60_000
+
+RECORD_DTYPE = np.dtype([('minute', '<i8'), ('price', '<f8')])
+
+
+def current_minute():
+    """Şu anki epoch dakikası"""
+    return int(time.time() // 60)
+
+
+class PriceHistory:
+    def __init__(self, path=None, capacity=1440, legacy_json=None):
+        """
+        path: Kayıt dosyası (None ise sadece bellekte tutulur)
+        capacity: Tutulacak dakika sayısı (varsayılan 1 gün)
+        legacy_json: İlk açılışta içe aktarılacak {iso zaman: fiyat} JSON dosyası
+        """
+        self.path = path
+        self.capacity = capacity
+        self._minutes = np.full(capacity, -1, dtype=np.int64)
+        self._prices = np.full(capacity, np.nan)
+        self._lock = threading.Lock()
+        self._last_minute = None     # En son yazılan dakika (henüz dosyaya yazılmamış olabilir)
+        self._file_records = 0
+
+        if path and os.path.exists(path):
+            self._load()
+        elif legacy_json and os.path.exists(legacy_json):
+            self._import_json(legacy_json)
+
+    # ------------------------------------------------------------------
+    # Yükleme
+    # ------------------------------------------------------------------
+    def _load(self):
+        try:
+            records = np.fromfile(self.path, dtype=RECORD_DTYPE)
+        except (OSError, ValueError) as e:
+            print(f"Fiyat geçmişi okunamadı ({self.path}): {e}")
+            return
+        self._file_records = len(records)
+        self._apply(records['minute'], records['price'])
+
+    def _import_json(self, json_path):
+        try:
+            with open(json_path, "r") as f:
+                saved_prices = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"{json_path} içe aktarılamadı: {e}")
+            return
+        items = sorted((int(datetime.fromisoformat(k).timestamp() // 60), float(v)) for k, v in saved_prices.items())
+        if not items:
+            return
+        minutes, prices = (np.array(column) for column in zip(*items))
+        self._apply(minutes, prices)
+        self._rewrite()
+        print(f"{len(items)} fiyat {json_path} dosyasından içe aktarıldı")
+
+    def _apply(self, minutes, prices):
+        """Kayıtları sırayla tampona yaz (aynı hücreye düşenlerde sonuncusu kalır)"""
+        if len(minutes) == 0:
+            return
+        minutes = minutes[-self.capacity:]
+        prices = prices[-self.capacity:]
+        slots = minutes % self.capacity
+        self._minutes[slots] = minutes
+        self._prices[slots] = prices
+        self._last_minute = int(minutes.max())
+
+    # ------------------------------------------------------------------
+    # Yazma
+    # ------------------------------------------------------------------
+    def record(self, price, minute=None):
+        """
+        Dakikanın fiyatını kaydet (aynı dakikada tekrar çağrılırsa güncellenir).
+        Yeni bir dakikaya geçildiğinde önceki dakikanın son fiyatı dosyaya eklenir.
+        """
+        if minute is None:
+            minute = current_minute()
+        with self._lock:
+            previous = self._last_minute
+            if previous is not None and minute < previous:
+                return
+            if previous is not None and minute != previous:
+                self._append(previous)
+            slot = minute % self.capacity
+            self._minutes[slot] = minute
+            self._prices[slot] = price
+            self._last_minute = minute
+
+    def flush(self):
+        """Son dakikayı da dosyaya yaz (kapanışta)"""
+        with self._lock:
+            if self._last_minute is not None:
+                self._append(self._last_minute)
+
+    def _append(self, minute):
+        if not self.path:
+            return
+        slot = minute % self.capacity
+        if self._minutes[slot] != minute:
+            return
+        record = np.array([(minute, self._prices[slot])], dtype=RECORD_DTYPE)
+        try:
+            if self._file_records >= 2 * self.capacity:
+                self._rewrite()
+                return
+            with open(self.path, "ab") as f:
+                record.tofile(f)
+            self._file_records += 1
+        except OSError as e:
+            print(f"Fiyat geçmişi yazılamadı ({self.path}): {e}")
+
+    def _rewrite(self):
+        """Dosyayı tampondaki kayıtlarla yeniden yaz"""
+        if not self.path:
+            return
+        minutes, prices = self._series()
+        records = np.empty(len(minutes), dtype=RECORD_DTYPE)
+        records['minute'] = minutes
+        records['price'] = prices
+        tmp_path = self.path + ".tmp"
+        try:
+            records.tofile(tmp_path)
+            os.replace(tmp_path, self.path)
+            self._file_records = len(records)
+        except OSError as e:
+            print(f"Fiyat geçmişi yazılamadı ({self.path}): {e}")
+
+    # ------------------------------------------------------------------
+    # Okuma
+    # ------------------------------------------------------------------
+    def price_at(self, minute, max_gap=0):
+        """
+        Dakikanın fiyatı; kayıt yoksa en fazla max_gap dakika öncesine bakılır.
+        Bulunamazsa None
+        """
+        with self._lock:
+            for offset in range(max_gap + 1):
+                m = minute - offset
+                slot = m % self.capacity
+                if self._minutes[slot] == m:
+                    return float(self._prices[slot])
+        return None
+
+    def latest(self):
+        """(dakika, fiyat) veya None"""
+        with self._lock:
+            if self._last_minute is None:
+                return None
+            slot = self._last_minute % self.capacity
+            return self._last_minute, float(self._prices[slot])
+
+    def _series(self):
+        valid = self._minutes >= 0
+        minutes = self._minutes[valid]
+        order = np.argsort(minutes)
+        return minutes[order], self._prices[valid][order]
+
+    def series(self):
+        """Kayıtlı dakikaların açılış zamanları (ms) ve fiyatları, eskiden yeniye"""
+        with self._lock:
+            minutes, prices = self._series()
+        return minutes * MINUTE_MS, prices
+
+    def __len__(self):
+        return int((self._minutes >= 0).sum())
+
+
+# Örnek kullanım:
+if __name__ == "__main__":
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "btc_prices.bin")
+        history = PriceHistory(path, capacity=60)
+
+        start = current_minute() - 90
+        for i in range(90):
+            for tick in range(3):   # Aynı dakikada birden fazla güncelleme
+                history.record(97000 + i + tick * 0.1, start + i)
+        history.flush()
+
+        reopened = PriceHistory(path, capacity=60)
+        print("Kayıtlı dakika:", len(reopened), "- dosya boyutu:", os.path.getsize(path), "bayt")
+        print("Son fiyat:", reopened.latest())
+        print("15 dk önce:", reopened.price_at(start + 89 - 15))
+        print("Tampondan çıkmış dakika:", reopened.price_at(start))
@@ -0,0 +1,346 @@
+"""
+Borsa İstek Zamanlayıcısı
+
+Binance'e giden tüm REST istekleri (alarm verisi, 5m/1m onay verisi, kart
+güncellemeleri, piyasa sıralaması) tek bir ağırlık bütçesinden geçer. Binance
+her IP için dakikalık bir istek ağırlığı limiti uygular; limit aşılırsa 429,
+aşılmaya devam edilirse 418 (IP yasağı) döner.
+
+- Her istekten önce ağırlığı kadar bütçe ayrılır; dakika değişince bütçe
+  sıfırlanır. Yanıtlardaki X-MBX-USED-WEIGHT-1M başlığı gerçek kullanımı
+  bildirir, tahmin bununla düzeltilir.
+- İstekler önceliğe göre sıraya girer: alarm > onay zaman dilimleri > kartlar
+  > piyasa verisi. Düşük öncelikler bütçenin daha küçük bir kısmını
+  kullanabilir; bütçe daraldığında önce kart ve piyasa istekleri ertelenir
+  (RequestDeferred), alarm istekleri beklemeye devam eder.
+- 429/418 alınırsa Retry-After süresi (yoksa artan bekleme) boyunca hiçbir
+  istek gönderilmez.
+
+Öncelik, çağıran thread için priority() / bind() ile belirlenir.
+
+Ağırlık ve Retry-After, isteğin kendi yanıt başlıklarından okunur: ccxt'nin
+last_response_headers alanı borsa nesnesini kullanan tüm thread ve görevler
+arasında ortaktır, eşzamanlı isteklerde başka bir yanıta ait olabilir.
+track_response_headers() borsanın on_rest_response kancasını sararak her
+yanıtın başlıklarını o isteği yapan thread'in / asyncio görevinin bağlamına
+(contextvars) yazar; response_headers() bunu döndürür.
+"""
+
+import contextvars
+import heapq
+import itertools
+import re
+import threading
+import time
+from contextlib import contextmanager
+
+PRIORITY_ALARM = 0
+PRIORITY_CONFIRM = 1
+PRIORITY_CARD = 2
+PRIORITY_MARKET = 3
+
+PRIORITY_NAMES = {
+    PRIORITY_ALARM: 'alarm',
+    PRIORITY_CONFIRM: 'onay',
+    PRIORITY_CARD: 'kart',
+    PRIORITY_MARKET: 'piyasa'
+}
+
+# Önceliğin kullanabileceği en fazla bütçe oranı
+DEFAULT_SHARES = {
+    PRIORITY_ALARM: 0.95,
+    PRIORITY_CONFIRM: 0.85,
+    PRIORITY_CARD: 0.70,
+    PRIORITY_MARKET: 0.60
+}
+
+# Bütçe dolduğunda en fazla bekleme süresi (sn), None: süresiz bekler
+DEFAULT_TIMEOUTS = {
+    PRIORITY_ALARM: None,
+    PRIORITY_CONFIRM: 10,
+    PRIORITY_CARD: 0,
+    PRIORITY_MARKET: 0
+}
+
+# Binance spot istek ağırlıkları
+KLINES_WEIGHT = 2
+TICKERS_WEIGHT = 80
+TIME_WEIGHT = 1
+
+USED_WEIGHT_HEADERS = ('x-mbx-used-weight-1m', 'x-mbx-used-weight')
+
+RATE_LIMIT_PATTERN = re.compile(r'\b(418|429)\b')
+
+# Bu thread'in / asyncio görevinin son yanıt başlıkları
+_response_headers = contextvars.ContextVar('response_headers', default=None)
+
+
+class RequestDeferred(Exception):
+    """Ağırlık bütçesi dolu, düşük öncelikli istek ertelendi"""
+
+
+def header_value(headers, names):
+    """Büyük/küçük harf duyarsız başlık değeri, yoksa None"""
+    if not headers:
+        return None
+    for key, value in headers.items():
+        if key.lower() in names:
+            return value
+    return None
+
+
+def track_response_headers(exchange):
+    """
+    ccxt borsa nesnesinin (senkron veya async_support) yanıt kancasını sar;
+    her yanıtın başlıkları isteği yapan thread'in / görevin bağlamına yazılır.
+    Kancası olmayan nesneler değiştirilmez.
+    """
+    original = getattr(exchange, 'on_rest_response', None)
+    if original is None or getattr(original, 'tracks_headers', False):
+        return exchange
+
+    def on_rest_response(code, reason, url, method, response_headers, *args, **kwargs):
+        _response_headers.set(response_headers)
+        return original(code, reason, url, method, response_headers, *args, **kwargs)
+
+    on_rest_response.tracks_headers = True
+    exchange.on_rest_response = on_rest_response
+    return exchange
+
+
+def response_headers():
+    """Bu thread'in / görevin son yanıt başlıkları (track_response_headers ile), yoksa None"""
+    return _response_headers.get()
+
+
+def reset_response_headers():
+    """Yeni istekten önce önceki yanıtın başlıklarını unut"""
+    _response_headers.set(None)
+
+
+class RequestScheduler:
+    def __init__(self, weight_limit=6000, shares=None, timeouts=None, default_backoff=60, max_backoff=900):
+        """
+        weight_limit: Dakikalık ağırlık limiti (Binance spot: 6000)
+        shares: {öncelik: kullanılabilecek bütçe oranı}
+        timeouts: {öncelik: bütçe için en fazla bekleme (sn)}
+        default_backoff: Retry-After gelmezse ilk bekleme süresi (sn), 418'de katlanarak artar
+        """
+        self.weight_limit = weight_limit
+        self.shares = dict(DEFAULT_SHARES)
+        if shares:
+            self.shares.update(shares)
+        self.timeouts = dict(DEFAULT_TIMEOUTS)
+        if timeouts:
+            self.timeouts.update(timeouts)
+        self.default_backoff = default_backoff
+        self.max_backoff = max_backoff
+
+        self._cond = threading.Condition()
+        self._waiting = []              # [(öncelik, sıra)] yığını
+        self._sequence = itertools.count()
+        self._window = None             # Bütçenin ait olduğu dakika
+        self._local = threading.local()
+        self._backoff = default_backoff
+
+        self.used_weight = 0
+        self.banned_until = 0.0
+
+        # İzleme için
+        self.requests = 0
+        self.deferred = 0
+        self.rate_limited = 0
+
+    # ------------------------------------------------------------------
+    # Öncelik
+    # ------------------------------------------------------------------
+    def current_priority(self):
+        """Çağıran thread'in önceliği (belirlenmemişse kart önceliği)"""
+        return getattr(self._local, 'priority', PRIORITY_CARD)
+
+    @contextmanager
+    def priority(self, priority):
+        """Blok içindeki isteklerin önceliğini belirle"""
+        previous = getattr(self._local, 'priority', None)
+        self._local.priority = priority
+        try:
+            yield
+        finally:
+            if previous is None:
+                del self._local.priority
+            else:
+                self._local.priority = previous
+
+    def bind(self, priority, fn):
+        """fn'i verilen öncelikle çalıştıran fonksiyon (arka plan döngüleri için)"""
+        def run():
+            with self.priority(priority):
+                return fn()
+        return run
+
+    # ------------------------------------------------------------------
+    # Bütçe
+    # ------------------------------------------------------------------
+    def _roll(self, now):
+        minute = int(now // 60)
+        if minute != self._window:
+            self._window = minute
+            self.used_weight = 0
+
+    def _ceiling(self, priority):
+        return self.weight_limit * self.shares.get(priority, min(self.shares.values()))
+
+    def acquire(self, weight=1, priority=None, timeout=-1):
+        """
+        İstek için bütçe ayır; daha yüksek öncelikli bekleyen varsa sıra onundur,
+        aynı öncelikteki istekler birbirini beklemez.
+        timeout: -1 ise önceliğin varsayılan süresi kullanılır
+        Bütçe süre içinde açılmazsa RequestDeferred
+        """
+        if priority is None:
+            priority = self.current_priority()
+        if timeout == -1:
+            timeout = self.timeouts.get(priority)
+        deadline = None if timeout is None else time.time() + timeout
+
+        ticket = (priority, next(self._sequence))
+        with self._cond:
+            heapq.heappush(self._waiting, ticket)
+            try:
+                while True:
+                    now = time.time()
+                    self._roll(now)
+                    ready = (self._waiting[0][0] == priority and now >= self.banned_until
+                             and self.used_weight + weight <= self._ceiling(priority))
+                    if ready:
+                        break
+                    # Yasak bitene, dakika dolana veya sıra değişene kadar bekle
+                    wait = max(self.banned_until - now, 0) or (self._window + 1) * 60 - now
+                    if deadline is not None:
+                        if now >= deadline:
+                            self.deferred += 1
+                            raise RequestDeferred(
+                                f"Ağırlık bütçesi dolu ({self.used_weight}/{self.weight_limit}), "
+                                f"{PRIORITY_NAMES.get(priority, priority)} isteği ertelendi")
+                        wait = min(wait, deadline - now)
+                    self._cond.wait(max(wait, 0.01))
+                self.used_weight += weight
+                self.requests += 1
+            finally:
+                self._waiting.remove(ticket)
+                heapq.heapify(self._waiting)
+                self._cond.notify_all()
+
+    def update_from_headers(self, headers):
+        """Yanıt başlığındaki gerçek ağırlık kullanımıyla tahmini düzelt"""
+        value = header_value(headers, USED_WEIGHT_HEADERS)
+        if value is None:
+            return
+        try:
+            used = int(value)
+        except (TypeError, ValueError):
+            return
+        with self._cond:
+            self._roll(time.time())
+            self.used_weight = max(self.used_weight, used)
+            self._backoff = self.default_backoff
+
+    def on_rate_limited(self, status, retry_after=None):
+        """429/418 alındı: süre boyunca tüm istekleri durdur"""
+        with self._cond:
+            if retry_after is None:
+                retry_after = self._backoff
+                if status == 418:
+                    # Yasak sürdükçe bekleme katlanır
+                    self._backoff = min(self._backoff * 2, self.max_backoff)
+            self.banned_until = max(self.banned_until, time.time() + retry_after)
+            self.rate_limited += 1
+        print(f"Binance {status} döndü, istekler {retry_after:.0f} sn durduruldu")
+
+    def check_error(self, error, headers=None):
+        """İstek hatası 429/418 ise bekleme başlat"""
+        name = type(error).__name__
+        match = RATE_LIMIT_PATTERN.search(str(error))
+        if not match and name not in ('RateLimitExceeded', 'DDoSProtection'):
+            return
+        status = int(match.group(1)) if match else 429
+        retry_after = header_value(headers, ('retry-after',))
+        try:
+            retry_after = float(retry_after) if retry_after is not None else None
+        except ValueError:
+            retry_after = None
+        self.on_rate_limited(status, retry_after)
+
+    def call(self, fn, *args, weight=1, priority=None, timeout=-1, headers=None, **kwargs):
+        """
+        Bütçe ayırıp fn(*args, **kwargs) çağır.
+        Başlıklar bu isteğin yanıtından alınır (borsa track_response_headers ile
+        sarılmışsa). headers: Kanca yoksa kullanılan yedek; son yanıtın başlıklarını
+        döndüren fonksiyon (ccxt last_response_headers). Ortak alan olduğundan
+        eşzamanlı isteklerde başka yanıta ait olabilir, en iyi çaba tahminidir.
+        """
+        self.acquire(weight, priority, timeout)
+        reset_response_headers()
+        try:
+            result = fn(*args, **kwargs)
+        except Exception as e:
+            self.check_error(e, self._headers(headers))
+            raise
+        self.update_from_headers(self._headers(headers))
+        return result
+
+    @staticmethod
+    def _headers(fallback):
+        own = response_headers()
+        if own is not None:
+            return own
+        return fallback() if fallback else None
+
+    def metrics(self):
+        """{'used_weight', 'weight_limit', 'usage', 'queue_depth', 'banned_for', 'requests', 'deferred', 'rate_limited'}"""
+        with self._cond:
+            now = time.time()
+            self._roll(now)
+            depth = {name: 0 for name in PRIORITY_NAMES.values()}
+            for priority, _ in self._waiting:
+                name = PRIORITY_NAMES.get(priority, str(priority))
+                depth[name] = depth.get(name, 0) + 1
+            return {
+                'used_weight': self.used_weight,
+                'weight_limit': self.weight_limit,
+                'usage': round(self.used_weight / self.weight_limit, 3),
+                'queue_depth': depth,
+                'banned_for': round(max(self.banned_until - now, 0), 1),
+                'requests': self.requests,
+                'deferred': self.deferred,
+                'rate_limited': self.rate_limited
+            }
+
+
+# Örnek kullanım:
+if __name__ == "__main__":
+    scheduler = RequestScheduler(weight_limit=100, timeouts={PRIORITY_CARD: 2})
+    order = []
+
+    def worker(priority, count):
+        with scheduler.priority(priority):
+            for _ in range(count):
+                try:
+                    scheduler.call(lambda: order.append(PRIORITY_NAMES[priority]), weight=KLINES_WEIGHT)
+                except RequestDeferred:
+                    order.append(f"{PRIORITY_NAMES[priority]} (ertelendi)")
+
+    # 429 sonrası bekleme sırasında tüm istekler kuyruğa girer
+    scheduler.check_error(Exception("binance 429 Too Many Requests"), {'Retry-After': '1'})
+    threads = [threading.Thread(target=worker, args=(p, 20), daemon=True)
+               for p in (PRIORITY_MARKET, PRIORITY_CARD, PRIORITY_ALARM)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.2)
+    print("Bekleme sırasında:", scheduler.metrics()['queue_depth'])
+    for thread in threads:
+        thread.join(5)
+
+    print("Gönderilen:", {name: order.count(name) for name in PRIORITY_NAMES.values()},
+          "- ertelenen:", scheduler.deferred)
+    print(scheduler.metrics())
@@ -0,0 +1,243 @@
+"""
+Sinyal Modeli Modülü
+
+Tetiklenen bir alarmın bilgileri (coin, fiyat, indikatör, koşul, hedef,
+24 saatlik performans, zaman dilimi değerleri...) tetiklenme anında bir kez
+Signal nesnesine yazılır. Her hedef kendi formatını bu nesneden üretir:
+    - Telegram / uygulama içi bildirim: to_telegram_text()
+    - Backend API (/api/notifications): to_backend_payload()
+    - Next.js (/api/signals): to_nextjs_payload()
+Böylece Next.js tarafı için hazır metni regex ile geri ayrıştırmaya gerek
+kalmaz ve ayrıştırma hatası yüzünden sinyal kaybolmaz.
+"""
+
+import time
+
+LONG = "LONG"
+SHORT = "SHORT"
+NEUTRAL = "NÖTR"
+
+# Seviye eşikleri (en güçlüden zayıfa): (eşik, ok sayısı)
+SIGNAL_LEVELS = ((80, 3), (70, 2), (60, 1))
+
+
+def signal_level(value):
+    """İndikatör değerinin yönü ve gücü: (LONG/SHORT/None, 0-3)"""
+    for threshold, count in SIGNAL_LEVELS:
+        if value <= -threshold:
+            return LONG, count
+        if value >= threshold:
+            return SHORT, count
+    return None, 0
+
+
+def format_signal_level(value):
+    """Zaman dilimi satırındaki işaret, örn. ' 🟢 🟢 - - 2 LONG'"""
+    direction, count = signal_level(value)
+    if direction is None:
+        return ""
+    emoji = "🟢" if direction == LONG else "🔴"
+    return " " + " ".join([emoji] * count) + f" - - {count} {direction}"
+
+
+def format_market_position(position):
+    """get_coin_market_position sonucunu '24 Saatlik Performans' metnine çevirir"""
+    if not position:
+        return ""
+
+    change_24h = position['change_24h']
+    gainer_rank = position['gainer_rank']
+    loser_rank = position['loser_rank']
+
+    # Değişim yönü emoji
+    if change_24h > 0:
+        change_emoji = "📈"
+        change_text = f"+{change_24h:.2f}%"
+    elif change_24h < 0:
+        change_emoji = "📉"
+        change_text = f"{change_24h:.2f}%"
+    else:
+        change_emoji = "➡️"
+        change_text = "0.00%"
+
+    text = f"📊 24 Saatlik Performans:\n"
+    text += f"{change_emoji} Değişim: {change_text}\n"
+
+    # Eğer en çok yükselenler listesindeyse
+    if gainer_rank and gainer_rank <= 50:
+        text += f"🏆 En Çok Yükselenler: {gainer_rank}. sırada\n"
+
+    # Eğer en çok düşenler listesindeyse
+    if loser_rank and loser_rank <= 50:
+        text += f"📉 En Çok Düşenler: {loser_rank}. sırada\n"
+
+    # Orta bölgedeyse
+    if (not gainer_rank or gainer_rank > 50) and (not loser_rank or loser_rank > 50):
+        text += f"⚖️ Dengeli bölgede (Normal performans)\n"
+
+    return text
+
+
+class Signal:
+    def __init__(self, name, coin, price, decimals, indicator, detail, condition, target,
+                 direction=NEUTRAL, timeframes=None, market_position=None, note="",
+                 btc_report="", btc_changes=None, timestamp=None, alarm_id=None, candle_time=None):
+        """
+        name: Alarm adı (mesaj başlığı)
+        price: Bildirilen fiyat, decimals: gösterilecek ondalık basamak
+        target: Alarmın hedef değeri (alarm['value'], metin olarak saklanır)
+        direction: Ana zaman dilimindeki yön (LONG/SHORT/NÖTR)
+        timeframes: [(zaman dilimi, indikatör değeri), ...] mesajdaki sırayla
+        market_position: get_coin_market_position sonucu veya None
+        btc_report: BTC analiz metni (gönderim öncesi eklenir)
+        btc_changes: BTC yüzde değişimleri {zaman dilimi: %} (gönderim öncesi eklenir)
+        timestamp: Tetiklenme zamanı (ms)
+        alarm_id, candle_time: Tetikleyen alarm ve mum (ms); birlikte sinyalin tekil anahtarıdır
+        """
+        self.name = name
+        self.coin = coin
+        self.price = price
+        self.decimals = decimals
+        self.indicator = indicator
+        self.detail = detail
+        self.condition = condition
+        self.target = target
+        self.direction = direction
+        self.timeframes = timeframes or []
+        self.market_position = market_position
+        self.note = note or ""
+        self.btc_report = btc_report
+        self.btc_changes = btc_changes
+        self.timestamp = timestamp if timestamp is not None else int(time.time() * 1000)
+        self.alarm_id = alarm_id
+        self.candle_time = candle_time
+
+    @classmethod
+    def from_alarm(cls, alarm, price, decimals, **kwargs):
+        kwargs.setdefault('alarm_id', alarm.get('row_id', alarm.get('id')))
+        return cls(alarm['name'], alarm['coin'], price, decimals, alarm['indicator'], alarm['detail'],
+                   alarm['condition'], alarm['value'], note=alarm.get('message', ''), **kwargs)
+
+    def to_dict(self):
+        """JSON'a yazılabilir sözlük (bildirim kuyruğunda saklamak için)"""
+        data = dict(vars(self))
+        data['timeframes'] = [list(item) for item in self.timeframes]
+        return data
+
+    @classmethod
+    def from_dict(cls, data):
+        data = dict(data)
+        data['timeframes'] = [tuple(item) for item in data.get('timeframes', [])]
+        return cls(**data)
+
+    @property
+    def key(self):
+        """Tekil anahtar: aynı alarm aynı mumda bir kez bildirilir"""
+        if self.alarm_id is None:
+            return None
+        return f"{self.alarm_id}@{self.candle_time if self.candle_time is not None else self.timestamp}"
+
+    # ------------------------------------------------------------------
+    # Türetilen alanlar
+    # ------------------------------------------------------------------
+    @property
+    def target_value(self):
+        try:
+            return float(self.target)
+        except (TypeError, ValueError):
+            return None
+
+    @property
+    def signal_type(self):
+        """Next.js sinyal tipi: zaman dilimlerindeki yön, yoksa koşula göre"""
+        directions = {signal_level(value)[0] for _, value in self.timeframes}
+        if SHORT in directions:
+            return SHORT
+        if LONG in directions:
+            return LONG
+        condition = (self.condition or "").lower()
+        if 'üstüne' in condition or 'yukarı' in condition:
+            return LONG
+        if 'altına' in condition or 'aşağı' in condition:
+            return SHORT
+        return "ALERT"
+
+    # ------------------------------------------------------------------
+    # Hedef formatları
+    # ------------------------------------------------------------------
+    def to_telegram_text(self, include_btc=True):
+        """Telegram (HTML) ve uygulama içi bildirim metni"""
+        text = f"🚨 {self.name}\n\n"
+        text += f"💰 Coin: {self.coin}\n"
+        text += f"💵 Fiyat: {self.price:.{self.decimals}f} USDT\n"
+        text += f"📊 İndikatör: {self.indicator} ({self.detail})\n"
+        text += f"📈 Koşul: {self.condition}\n"
+        text += f"🎯 Hedef: {self.target}\n\n"
+
+        market_position_text = format_market_position(self.market_position)
+        if market_position_text:
+            text += market_position_text + "\n"
+
+        text += f"⏱ Zaman Dilimleri:\n"
+        for timeframe, value in self.timeframes:
+            text += f"   • {timeframe}: {value:.2f}{format_signal_level(value)}\n"
+
+        # BTC raporu zaman dilimleri ile not arasında yer alır
+        if include_btc and self.btc_report:
+            text += "\n" + self.btc_report + "\n"
+
+        if self.note:
+            text += f"\n📝 Not: {self.note}"
+        return text
+
+    def to_backend_payload(self, user_id):
+        """Backend /api/notifications gövdesi"""
+        return {
+            "type": "SIGNAL",
+            "userId": user_id,
+            "status": "TETİKLENDİ",
+            "messageContent": self.to_telegram_text()  # Telegram'a gönderilen mesajın aynısı
+        }
+
+    def to_nextjs_payload(self):
+        """Next.js /api/signals gövdesi"""
+        metadata = {
+            'source': 'indicsigs_desktop',
+            'indicator': f"{self.indicator} ({self.detail})",
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(self.timestamp / 1000))
+        }
+        if self.condition:
+            metadata['condition'] = self.condition
+        if self.target_value is not None:
+            metadata['target'] = self.target_value
+        if self.market_position:
+            metadata['change_24h'] = round(self.market_position['change_24h'], 2)
+        if self.timeframes:
+            metadata['timeframes'] = {timeframe: round(value, 2) for timeframe, value in self.timeframes}
+        if self.btc_changes:
+            metadata['btc_changes'] = {timeframe: round(value, 2) for timeframe, value in self.btc_changes.items()}
+
+        return {
+            'symbol': self.coin.upper(),
+            'signalType': self.signal_type,
+            'price': round(self.price, self.decimals),
+            'timestamp': self.timestamp,
+            'metadata': metadata
+        }
+
+
+# Örnek kullanım:
+if __name__ == "__main__":
+    import json
+
+    signal = Signal(
+        "TETİKLENDİ_ETHUSDT", "ETHUSDT", 3961.638, 3, "İndicPro", "Ana Çizgi", "Üstüne Çıktığında", "75.6",
+        direction=SHORT,
+        timeframes=[("15m", 78.16), ("5m", 86.71), ("1m", 66.52)],
+        market_position={'change_24h': 3.02, 'gainer_rank': 12, 'loser_rank': None},
+        btc_report="💲 Fiyat: 97,000.00 USDT",
+        note="Test"
+    )
+    print(signal.to_telegram_text())
+    print()
+    print(json.dumps(signal.to_nextjs_payload(), indent=2, ensure_ascii=False))
@@ -0,0 +1,415 @@
+"""
+Akan (Streaming) İndikatör Modülü
+
+WaveTrend, MACD DEMA, Bollinger Bands ve Volume Weighted MACD göstergelerinin
+durum tutan (stateful) sürümleri. Her seri için EMA özyinelemeleri, kayan
+pencere toplamları ve WT2'nin 4 mumluk penceresi saklanır; yeni bir mum
+geldiğinde 100 mumluk zincirin tamamı yeniden hesaplanmaz, sabit sürede güncellenir.
+
+Mum yaşam döngüsü:
+    tick(bar)   -> Oluşmakta olan mumla değerleri hesaplar, durumu değiştirmez
+    close(bar)  -> Kapanan mumu duruma işler
+    rollback()  -> Oluşmakta olan mumu yok sayar, değerler son kapanmış muma döner
+
+bar: [timestamp, open, high, low, close, volume] (fetch_ohlcv formatı)
+
+Varsayılan parametreler main.py'deki calculate_* fonksiyonlarıyla aynı sonucu
+verir; indicators.py varyantları için adjust=True (WaveTrend) ve
+dema_signal=False (MACD) kullanılabilir.
+"""
+
+import math
+from collections import deque
+
+import numpy as np
+
+NAN = float('nan')
+
+
+class EMAState:
+    """pandas .ewm(...).mean() özyinelemesinin tek adımlık karşılığı"""
+
+    def __init__(self, span=None, alpha=None, adjust=False):
+        self.alpha = alpha if alpha is not None else 2.0 / (span + 1.0)
+        self.adjust = adjust
+        self.value = NAN
+        self.old_wt = 1.0
+
+    def _step(self, x):
+        value, old_wt = self.value, self.old_wt
+        if math.isnan(value):
+            # Seri henüz başlamadı, ilk geçerli değer başlangıç olur
+            return (value, old_wt) if math.isnan(x) else (x, 1.0)
+
+        old_wt *= 1.0 - self.alpha
+        if math.isnan(x):
+            return value, old_wt
+
+        new_wt = 1.0 if self.adjust else self.alpha
+        if value != x:
+            value = (old_wt * value + new_wt * x) / (old_wt + new_wt)
+        old_wt = old_wt + new_wt if self.adjust else 1.0
+        return value, old_wt
+
+    def update(self, x, commit):
+        """commit=False ise sadece sonucu döndürür, durumu değiştirmez"""
+        value, old_wt = self._step(x)
+        if commit:
+            self.value, self.old_wt = value, old_wt
+        return value
+
+
+class RollingWindow:
+    """
+    pandas .rolling(length) toplamları için kayan pencere.
+    Toplamlar ilk değere göre kaydırılarak tutulur (büyük fiyatlarda hassasiyet
+    kaybını önler) ve her length kapanışta bir pencereden yeniden hesaplanır.
+    """
+
+    def __init__(self, length):
+        self.length = length
+        self.values = deque(maxlen=length)
+        self.shift = None
+        self.sum = 0.0
+        self.sumsq = 0.0
+        self.nan_count = 0
+        self.commits = 0
+
+    def _shifted(self, x):
+        return 0.0 if math.isnan(x) else x - self.shift
+
+    def _sums(self, x):
+        """Son length-1 kapanmış değer ve x'ten oluşan pencerenin toplamları"""
+        s, ss, nans = self.sum, self.sumsq, self.nan_count
+        if len(self.values) == self.length:
+            oldest = self.values[0]
+            d = self._shifted(oldest)
+            s -= d
+            ss -= d * d
+            nans -= math.isnan(oldest)
+        d = self._shifted(x)
+        count = min(len(self.values) + 1, self.length)
+        return count, s + d, ss + d * d, nans + math.isnan(x)
+
+    def _recompute(self):
+        shifted = [self._shifted(v) for v in self.values]
+        self.sum = sum(shifted)
+        self.sumsq = sum(d * d for d in shifted)
+        self.nan_count = sum(math.isnan(v) for v in self.values)
+
+    def window(self, x):
+        """Son length-1 kapanmış değer + x (WMA gibi ağırlıklı hesaplar için)"""
+        values = list(self.values)[-(self.length - 1):] if self.length > 1 else []
+        return values + [x]
+
+    def stats(self, x):
+        """(ortalama, standart sapma ddof=1, toplam); pencere dolmamışsa NaN"""
+        if self.shift is None:
+            if math.isnan(x):
+                return NAN, NAN, NAN
+            self.shift = x
+        count, s, ss, nans = self._sums(x)
+        if count < self.length or nans:
+            return NAN, NAN, NAN
+        mean = s / count + self.shift
+        var = (ss - s * s / count) / (count - 1) if count > 1 else NAN
+        return mean, math.sqrt(max(var, 0.0)), s + count * self.shift
+
+    def commit(self, x):
+        if self.shift is None and not math.isnan(x):
+            self.shift = x
+        if self.shift is None:
+            # Henüz geçerli değer yok, penceredeki her şey NaN
+            self.values.append(x)
+            self.nan_count = len(self.values)
+            return
+        _, self.sum, self.sumsq, self.nan_count = self._sums(x)
+        self.values.append(x)
+        self.commits += 1
+        if self.commits % self.length == 0:
+            self._recompute()
+
+
+class StreamingIndicator:
+    """tick/close/rollback ortak davranışı; alt sınıflar _update'i uygular"""
+
+    def __init__(self):
+        self.last_closed = None    # Son kapanmış muma ait sonuç
+        self.forming = None        # Oluşmakta olan muma ait sonuç
+
+    def tick(self, bar):
+        self.forming = self._update(bar, commit=False)
+        return self.forming
+
+    def close(self, bar):
+        self.last_closed = self._update(bar, commit=True)
+        self.forming = None
+        return self.last_closed
+
+    def rollback(self):
+        self.forming = None
+        return self.last_closed
+
+    @property
+    def value(self):
+        return self.forming if self.forming is not None else self.last_closed
+
+    def _update(self, bar, commit):
+        raise NotImplementedError
+
+
+class WaveTrendState(StreamingIndicator):
+    """calculate_wavetrend karşılığı (indicators.py sürümü için adjust=True)"""
+
+    def __init__(self, n1=10, n2=21, adjust=False):
+        super().__init__()
+        self.esa = EMAState(span=n1, adjust=adjust)
+        self.d = EMAState(span=n1, adjust=adjust)
+        self.wt1 = EMAState(span=n2, adjust=adjust)
+        self.wt2 = RollingWindow(4)
+
+    def _update(self, bar, commit):
+        ap = (bar[2] + bar[3] + bar[4]) / 3
+        esa = self.esa.update(ap, commit)
+        d = self.d.update(abs(ap - esa), commit)
+        denominator = 0.015 * d
+        ci = (ap - esa) / denominator if denominator != 0 else NAN
+        wt1 = self.wt1.update(ci, commit)
+        wt2 = self.wt2.stats(wt1)[0]
+        if commit:
+            self.wt2.commit(wt1)
+        return {'wt1': wt1, 'wt2': wt2}
+
+
+class MACDDemaState(StreamingIndicator):
+    """
+    calculate_macd_dema karşılığı.
+    dema_signal=True: main.py sürümü (sinyal çizgisi de DEMA)
+    dema_signal=False: indicators.py sürümü (sinyal çizgisi EMA)
+    """
+
+    def __init__(self, fast=12, slow=26, signal=9, dema_signal=True):
+        super().__init__()
+        self.slow_a = EMAState(span=slow)
+        self.slow_b = EMAState(span=slow)
+        self.fast_a = EMAState(span=fast)
+        self.fast_b = EMAState(span=fast)
+        self.signal_a = EMAState(span=signal)
+        self.signal_b = EMAState(span=signal)
+        self.dema_signal = dema_signal
+
+    def _update(self, bar, commit):
+        close = bar[4]
+        slow_a = self.slow_a.update(close, commit)
+        dema_slow = 2 * slow_a - self.slow_b.update(slow_a, commit)
+        fast_a = self.fast_a.update(close, commit)
+        dema_fast = 2 * fast_a - self.fast_b.update(fast_a, commit)
+
+        macd_line = dema_fast - dema_slow
+        signal_a = self.signal_a.update(macd_line, commit)
+        if self.dema_signal:
+            signal_line = 2 * signal_a - self.signal_b.update(signal_a, commit)
+        else:
+            signal_line = signal_a
+
+        return {
+            'MACD_DEMA': macd_line,
+            'Signal_DEMA': signal_line,
+            'MACD_Hist_DEMA': macd_line - signal_line
+        }
+
+
+class BollingerState(StreamingIndicator):
+    """calculate_bollinger_bands karşılığı"""
+
+    def __init__(self, length=20, mult=2.0, ma_type="SMA"):
+        super().__init__()
+        self.length = length
+        self.mult = mult
+        self.ma_type = ma_type
+        self.close_window = RollingWindow(length)
+        self.volume_window = RollingWindow(length)
+        self.weighted_window = RollingWindow(length)   # close * volume (VWMA)
+        self.ema = EMAState(span=length) if ma_type == "EMA" else EMAState(alpha=1 / length)
+
+    def _basis(self, close, volume, sma, commit):
+        if self.ma_type == "SMA":
+            return sma
+        elif self.ma_type in ("EMA", "SMMA"):
+            return self.ema.update(close, commit)
+        elif self.ma_type == "WMA":
+            values = self.close_window.window(close)
+            if len(values) < self.length:
+                return NAN
+            weights = np.arange(1, self.length + 1)
+            return float(np.dot(weights, values) / weights.sum())
+        elif self.ma_type == "VWMA":
+            weighted_sum = self.weighted_window.stats(close * volume)[2]
+            volume_sum = self.volume_window.stats(volume)[2]
+            return weighted_sum / volume_sum if volume_sum else NAN
+        raise ValueError(f"Bilinmeyen MA tipi: {self.ma_type}")
+
+    def _update(self, bar, commit):
+        close, volume = bar[4], bar[5]
+        sma, std, _ = self.close_window.stats(close)
+        basis = self._basis(close, volume, sma, commit)
+        if commit:
+            self.close_window.commit(close)
+            if self.ma_type == "VWMA":
+                self.volume_window.commit(volume)
+                self.weighted_window.commit(close * volume)
+        return {
+            'BB_upper': basis + self.mult * std,
+            'BB_middle': basis,
+            'BB_lower': basis - self.mult * std
+        }
+
+
+class VWMACDState(StreamingIndicator):
+    """main.py ve volume_weighted_macd.py'deki Volume Weighted MACD karşılığı"""
+
+    def __init__(self, fast=12, slow=26, signal=9):
+        super().__init__()
+        self.volume_close_fast = EMAState(span=fast)
+        self.volume_fast = EMAState(span=fast)
+        self.volume_close_slow = EMAState(span=slow)
+        self.volume_slow = EMAState(span=slow)
+        self.signal = EMAState(span=signal)
+
+    def _update(self, bar, commit):
+        close, volume = bar[4], bar[5]
+        volume_close = volume * close
+        volume_fast = self.volume_fast.update(volume, commit)
+        volume_slow = self.volume_slow.update(volume, commit)
+        fast = self.volume_close_fast.update(volume_close, commit) / volume_fast if volume_fast else NAN
+        slow = self.volume_close_slow.update(volume_close, commit) / volume_slow if volume_slow else NAN
+        macd = fast - slow
+        signal = self.signal.update(macd, commit)
+        histogram = macd - signal
+
+        # Histogram rengi (volume_weighted_macd.py ile aynı kural)
+        previous = self.last_closed['histogram'] if self.last_closed else None
+        if previous is None:
+            color = 'orange'
+        elif histogram >= 0:
+            color = 'green' if histogram > previous else 'orange'
+        else:
+            color = 'red' if histogram < previous else 'orange'
+
+        return {'macd': macd, 'signal': signal, 'histogram': histogram, 'histogram_color': color}
+
+
+class SeriesIndicators:
+    """Tek bir (coin, timeframe) serisinin dört indikatör durumu"""
+
+    def __init__(self):
+        self.indicators = {
+            'wavetrend': WaveTrendState(),
+            'macd': MACDDemaState(),
+            'bollinger': BollingerState(),
+            'vwmacd': VWMACDState()
+        }
+        self.last_closed_time = None
+        self.last_close = NAN
+        self.forming_bar = None
+
+    def tick(self, bar):
+        self.forming_bar = bar
+        for indicator in self.indicators.values():
+            indicator.tick(bar)
+
+    def close(self, bar):
+        self.last_closed_time = int(bar[0])
+        self.last_close = bar[4]
+        self.forming_bar = None
+        for indicator in self.indicators.values():
+            indicator.close(bar)
+
+    def rollback(self):
+        self.forming_bar = None
+        for indicator in self.indicators.values():
+            indicator.rollback()
+
+    def snapshot(self):
+        """compute_indicator_batch ile aynı yapıda sonuç"""
+        result = {name: dict(indicator.value) for name, indicator in self.indicators.items()}
+        bar = self.forming_bar
+        result['close'] = bar[4] if bar is not None else self.last_close
+        return result
+
+
+class IndicatorStreams:
+    """
+    Tüm (coin, timeframe) serileri için indikatör durumlarını tutar.
+
+    update() her çağrıda mum tamponunun (times, values) son halini alır; son
+    kapanmış mumdan sonra gelen mumlar işlenir, son mum oluşmakta olan mum
+    olarak tick edilir. Tampon daha önce görülmüş bir mumla devam etmiyorsa
+    (uzun boşluk, sıfırlama) seri baştan ısıtılır.
+    """
+
+    def __init__(self):
+        self._series = {}
+
+    def update(self, key, times, values):
+        if len(times) == 0:
+            return None
+
+        series = self._series.get(key)
+        start = 0
+        if series is not None and series.last_closed_time is not None:
+            position = int(np.searchsorted(times, series.last_closed_time))
+            if position < len(times) and times[position] == series.last_closed_time:
+                start = position + 1
+            else:
+                series = None
+
+        if series is None:
+            series = SeriesIndicators()
+            self._series[key] = series
+
+        # Kapanmış mumlar (son mum hariç)
+        for i in range(start, len(times) - 1):
+            row = [int(times[i])] + [float(v) for v in values[i]]
+            series.close(row)
+
+        # Son mum oluşmakta olan mum
+        last = [int(times[-1])] + [float(v) for v in values[-1]]
+        if series.last_closed_time is not None and last[0] <= series.last_closed_time:
+            series.rollback()
+        else:
+            series.tick(last)
+        return series.snapshot()
+
+    def update_frame(self, key, df):
+        """get_coin_data'nın döndürdüğü DataFrame ile güncelle"""
+        if df is None or df.empty:
+            return None
+        times = df.index.values.astype('datetime64[ms]').astype(np.int64)
+        values = df[['open', 'high', 'low', 'close', 'volume']].to_numpy(dtype=np.float64)
+        return self.update(key, times, values)
+
+    def remove_coin(self, coin):
+        for key in [k for k in self._series if k[0] == coin]:
+            del self._series[key]
+
+
+# Örnek kullanım:
+if __name__ == "__main__":
+    import pandas as pd
+    from batch_indicators import compute_indicator_batch
+
+    rng = np.random.default_rng(0)
+    close = 100 + np.cumsum(rng.normal(size=120))
+    df = pd.DataFrame({
+        'open': close, 'high': close + 0.5, 'low': close - 0.5,
+        'close': close, 'volume': rng.random(120) * 1000
+    }, index=pd.to_datetime(np.arange(120) * 60_000, unit='ms'))
+
+    streams = IndicatorStreams()
+    streamed = streams.update_frame(('BTCUSDT', '1m'), df)
+    batched = compute_indicator_batch({('BTCUSDT', '1m'): df})[('BTCUSDT', '1m')]
+    print("WT1 (akan / toplu):", streamed['wavetrend']['wt1'], batched['wavetrend']['wt1'])
+    print("MACD (akan / toplu):", streamed['macd']['MACD_DEMA'], batched['macd']['MACD_DEMA'])
+    print("BB üst (akan / toplu):", streamed['bollinger']['BB_upper'], batched['bollinger']['BB_upper'])
+    print("VW MACD (akan / toplu):", streamed['vwmacd']['macd'], batched['vwmacd']['macd'])
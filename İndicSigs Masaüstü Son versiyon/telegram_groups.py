@@ -156,6 +156,10 @@ class TelegramGroupsDialog(QDialog):
             # Ayarları kaydet
             with open(self.parent.settings_file, "w") as f:
                 json.dump(settings, f, indent=4)
+            
+            # Telegram yönlendirme tablosu yeniden yüklensin
+            if hasattr(self.parent, "telegram_router"):
+                self.parent.telegram_router.invalidate()
         except Exception as e:
             print(f"Gruplar kaydedilirken hata: {e}")
     
@@ -0,0 +1,87 @@
+"""
+Telegram Yönlendirme Modülü
+
+settings.json'daki telegram_groups listesini bir kez okuyup coin -> gruplar
+indeksine çevirir. "ALL" grupları her coin için ayrı bir listede tutulur.
+Bir sinyalin gideceği grupları bulmak sözlükten tek bir okumadır; dosya sadece
+değiştirilme zamanı (mtime) değiştiğinde veya invalidate() çağrıldığında
+(TelegramGroupsDialog.save_groups) yeniden okunur.
+
+Gruplar settings.json'daki sırayla döner (eski davranışla aynı gönderim sırası).
+"""
+
+import json
+import os
+import threading
+
+ALL_COINS = "ALL"
+
+
+class TelegramRouter:
+    def __init__(self, settings_file):
+        self.settings_file = settings_file
+        self._lock = threading.Lock()
+        self._mtime = None
+        self._by_coin = {}      # {coin: [(sıra, grup), ...]}
+        self._all = []          # [(sıra, grup), ...] "ALL" grupları
+        self._routes = {}       # {coin: [grup, ...]} birleştirilmiş sonuç önbelleği
+        self.group_count = 0
+
+    def invalidate(self):
+        """Gruplar değişti, bir sonraki yönlendirmede dosyayı yeniden oku"""
+        with self._lock:
+            self._mtime = None
+
+    def _reload_if_changed(self):
+        try:
+            mtime = os.stat(self.settings_file).st_mtime_ns
+        except OSError:
+            return
+        if mtime == self._mtime:
+            return
+
+        try:
+            with open(self.settings_file, "r") as f:
+                groups = json.load(f).get("telegram_groups", [])
+        except (OSError, ValueError) as e:
+            print(f"Telegram grupları okunamadı: {e}")
+            return
+
+        by_coin = {}
+        all_groups = []
+        for position, group in enumerate(groups):
+            coins = str(group.get("coins", "")).upper()
+            entry = (position, group)
+            if coins == ALL_COINS:
+                all_groups.append(entry)
+                continue
+            for coin in coins.split(","):
+                coin = coin.strip()
+                if coin:
+                    by_coin.setdefault(coin, []).append(entry)
+
+        self._by_coin = by_coin
+        self._all = all_groups
+        self._routes = {}
+        self.group_count = len(groups)
+        self._mtime = mtime
+        print(f"Telegram yönlendirme tablosu yüklendi: {len(groups)} grup, {len(by_coin)} coin")
+
+    def route(self, coin):
+        """Coin için mesaj gönderilecek gruplar ({'name', 'chat_id', 'coins'})"""
+        coin = (coin or "").upper()
+        with self._lock:
+            self._reload_if_changed()
+            groups = self._routes.get(coin)
+            if groups is None:
+                entries = self._by_coin.get(coin, []) + self._all
+                groups = [group for _, group in sorted(entries, key=lambda entry: entry[0])]
+                self._routes[coin] = groups
+            return groups
+
+
+# Örnek kullanım:
+if __name__ == "__main__":
+    router = TelegramRouter("settings.json")
+    for coin in ("BTCUSDT", "ETHUSDT", "XYZUSDT"):
+        print(coin, "->", [group["name"] for group in router.route(coin)])
@@ -0,0 +1,217 @@
+"""
+Telegram Gönderici Modülü
+
+Bir sinyali birden fazla Telegram grubuna Bot API sınırlarına uyarak paralel
+gönderir:
+    - Genel sınır: saniyede ~30 mesaj (tüm sohbetler)
+    - Sohbet başına sınır: grup başına dakikada ~20 mesaj
+Her iki sınır token bucket ile uygulanır. Farklı sohbetlere gönderimler bir
+thread havuzunda paralel yapılır ve tek bir keep-alive requests.Session
+bağlantı havuzu paylaşılır.
+
+429 (Too Many Requests) yanıtında Telegram'ın bildirdiği retry_after süresi
+beklenir ve aynı sohbet o süre boyunca duraklatılır. Ağ hataları ve 5xx
+yanıtları artan beklemeyle tekrar denenir; yine de gönderilemeyen sohbetler
+send() sonucunda döner, çağıran taraf (bildirim dağıtıcısı) bunları yeniden
+kuyruğa alır.
+
+api_base parametresiyle yerel sahte bir Bot API sunucusuna karşı test
+edilebilir (bkz. dosyanın sonundaki örnek).
+"""
+
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+TELEGRAM_API_BASE = "https://api.telegram.org"
+
+
+class TokenBucket:
+    def __init__(self, rate, capacity):
+        """
+        rate: Saniyede eklenen token
+        capacity: En fazla biriktirilebilecek token (ani gönderim miktarı)
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """Bir token ayır, kullanmadan önce beklenmesi gereken süreyi (sn) döndür"""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            wait = 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+            return max(wait, self.paused_until - now)
+
+    def acquire(self):
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    def pause(self, seconds):
+        """429 sonrası: bu süre dolmadan token verme"""
+        with self._lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+
+class TelegramSender:
+    def __init__(self, token, api_base=TELEGRAM_API_BASE, max_workers=8,
+                 global_rate=30.0, per_chat_rate=20 / 60, per_chat_burst=3,
+                 max_retries=3, timeout=10):
+        self.token = token
+        self.api_base = api_base.rstrip("/")
+        self.max_retries = max_retries
+        self.timeout = timeout
+
+        self.global_bucket = TokenBucket(global_rate, global_rate)
+        self.per_chat_rate = per_chat_rate
+        self.per_chat_burst = per_chat_burst
+        self._chat_buckets = {}
+        self._lock = threading.Lock()
+
+        # Tüm thread'lerin paylaştığı keep-alive bağlantı havuzu
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_workers)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="TelegramSend")
+
+        # İzleme için
+        self.sent = 0
+        self.rate_limited = 0
+        self.failed = 0
+
+    def _chat_bucket(self, chat_id):
+        with self._lock:
+            bucket = self._chat_buckets.get(chat_id)
+            if bucket is None:
+                bucket = TokenBucket(self.per_chat_rate, self.per_chat_burst)
+                self._chat_buckets[chat_id] = bucket
+            return bucket
+
+    def send(self, chat_ids, text, reply_markup=None, parse_mode="HTML"):
+        """
+        Mesajı verilen sohbetlere paralel gönder, hepsi bitene kadar bekle.
+        Dönüş: Gönderilemeyen chat_id kümesi
+        """
+        payload = {'text': text, 'parse_mode': parse_mode}
+        if reply_markup:
+            payload['reply_markup'] = json.dumps(reply_markup)
+
+        futures = {chat_id: self._executor.submit(self._send_one, chat_id, payload) for chat_id in chat_ids}
+        failed = set()
+        for chat_id, future in futures.items():
+            try:
+                if not future.result():
+                    failed.add(chat_id)
+            except Exception as e:
+                print(f"Telegram gönderim hatası ({chat_id}): {e}")
+                failed.add(chat_id)
+        return failed
+
+    def _send_one(self, chat_id, payload):
+        url = f"{self.api_base}/bot{self.token}/sendMessage"
+        data = dict(payload, chat_id=chat_id)
+        chat_bucket = self._chat_bucket(chat_id)
+
+        for attempt in range(self.max_retries + 1):
+            chat_bucket.acquire()
+            self.global_bucket.acquire()
+
+            try:
+                response = self.session.post(url, data=data, timeout=self.timeout)
+            except requests.RequestException as e:
+                print(f"Telegram bağlantı hatası ({chat_id}): {e}")
+                time.sleep(min(2 ** attempt, 30))
+                continue
+
+            if response.status_code == 200:
+                self._count('sent')
+                return True
+
+            if response.status_code == 429:
+                self._count('rate_limited')
+                retry_after = 1
+                try:
+                    retry_after = response.json().get("parameters", {}).get("retry_after", 1)
+                except ValueError:
+                    pass
+                print(f"Telegram hız sınırı ({chat_id}), {retry_after} sn bekleniyor")
+                chat_bucket.pause(retry_after)
+                continue
+
+            if response.status_code >= 500:
+                time.sleep(min(2 ** attempt, 30))
+                continue
+
+            # 400/403 gibi hatalar tekrar denemekle düzelmez (bot grupta değil, chat_id yanlış...)
+            print(f"Telegram mesajı gönderilemedi ({chat_id}): HTTP {response.status_code} {response.text[:200]}")
+            self._count('failed')
+            return False
+
+        self._count('failed')
+        return False
+
+    def _count(self, name):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+        self.session.close()
+
+
+# Yerel sahte Bot API sunucusu ile örnek kullanım
+if __name__ == "__main__":
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    from urllib.parse import parse_qs
+
+    seen = {}
+
+    class FakeBotAPI(BaseHTTPRequestHandler):
+        """Her sohbetin ilk mesajına 429 dönen sahte Bot API"""
+
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers.get("Content-Length", 0))).decode()
+            chat_id = parse_qs(body).get("chat_id", [""])[0]
+            seen[chat_id] = seen.get(chat_id, 0) + 1
+            time.sleep(0.2)  # Ağ gecikmesi
+
+            if seen[chat_id] == 1 and chat_id.endswith("0"):
+                status, result = 429, {"ok": False, "error_code": 429, "parameters": {"retry_after": 1}}
+            else:
+                status, result = 200, {"ok": True, "result": {"message_id": 1}}
+
+            response = json.dumps(result).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(response)))
+            self.end_headers()
+            self.wfile.write(response)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeBotAPI)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    sender = TelegramSender("TEST", api_base=f"http://127.0.0.1:{server.server_address[1]}")
+    chat_ids = [f"-100{i}" for i in range(20)]
+
+    start = time.perf_counter()
+    failed = sender.send(chat_ids, "🚨 Test sinyali")
+    print(f"{len(chat_ids)} gruba gönderim {time.perf_counter() - start:.2f} sn sürdü")
+    print(f"Gönderilen: {sender.sent}, hız sınırı: {sender.rate_limited}, başarısız: {failed}")
+
+    sender.close()
+    server.shutdown()
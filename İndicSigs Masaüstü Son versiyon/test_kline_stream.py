@@ -0,0 +1,179 @@
+"""
+KlineStreamManager testleri
+
+Yerel bir WebSocket sunucusu Binance birleşik akışının yerine geçer: gelen
+SUBSCRIBE/UNSUBSCRIBE mesajlarını kaydeder ve teste kline mesajı gönderir.
+
+Çalıştırma: python -m pytest test_kline_stream.py
+"""
+
+import asyncio
+import json
+import threading
+import time
+import unittest
+
+import websockets
+
+import kline_stream
+from kline_stream import KlineStreamManager, stream_name
+
+MINUTE_MS = 60_000
+OPEN_TIME = 1_699_999_980_000
+
+
+def wait_until(condition, timeout=5.0):
+    """condition() doğru olana kadar bekle, süre dolarsa False"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.02)
+    return condition()
+
+
+def kline_message(coin, timeframe, open_time, close):
+    return json.dumps({
+        "stream": stream_name(coin, timeframe),
+        "data": {
+            "e": "kline", "s": coin,
+            "k": {"t": open_time, "s": coin, "i": timeframe,
+                  "o": "100", "h": str(close), "l": "99", "c": str(close), "v": "10", "x": False}
+        }
+    })
+
+
+class FakeBinanceStream:
+    """Kontrol mesajlarını kaydeden ve istenince kline gönderen yerel WebSocket sunucusu"""
+
+    def __init__(self):
+        self.received = []
+        self._client = None
+        self._loop = asyncio.new_event_loop()
+        self._started = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        self._started.wait(5)
+
+    def _run(self):
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_until_complete(self._serve())
+        self.url = f"ws://127.0.0.1:{self._server.sockets[0].getsockname()[1]}"
+        self._started.set()
+        self._loop.run_forever()
+
+    async def _serve(self):
+        self._server = await websockets.serve(self._handler, "127.0.0.1", 0)
+
+    async def _handler(self, websocket):
+        self._client = websocket
+        async for message in websocket:
+            request = json.loads(message)
+            self.received.append(request)
+            await websocket.send(json.dumps({"result": None, "id": request["id"]}))
+
+    def send(self, message):
+        asyncio.run_coroutine_threadsafe(self._client.send(message), self._loop).result(5)
+
+    def methods(self, method):
+        return [request for request in self.received if request["method"] == method]
+
+    def close(self):
+        async def shutdown():
+            self._server.close()
+            await self._server.wait_closed()
+        asyncio.run_coroutine_threadsafe(shutdown(), self._loop).result(5)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(5)
+
+
+class KlineStreamTest(unittest.TestCase):
+    def setUp(self):
+        self.server = FakeBinanceStream()
+        self.manager = KlineStreamManager(url=self.server.url, reconnect_delay=60)
+
+    def tearDown(self):
+        self.manager.stop()
+        if self.manager._thread is not None:
+            self.manager._thread.join(5)
+        self.server.close()
+
+    def start(self, pairs):
+        self.manager.set_subscriptions(pairs)
+        self.manager.start()
+        self.assertTrue(wait_until(lambda: self.manager.connected), "Akışa bağlanılamadı")
+
+    def test_subscribe_is_sent_in_chunks(self):
+        pairs = {(f"C{i}USDT", "1m") for i in range(450)}
+        self.start(pairs)
+        self.assertTrue(wait_until(lambda: len(self.server.methods("SUBSCRIBE")) == 3))
+
+        requests = self.server.methods("SUBSCRIBE")
+        self.assertEqual([len(r["params"]) for r in requests], [200, 200, 50])
+        self.assertEqual(len({r["id"] for r in requests}), 3)
+        streams = [stream for r in requests for stream in r["params"]]
+        self.assertEqual(sorted(streams), sorted(stream_name(c, tf) for c, tf in pairs))
+
+    def test_chunk_size_is_respected(self):
+        original = kline_stream.SUBSCRIBE_CHUNK_SIZE
+        kline_stream.SUBSCRIBE_CHUNK_SIZE = 2
+        try:
+            self.start({("BTCUSDT", "1m"), ("ETHUSDT", "1m"), ("SOLUSDT", "5m")})
+            self.assertTrue(wait_until(lambda: len(self.server.methods("SUBSCRIBE")) == 2))
+            self.assertEqual([len(r["params"]) for r in self.server.methods("SUBSCRIBE")], [2, 1])
+        finally:
+            kline_stream.SUBSCRIBE_CHUNK_SIZE = original
+
+    def test_subscription_changes_send_only_the_difference(self):
+        self.start({("BTCUSDT", "1m"), ("ETHUSDT", "1m")})
+        self.assertTrue(wait_until(lambda: len(self.server.methods("SUBSCRIBE")) == 1))
+
+        self.manager.set_subscriptions({("BTCUSDT", "1m"), ("SOLUSDT", "1m")})
+        self.assertTrue(wait_until(lambda: self.server.methods("UNSUBSCRIBE")))
+        self.assertTrue(wait_until(lambda: len(self.server.methods("SUBSCRIBE")) == 2))
+        self.assertEqual(self.server.methods("SUBSCRIBE")[1]["params"], ["solusdt@kline_1m"])
+        self.assertEqual(self.server.methods("UNSUBSCRIBE")[0]["params"], ["ethusdt@kline_1m"])
+
+    def test_next_candle_is_appended_and_current_candle_updated(self):
+        self.start({("BTCUSDT", "1m")})
+        self.manager.seed("BTCUSDT", "1m", [[OPEN_TIME - MINUTE_MS, 98, 99, 97, 98, 5],
+                                            [OPEN_TIME, 99, 100, 98, 100, 1]])
+        self.assertTrue(wait_until(lambda: self.server.methods("SUBSCRIBE")))
+
+        self.server.send(kline_message("BTCUSDT", "1m", OPEN_TIME, 101.0))
+        self.server.send(kline_message("BTCUSDT", "1m", OPEN_TIME + MINUTE_MS, 102.5))
+        self.assertTrue(wait_until(lambda: self.manager.message_count == 2))
+
+        candles = self.manager.get_ohlcv("BTCUSDT", "1m")
+        self.assertEqual([c[0] for c in candles], [OPEN_TIME - MINUTE_MS, OPEN_TIME, OPEN_TIME + MINUTE_MS])
+        self.assertEqual(candles[1][4], 101.0)
+        self.assertEqual(candles[2][4], 102.5)
+
+    def test_gap_marks_series_not_ready(self):
+        self.start({("BTCUSDT", "1m"), ("ETHUSDT", "1m")})
+        self.manager.seed("BTCUSDT", "1m", [[OPEN_TIME, 99, 100, 98, 100, 1]])
+        self.manager.seed("ETHUSDT", "1m", [[OPEN_TIME, 9, 10, 8, 10, 1]])
+        self.assertTrue(wait_until(lambda: self.server.methods("SUBSCRIBE")))
+
+        # Bir mum atlandı: seri REST ile yenilenene kadar hazır değil
+        self.server.send(kline_message("BTCUSDT", "1m", OPEN_TIME + 2 * MINUTE_MS, 103.0))
+        self.assertTrue(wait_until(lambda: self.manager.message_count == 1))
+        self.assertIsNone(self.manager.get_ohlcv("BTCUSDT", "1m"))
+        self.assertIsNotNone(self.manager.get_ohlcv("ETHUSDT", "1m"))
+
+        # REST ile yeniden seed edilince akış devam eder
+        self.manager.seed("BTCUSDT", "1m", [[OPEN_TIME + 2 * MINUTE_MS, 100, 103, 99, 103, 1]])
+        self.server.send(kline_message("BTCUSDT", "1m", OPEN_TIME + 3 * MINUTE_MS, 104.0))
+        self.assertTrue(wait_until(lambda: self.manager.message_count == 2))
+        self.assertEqual(self.manager.get_ohlcv("BTCUSDT", "1m")[-1][0], OPEN_TIME + 3 * MINUTE_MS)
+
+    def test_unseeded_series_is_not_served(self):
+        self.start({("BTCUSDT", "1m")})
+        self.assertTrue(wait_until(lambda: self.server.methods("SUBSCRIBE")))
+        self.server.send(kline_message("BTCUSDT", "1m", OPEN_TIME, 101.0))
+        self.assertTrue(wait_until(lambda: self.manager.message_count == 1))
+        self.assertIsNone(self.manager.get_ohlcv("BTCUSDT", "1m"))
+
+
+if __name__ == "__main__":
+    unittest.main()
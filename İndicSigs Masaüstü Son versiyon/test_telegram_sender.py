@@ -0,0 +1,149 @@
+"""
+TelegramSender testleri
+
+Yerel sahte bir Bot API sunucusu her sendMessage isteğini (sohbet, zaman)
+olarak kaydeder; yanıtlar test başına ayarlanır (200, 429 retry_after, 400).
+
+Çalıştırma: python -m pytest test_telegram_sender.py
+"""
+
+import json
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+from telegram_sender import TelegramSender
+
+
+class FakeBotAPI:
+    """İstekleri kaydeden sahte Bot API; respond(chat_id, deneme) -> (durum, gövde)"""
+
+    def __init__(self, respond=None):
+        self.requests = []      # [(chat_id, monotonic zaman)]
+        self.respond = respond or (lambda chat_id, attempt: (200, {"ok": True, "result": {"message_id": 1}}))
+        self._lock = threading.Lock()
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0))).decode()
+                chat_id = parse_qs(body).get("chat_id", [""])[0]
+                with api._lock:
+                    api.requests.append((chat_id, time.monotonic()))
+                    attempt = sum(1 for seen, _ in api.requests if seen == chat_id)
+                status, result = api.respond(chat_id, attempt)
+                response = json.dumps(result).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(response)))
+                self.end_headers()
+                self.wfile.write(response)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}"
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    def times(self, chat_id):
+        with self._lock:
+            return [at for seen, at in self.requests if seen == chat_id]
+
+    def close(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def rate_limited_once(retry_after):
+    """Her sohbetin ilk isteğine 429 dönen yanıtlayıcı"""
+    def respond(chat_id, attempt):
+        if attempt == 1:
+            return 429, {"ok": False, "error_code": 429, "parameters": {"retry_after": retry_after}}
+        return 200, {"ok": True, "result": {"message_id": attempt}}
+    return respond
+
+
+class TelegramSenderTest(unittest.TestCase):
+    def setUp(self):
+        self.api = None
+        self.sender = None
+
+    def tearDown(self):
+        if self.sender is not None:
+            self.sender.close()
+        if self.api is not None:
+            self.api.close()
+
+    def make(self, respond=None, **kwargs):
+        self.api = FakeBotAPI(respond)
+        self.sender = TelegramSender("TEST", api_base=self.api.url, **kwargs)
+        return self.sender
+
+    def test_429_pauses_chat_for_retry_after(self):
+        sender = self.make(rate_limited_once(1))
+
+        failed = sender.send(["-1001"], "🚨 Test")
+
+        self.assertEqual(failed, set())
+        first, second = self.api.times("-1001")
+        self.assertGreaterEqual(second - first, 0.95)
+        self.assertEqual((sender.sent, sender.rate_limited, sender.failed), (1, 1, 0))
+
+    def test_429_pause_does_not_block_other_chats(self):
+        def respond(chat_id, attempt):
+            if chat_id == "-1001" and attempt == 1:
+                return 429, {"ok": False, "error_code": 429, "parameters": {"retry_after": 2}}
+            return 200, {"ok": True, "result": {"message_id": attempt}}
+        sender = self.make(respond)
+
+        start = time.monotonic()
+        failed = sender.send(["-1001", "-1002"], "🚨 Test")
+
+        self.assertEqual(failed, set())
+        self.assertLess(self.api.times("-1002")[0] - start, 0.5)
+        self.assertGreaterEqual(self.api.times("-1001")[1] - start, 1.95)
+
+    def test_per_chat_bucket_limits_burst(self):
+        # Sohbet başına 2 mesajlık ani gönderim, sonra saniyede 4 mesaj
+        sender = self.make(per_chat_rate=4.0, per_chat_burst=2)
+
+        start = time.monotonic()
+        for _ in range(4):
+            self.assertEqual(sender.send(["-1001"], "🚨 Test"), set())
+        times = [at - start for at in self.api.times("-1001")]
+
+        self.assertLess(times[1], 0.2)                  # İlk iki mesaj bekletilmez
+        self.assertGreaterEqual(times[2], 0.2)          # Üçüncü 1/4 sn bekler
+        self.assertGreaterEqual(times[3], 0.45)
+        # Diğer sohbetin kovası ayrıdır, hemen gönderilir
+        other_start = time.monotonic()
+        sender.send(["-1002"], "🚨 Test")
+        self.assertLess(self.api.times("-1002")[0] - other_start, 0.2)
+
+    def test_global_bucket_limits_all_chats(self):
+        sender = self.make(global_rate=5.0)
+        chat_ids = [f"-100{i}" for i in range(10)]
+
+        start = time.monotonic()
+        self.assertEqual(sender.send(chat_ids, "🚨 Test"), set())
+        elapsed = max(at for _, at in self.api.requests) - start
+
+        # 5 mesajlık kova boşalınca saniyede 5 mesaj: son mesaj ~1 sn sonra
+        self.assertGreaterEqual(elapsed, 0.9)
+        self.assertEqual(len(self.api.requests), 10)
+
+    def test_client_error_is_not_retried(self):
+        sender = self.make(lambda chat_id, attempt: (400, {"ok": False, "description": "chat not found"}))
+
+        failed = sender.send(["-1001"], "🚨 Test")
+
+        self.assertEqual(failed, {"-1001"})
+        self.assertEqual(len(self.api.times("-1001")), 1)
+        self.assertEqual(sender.failed, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,196 @@
+"""
+Eşik İndeksi Modülü
+
+"Üstüne Çıktığında" / "Altına Düştüğünde" koşullu alarmları her
+(coin, timeframe, indikatör, detay) serisi için sıralı eşik listelerinde tutar.
+Serinin önceki ve mevcut değeri verildiğinde, eşiği kesilen tüm alarmlar ikili
+arama (bisect) ile bulunur; alarm başına karşılaştırma veya Türkçe koşul
+metni kontrolü yapılmaz.
+
+    Üstüne Çıktığında: önceki <= eşik < mevcut   -> eşik [önceki, mevcut) aralığında
+    Altına Düştüğünde: önceki >= eşik > mevcut   -> eşik (mevcut, önceki] aralığında
+
+İlk kez değerlendirilen alarmların önceki değeri yoktur (check_all_alarms'taki
+previous_value None durumu); bu alarmlar bir kez tek tek kontrol edilip sonra
+sıralı listeye eklenir. Kesişim ve Bollinger alarmları (hedef sabit değil)
+indekslenmez, eskisi gibi tek tek değerlendirilir.
+"""
+
+import math
+from bisect import bisect_left, bisect_right
+
+CONDITION_ABOVE = "Üstüne Çıktığında"
+CONDITION_BELOW = "Altına Düştüğünde"
+
+# (indikatör, detay) -> indikatör sonuçlarındaki (grup, alan)
+DETAIL_FIELDS = {
+    ("İndicPro", "Ana Çizgi"): ('wavetrend', 'wt1'),
+    ("İndicPro", "Sinyal Çizgisi"): ('wavetrend', 'wt2'),
+    ("MACD", "MACD Çizgisi"): ('macd', 'MACD_DEMA'),
+    ("MACD", "Sinyal Çizgisi"): ('macd', 'Signal_DEMA'),
+    ("MACD", "Histogram"): ('macd', 'MACD_Hist_DEMA'),
+    ("Volume Weighted MACD", "VW MACD"): ('vwmacd', 'macd'),
+    ("Volume Weighted MACD", "VW Signal"): ('vwmacd', 'signal'),
+    ("Volume Weighted MACD", "VW Histogram"): ('vwmacd', 'histogram'),
+}
+
+
+def alarm_key(alarm):
+    """Alarmın önceki değerinin saklandığı benzersiz anahtar"""
+    return f"{alarm['name']}_{alarm['coin']}_{alarm['timeframe']}_{alarm['indicator']}_{alarm['detail']}_{alarm['condition']}_{alarm['value']}"
+
+
+def alarm_threshold(alarm):
+    """İndekslenebilir alarmın eşik değeri, indekslenemiyorsa None"""
+    if (alarm.get('indicator'), alarm.get('detail')) not in DETAIL_FIELDS:
+        return None
+    if alarm.get('condition') not in (CONDITION_ABOVE, CONDITION_BELOW):
+        return None
+    try:
+        target = float(alarm['value'])
+    except (KeyError, TypeError, ValueError):
+        return None
+    return None if math.isnan(target) else target
+
+
+class SeriesThresholds:
+    """Tek bir (coin, timeframe, indikatör, detay) serisinin sıralı eşikleri"""
+
+    def __init__(self):
+        self.above_values, self.above_alarms = [], []
+        self.below_values, self.below_alarms = [], []
+        self.pending = []   # Henüz önceki değeri olmayan (alarm, eşik) çiftleri
+
+    def _lists(self, alarm):
+        if alarm['condition'] == CONDITION_ABOVE:
+            return self.above_values, self.above_alarms
+        return self.below_values, self.below_alarms
+
+    def insert(self, alarm, target):
+        values, alarms = self._lists(alarm)
+        position = bisect_right(values, target)
+        values.insert(position, target)
+        alarms.insert(position, alarm)
+
+    def crossed(self, previous, current):
+        """Eşiği kesilen alarmlar"""
+        hits = []
+        if previous is not None and not math.isnan(previous) and not math.isnan(current):
+            if current > previous:
+                start = bisect_left(self.above_values, previous)
+                end = bisect_left(self.above_values, current)
+                hits.extend(self.above_alarms[start:end])
+            elif current < previous:
+                start = bisect_right(self.below_values, current)
+                end = bisect_right(self.below_values, previous)
+                hits.extend(self.below_alarms[start:end])
+
+        # İlk kez değerlendirilen alarmlar (önceki değer yok)
+        for alarm, target in self.pending:
+            if alarm['condition'] == CONDITION_ABOVE:
+                if current > target:
+                    hits.append(alarm)
+            elif current < target:
+                hits.append(alarm)
+            self.insert(alarm, target)
+        self.pending = []
+
+        return hits
+
+    def __len__(self):
+        return len(self.above_values) + len(self.below_values) + len(self.pending)
+
+
+class ThresholdIndex:
+    def __init__(self):
+        self._series = {}      # {(coin, timeframe): {(indikatör, detay): SeriesThresholds}}
+        self._individual = {}  # {(coin, timeframe): [alarm, ...]} indekslenemeyen alarmlar
+        self._previous = {}    # {(coin, timeframe, indikatör, detay): son değer}
+        self._seen = set()     # En az bir kez değerlendirilmiş alarm anahtarları
+
+    def rebuild(self, alarms):
+        """
+        İndeksi alarm listesinden yeniden kur.
+        Serilerin önceki değerleri ve değerlendirilmiş alarmlar korunur; silinen
+        alarmlara ve serilere ait kayıtlar atılır.
+        """
+        groups = {}
+        series = {}
+        individual = {}
+        for alarm in alarms:
+            pair = (alarm['coin'], alarm['timeframe'])
+            target = alarm_threshold(alarm)
+            if target is None:
+                individual.setdefault(pair, []).append(alarm)
+                continue
+            detail_key = (alarm['indicator'], alarm['detail'])
+            thresholds = series.setdefault(pair, {}).setdefault(detail_key, SeriesThresholds())
+            if alarm_key(alarm) in self._seen:
+                groups.setdefault((pair, detail_key, alarm['condition']), []).append((target, alarm))
+            else:
+                thresholds.pending.append((alarm, target))
+
+        # Sıralı listeleri tek seferde oluştur
+        for (pair, detail_key, condition), items in groups.items():
+            items.sort(key=lambda item: item[0])
+            thresholds = series[pair][detail_key]
+            if condition == CONDITION_ABOVE:
+                thresholds.above_values = [target for target, _ in items]
+                thresholds.above_alarms = [alarm for _, alarm in items]
+            else:
+                thresholds.below_values = [target for target, _ in items]
+                thresholds.below_alarms = [alarm for _, alarm in items]
+
+        self._series = series
+        self._individual = individual
+        self._seen &= {alarm_key(alarm) for alarm in alarms}
+        self._previous = {key: value for key, value in self._previous.items()
+                          if key[2:] in series.get(key[:2], {})}
+
+    def individual_alarms(self, coin, timeframe):
+        """İndekslenemeyen (tek tek değerlendirilecek) alarmlar"""
+        return self._individual.get((coin, timeframe), [])
+
+    def evaluate(self, coin, timeframe, indicators):
+        """
+        (coin, timeframe) çiftinin tüm eşik alarmlarını indikatör sonuçlarına göre kontrol et.
+        Dönüş: [(alarm, mevcut_değer), ...] tetiklenen alarmlar
+        """
+        triggered = []
+        for detail_key, thresholds in self._series.get((coin, timeframe), {}).items():
+            group, field = DETAIL_FIELDS[detail_key]
+            current = indicators[group][field]
+            series_key = (coin, timeframe) + detail_key
+
+            for alarm, _ in thresholds.pending:
+                self._seen.add(alarm_key(alarm))
+            for alarm in thresholds.crossed(self._previous.get(series_key), current):
+                triggered.append((alarm, current))
+            self._previous[series_key] = current
+        return triggered
+
+    def __len__(self):
+        return sum(len(t) for details in self._series.values() for t in details.values())
+
+
+# Örnek kullanım:
+if __name__ == "__main__":
+    import random
+    import time
+
+    alarms = [{
+        'name': f"Alarm {i}", 'coin': 'BTCUSDT', 'timeframe': '15m',
+        'indicator': 'İndicPro', 'detail': 'Ana Çizgi',
+        'condition': CONDITION_ABOVE if i % 2 else CONDITION_BELOW,
+        'value': str(random.uniform(-100, 100))
+    } for i in range(10000)]
+
+    index = ThresholdIndex()
+    index.rebuild(alarms)
+    index.evaluate('BTCUSDT', '15m', {'wavetrend': {'wt1': 0.0, 'wt2': 0.0}})  # İlk değer
+    index.rebuild(alarms)
+
+    start = time.perf_counter()
+    hits = index.evaluate('BTCUSDT', '15m', {'wavetrend': {'wt1': 5.0, 'wt2': 0.0}})
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f"{len(index)} alarm, {len(hits)} tetiklendi, {elapsed:.3f} ms")
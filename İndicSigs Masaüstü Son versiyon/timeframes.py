@@ -0,0 +1,135 @@
+"""
+Zaman Dilimi Yardımcıları
+
+Üst zaman dilimlerini (3m, 5m, 15m, 45m ...) tek bir 1m mum serisinden yerel
+olarak türetir. Gruplama borsa sınırlarına (UTC gün başlangıcı) hizalanır, böylece
+türetilen mumlar Binance'in kendi mumlarıyla aynı açılış zamanlarına sahip olur.
+Binance'in sunmadığı zaman dilimleri (örn. 45m) de 1m tamponu yeterince uzunsa
+aynı yolla üretilebilir (bkz. can_derive, required_base_capacity).
+"""
+
+import numpy as np
+
+MINUTE_MS = 60_000
+DAY_MS = 24 * 60 * MINUTE_MS
+
+# Türetmede kullanılan taban zaman dilimi
+BASE_TIMEFRAME = '1m'
+
+# Türetilen serilerde göstergelerin doğru hesaplanması için gereken en az mum sayısı
+MIN_DERIVED_BARS = 100
+
+# Binance spot piyasasının doğrudan sunduğu zaman dilimleri
+NATIVE_TIMEFRAMES = {'1m', '3m', '5m', '15m', '30m', '1h', '2h', '4h', '6h', '8h', '12h', '1d', '3d', '1w', '1M'}
+
+# Zaman dilimlerinin milisaniye karşılıkları
+TIMEFRAME_MS = {
+    '1m': MINUTE_MS,
+    '3m': 3 * MINUTE_MS,
+    '5m': 5 * MINUTE_MS,
+    '15m': 15 * MINUTE_MS,
+    '30m': 30 * MINUTE_MS,
+    '1h': 60 * MINUTE_MS,
+    '2h': 2 * 60 * MINUTE_MS,
+    '4h': 4 * 60 * MINUTE_MS,
+    '6h': 6 * 60 * MINUTE_MS,
+    '8h': 8 * 60 * MINUTE_MS,
+    '12h': 12 * 60 * MINUTE_MS,
+    '1d': DAY_MS,
+}
+
+
+def timeframe_to_ms(timeframe):
+    """'45m' -> 2700000, '2h' -> 7200000. Tanınmayan formatlarda None döner"""
+    if timeframe in TIMEFRAME_MS:
+        return TIMEFRAME_MS[timeframe]
+    try:
+        amount = int(timeframe[:-1])
+    except (ValueError, TypeError):
+        return None
+    unit = timeframe[-1]
+    if unit == 'm':
+        return amount * MINUTE_MS
+    if unit == 'h':
+        return amount * 60 * MINUTE_MS
+    if unit == 'd':
+        return amount * DAY_MS
+    return None
+
+
+def can_derive(timeframe, base_capacity, min_bars=MIN_DERIVED_BARS):
+    """
+    Zaman dilimi 1m serisinden türetilebilir mi?
+    1m tamponu en az min_bars mum üretebilecek kadar uzun olmalıdır. Bu koşul
+    Binance'in sunmadığı zaman dilimleri (örn. 45m) için de geçerlidir; kısa
+    tampondan türetilen seride indikatörler eksik pencereyle hesaplanırdı.
+    """
+    if timeframe == BASE_TIMEFRAME:
+        return False
+    interval = timeframe_to_ms(timeframe)
+    if interval is None or interval > DAY_MS or interval % MINUTE_MS != 0:
+        return False
+    return (interval // MINUTE_MS) * min_bars <= base_capacity
+
+
+def source_timeframe(timeframe, base_capacity, min_bars=MIN_DERIVED_BARS):
+    """
+    Zaman diliminin verisinin alınacağı seri: türetilebiliyorsa taban (1m),
+    Binance sunuyorsa kendisi, ikisi de değilse None (zaman dilimi sunulamaz).
+    """
+    if can_derive(timeframe, base_capacity, min_bars):
+        return BASE_TIMEFRAME
+    if timeframe in NATIVE_TIMEFRAMES:
+        return timeframe
+    return None
+
+
+def required_base_capacity(timeframe, min_bars=MIN_DERIVED_BARS):
+    """Zaman dilimini min_bars mumla türetmek için gereken 1m tampon boyu, bilinmiyorsa None"""
+    interval = timeframe_to_ms(timeframe)
+    if interval is None or interval % MINUTE_MS != 0:
+        return None
+    return (interval // MINUTE_MS) * min_bars
+
+
+def bucket_open_times(times, interval):
+    """
+    Her 1m mumun ait olduğu üst zaman dilimi mumunun açılış zamanı.
+    Gruplar UTC gün başlangıcına hizalanır (Binance ile aynı).
+    """
+    day_start = (times // DAY_MS) * DAY_MS
+    return day_start + ((times - day_start) // interval) * interval
+
+
+def resample_candles(times, values, timeframe):
+    """
+    1m mumlarını üst zaman dilimine çevirir.
+
+    times: Açılış zamanları (ms, int64, artan sırada)
+    values: (n, 5) open, high, low, close, volume dizisi
+    Dönüş: (times, values) - türetilen mumlar. Başı eksik olan ilk mum atılır,
+    son mum oluşmakta olan mumdur.
+    """
+    interval = timeframe_to_ms(timeframe)
+    if interval is None or len(times) == 0:
+        return times[:0], values[:0]
+
+    buckets = bucket_open_times(times, interval)
+    starts = np.flatnonzero(np.diff(buckets)) + 1
+    starts = np.concatenate(([0], starts))
+    ends = np.concatenate((starts[1:] - 1, [len(times) - 1]))
+
+    out_times = buckets[starts]
+    out_values = np.empty((len(starts), 5), dtype=np.float64)
+    out_values[:, 0] = values[starts, 0]                          # open
+    out_values[:, 1] = np.maximum.reduceat(values[:, 1], starts)  # high
+    out_values[:, 2] = np.minimum.reduceat(values[:, 2], starts)  # low
+    out_values[:, 3] = values[ends, 3]                            # close
+    out_values[:, 4] = np.add.reduceat(values[:, 4], starts)      # volume
+
+    # İlk grup tamponun başında kesilmiş olabilir, eksik mum üretme
+    if times[0] != out_times[0]:
+        out_times = out_times[1:]
+        out_values = out_values[1:]
+
+    return out_times, out_values
@@ -25,16 +25,16 @@ def volume_weighted_macd(df, fast_period=26, slow_period=12, signal_period=9):
     Dönüş:
     dict - MACD değerleri ve histogram renkleri
     """
-    # Hacim * Kapanış değerlerini hesapla
-    df['volume_close'] = df['volume'] * df['close']
+    # Hacim * Kapanış değerlerini hesapla (df'e sütun eklenmez, girdi değişmez)
+    volume_close = df['volume'] * df['close']
     
     # Hızlı ve yavaş EMA hesaplamaları
     volume_ema_fast = df['volume'].ewm(span=fast_period, adjust=False).mean()
-    volume_close_ema_fast = df['volume_close'].ewm(span=fast_period, adjust=False).mean()
+    volume_close_ema_fast = volume_close.ewm(span=fast_period, adjust=False).mean()
     maFast = volume_close_ema_fast / volume_ema_fast
     
     volume_ema_slow = df['volume'].ewm(span=slow_period, adjust=False).mean()
-    volume_close_ema_slow = df['volume_close'].ewm(span=slow_period, adjust=False).mean()
+    volume_close_ema_slow = volume_close.ewm(span=slow_period, adjust=False).mean()
     maSlow = volume_close_ema_slow / volume_ema_slow
     
     # MACD çizgisi